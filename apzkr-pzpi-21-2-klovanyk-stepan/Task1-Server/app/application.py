@@ -9,8 +9,9 @@ from sqlalchemy_utils import create_database, database_exists
 from . import Globals
 from .database.models import Base
 from .secret_config import SecretConfig
+from app.services.validators.crud import CRUDValidationPipelines
 from app.utils.file_manager.files import FileManager
-from .utils.extra import SecondaryConfig, BlueprintsStorage
+from .utils.extra import SecondaryConfig, BlueprintsStorage, AlchemyExtras
 
 
 def create_app() -> Flask:
@@ -19,7 +20,7 @@ def create_app() -> Flask:
     app.config.from_object(SecondaryConfig.FlaskAppConfig)
     Globals(app)
     CORS(
-        app, supports_credentials=True, resources={r"/*": {"origins": "*"}}, expose_headers=['Content-Disposition']
+        app, supports_credentials=True, resources={r"/*": {"origins": "*"}}, expose_headers=['Content-Disposition', 'X-Next-Cursor']
     )
     FileManager(Path(app.root_path) / SecretConfig().UPLOAD_FOLDER)
 
@@ -41,6 +42,7 @@ def register_blueprints(app: Flask) -> None:
     blueprints = SecondaryConfig().BLUEPRINTS_PATH.iterdir()
     blueprints = [bp for bp in blueprints if bp.is_file() and bp.suffix == '.py' and bp.stem != '__init__']
     [import_module(f'app.blueprints.{bp.stem}') for bp in blueprints]
+    CRUDValidationPipelines.prepare(*AlchemyExtras().get_all_tables().values())
     blueprints_storage = BlueprintsStorage()
     for blueprint in blueprints_storage.blueprints:
         app.register_blueprint(blueprint)
@@ -12,7 +12,7 @@ from app.utils.extra import BlueprintsStorage
 from app.services.creators.builders.routes import RequestModifiers, RoutesBuilder
 from app.services.creators.factories.body import RequestBodyFactory
 from app.services.creators.factories.body_details import BodyFactoryDetailsFactory
-from app.services.decorators.query_args.filtering import filtering_args
+from app.services.decorators.query_args.filtering import filtering_args, where_filtering_args
 from app.services.decorators.query_args.serialization import RequestArgsParser, serialization_args
 from app.services.decorators.general.permissions import permissions_of_employee_required, \
     RequiredPermissionsFlag as Perm
@@ -36,6 +36,14 @@ def create(**kwargs):
         return RequestBodyFactory(session, used_base_type, request).get_crud_create_body()()
 
 
+@bookings.post('/bulk')
+@login_required
+@permissions_of_employee_required(current_user, Perm.BOOKING_MANAGER)
+def create_many(**kwargs):
+    with Globals().db.session() as session:
+        return RequestBodyFactory(session, used_base_type, request).get_crud_create_many_body()()
+
+
 @bookings.get('/')
 @login_required
 @serialization_args(request, used_base_type)
@@ -93,6 +101,24 @@ def delete(**kwargs):
         return RequestBodyFactory(session, used_base_type, request).get_crud_delete_body()()
 
 
+@bookings.put('/')
+@login_required
+@permissions_of_employee_required(current_user, Perm.BOOKING_MANAGER)
+@where_filtering_args(request, used_base_type)
+def update_many(filtering_query_mod: Callable[[Query], Query], **kwargs):
+    with Globals().db.session() as session:
+        return RequestBodyFactory(session, used_base_type, request).get_crud_update_many_body(filtering_query_mod)()
+
+
+@bookings.delete('/')
+@login_required
+@permissions_of_employee_required(current_user, Perm.BOOKING_MANAGER)
+@where_filtering_args(request, used_base_type)
+def delete_many(filtering_query_mod: Callable[[Query], Query], **kwargs):
+    with Globals().db.session() as session:
+        return RequestBodyFactory(session, used_base_type, request).get_crud_delete_many_body(filtering_query_mod)()
+
+
 @bookings.get('/me')
 @login_required
 @serialization_args(request, used_base_type)
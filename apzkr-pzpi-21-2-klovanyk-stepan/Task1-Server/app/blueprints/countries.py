@@ -67,6 +67,7 @@ registered = (BlueprintDefaults('countries', Country, DefaultExtraValidators)
               .default()
               .permissions_Set(RequiredPermissionsFlag.HEAD_MANAGER)
               .useDefault_CreateRequest()
+              .useDefault_CreateManyRequest()
               .useDefault_DeleteRequest()
               .useDefault_UpdateRequest()
               .permissions_Clear()
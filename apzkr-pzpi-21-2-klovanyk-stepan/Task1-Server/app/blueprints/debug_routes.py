@@ -4,6 +4,9 @@ from sqlalchemy_utils import create_database, drop_database
 from app import Globals
 from app.database.models import Base
 from app.secret_config import SecretConfig
+from app.services.processors.catalogue import FacetCounts
+from app.services.processors.filtering import RequestQueryArgsResolver
+from app.services.processors.serialization import SerializationPlansStorage
 from app.utils.extra import BlueprintsStorage
 from app.utils.mocker import MockStation
 
@@ -33,6 +36,16 @@ def check_args(id: int, name: str):
     return [request.args, request.view_args, request.args.getlist("G")], 200
 
 
+@utils_debug.get('caches')
+def caches_info():
+    assert current_app.debug
+    return {
+        'query_args': RequestQueryArgsResolver.cache_info(),
+        'serialization_plans': SerializationPlansStorage.cache_info(),
+        'facet_counts': FacetCounts().cache_info(),
+    }, 200
+
+
 @utils_debug.get('recreate_db')
 def recreate_db():
     assert current_app.debug
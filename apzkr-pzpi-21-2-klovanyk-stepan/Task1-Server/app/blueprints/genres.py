@@ -13,6 +13,7 @@ registered_genres = (BlueprintDefaults('genres', Genre, DefaultExtraValidators)
                      .default()
                      .permissions_Set(Perm.LITERATURE_MANAGER)
                      .useDefault_CreateRequest()
+                     .useDefault_CreateManyRequest()
                      .useDefault_DeleteRequest()
                      .useDefault_UpdateRequest()
                      .permissions_Clear()
@@ -33,6 +33,14 @@ def create(**kwargs):
         return RequestBodyFactory(session, used_base_type, request).get_crud_create_body()()
 
 
+@light_types.post('/bulk')
+@login_required
+@permissions_of_employee_required(current_user, Perm.IOT_MANAGER)
+def create_many(**kwargs):
+    with Globals().db.session() as session:
+        return RequestBodyFactory(session, used_base_type, request).get_crud_create_many_body()()
+
+
 @light_types.get('/')
 @login_required
 @serialization_args(request, used_base_type)
@@ -35,6 +35,14 @@ def create(**kwargs):
         return RequestBodyFactory(session, used_base_type, request).get_crud_create_body()()
 
 
+@literature_author_x.post('/bulk')
+@login_required
+@permissions_of_employee_required(current_user, Perm.LITERATURE_MANAGER)
+def create_many(**kwargs):
+    with Globals().db.session() as session:
+        return RequestBodyFactory(session, used_base_type, request).get_crud_create_many_body()()
+
+
 @literature_author_x.get('/')
 @login_required
 @serialization_args(request, used_base_type)
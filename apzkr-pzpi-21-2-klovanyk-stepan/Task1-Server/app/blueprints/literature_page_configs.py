@@ -7,7 +7,7 @@ from sqlalchemy.orm import Query
 from app import Globals
 from app.database.models import LiteraturePageConfig
 from app.secret_config import SecretConfig
-from app.services.decorators.query_args.filtering import filtering_args
+from app.services.decorators.query_args.filtering import filtering_args, where_filtering_args
 from app.services.decorators.query_args.serialization import RequestArgsParser, serialization_args
 from app.utils.extra import BlueprintsStorage
 from app.services.creators.factories.body import RequestBodyFactory
@@ -35,6 +35,14 @@ def create(**kwargs):
         return RequestBodyFactory(session, used_base_type, request).get_crud_create_body()()
 
 
+@literature_page_configs.post('/bulk')
+@login_required
+@permissions_of_employee_required(current_user, Perm.LITERATURE_MANAGER)
+def create_many(**kwargs):
+    with Globals().db.session() as session:
+        return RequestBodyFactory(session, used_base_type, request).get_crud_create_many_body()()
+
+
 @literature_page_configs.get('/')
 @login_required
 @serialization_args(request, used_base_type)
@@ -76,6 +84,24 @@ def delete(**kwargs):
         return RequestBodyFactory(session, used_base_type, request).get_crud_delete_body()()
 
 
+@literature_page_configs.put('/')
+@login_required
+@permissions_of_employee_required(current_user, Perm.LITERATURE_MANAGER)
+@where_filtering_args(request, used_base_type)
+def update_many(filtering_query_mod: Callable[[Query], Query], **kwargs):
+    with Globals().db.session() as session:
+        return RequestBodyFactory(session, used_base_type, request).get_crud_update_many_body(filtering_query_mod)()
+
+
+@literature_page_configs.delete('/')
+@login_required
+@permissions_of_employee_required(current_user, Perm.LITERATURE_MANAGER)
+@where_filtering_args(request, used_base_type)
+def delete_many(filtering_query_mod: Callable[[Query], Query], **kwargs):
+    with Globals().db.session() as session:
+        return RequestBodyFactory(session, used_base_type, request).get_crud_delete_many_body(filtering_query_mod)()
+
+
 @literature_page_configs.get('/for_literature/<literature_id>')
 @login_required
 @serialization_args(request, used_base_type)
@@ -7,11 +7,13 @@ from app.services.route_exstensions.literatures.implementations import (Literatu
                                                                         LiteratureDropGenresDetailsImpl,
                                                                         LiteratureDropAuthorsDetailsImpl,
                                                                         LiteratureFullyReadableDetailsImpl,
+                                                                        LiteratureSearchDetailsImpl,
+                                                                        LiteratureFacetsDetailsImpl,
                                                                         LiteratureFullyEditableDetailsImpl)
 from app.services.route_exstensions.literatures.validators_additions import (entryEdit_userOnly,
                                                                              entryEdit_forPdfReading, \
                                                                              entryEdit_forEditing,
-                                                                             multi_genre_filtering_query_mod)
+                                                                             catalogue_filtering_query_mod)
 from app.utils.extra import DefaultExtraValidators
 from app.services.creators.builders.buieprints import BlueprintDefaults
 from app.services.decorators.general.permissions import RequiredPermissionsFlag as Perm
@@ -21,7 +23,12 @@ registered = (
     .default()
     # access - info only
     .useDefault_ReadSingleRequest()
-    .useDefault_ReadManyRequest(multi_genre_filtering_query_mod)
+    .useDefault_ReadManyRequest(catalogue_filtering_query_mod)
+
+    .route_Builder().cat("search").build()
+    .buildRequest_onBodyFactoryAdvanced(LiteratureSearchDetailsImpl)
+    .route_Builder().cat("facets").build()
+    .buildRequest_onBodyFactoryAdvanced(LiteratureFacetsDetailsImpl)
 
     .route_Builder().var("id").cat("thumbnail").build()
     .buildRequest_onBodyFactoryAdvanced(LiteratureThumbnailGettingImpl)
@@ -51,8 +58,11 @@ registered = (
 
     .edit_ValidationStorageEntry(entryEdit_forEditing)
     .useDefault_CreateRequest()
+    .useDefault_CreateManyRequest()
     .useDefault_DeleteRequest()
     .useDefault_UpdateRequest()
+    .useDefault_UpdateManyRequest()
+    .useDefault_DeleteManyRequest()
 
     .route_Builder().var("id").cat("drop_genres").build()
     .buildRequest_onBodyFactoryAdvanced(LiteratureDropGenresDetailsImpl)
@@ -52,6 +52,23 @@ def create(**kwargs):
         ).get_crud_create_body()()
 
 
+@rooms.post(
+    '/bulk'
+)
+@login_required
+@permissions_of_employee_required(
+    current_user,
+    Perm.IOT_MANAGER
+)
+def create_many(**kwargs):
+    with Globals().db.session() as session:
+        return RequestBodyFactory(
+            session,
+            used_base_type,
+            request
+        ).get_crud_create_many_body()()
+
+
 @rooms.get(
     '/'
 )
@@ -6,7 +6,7 @@ from enum import StrEnum
 from typing import Optional
 
 from flask_login import UserMixin
-from sqlalchemy import String, CHAR, INT, ForeignKey, VARCHAR, UniqueConstraint, BIGINT, TEXT, DateTime, JSON
+from sqlalchemy import String, CHAR, INT, ForeignKey, VARCHAR, UniqueConstraint, BIGINT, TEXT, DateTime, JSON, Index
 from sqlalchemy.orm import Mapped, mapped_column, DeclarativeBase, relationship
 
 
@@ -337,6 +337,9 @@ class Literature(Base):
     :var genres: :class:`list` of :class:`Genre` - Genres as references
     """
     __tablename__ = "literature"
+    __table_args__ = (
+        Index('ft_literature_search', 'name', 'description', mysql_prefix='FULLTEXT').ddl_if(dialect='mysql'),
+    )
     id: Mapped[int] = mapped_column(BIGINT, primary_key=True)
     name: Mapped[str] = mapped_column(VARCHAR(255))
     description: Mapped[str] = mapped_column(TEXT)
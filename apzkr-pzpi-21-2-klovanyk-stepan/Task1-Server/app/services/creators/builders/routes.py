@@ -13,13 +13,13 @@ from app.database.models import Base, User
 from app.utils.extra import ExtraValidatorsStorageBase, AlchemyExtras, ValidatorsData, \
     _ExtraValidatorsStorageBaseSingleton
 from app.services.creators.factories.body_details import BodyFactoryDetails, BodyFactoryDetailsFactory
-from app.services.decorators.query_args.filtering import filtering_args
+from app.services.decorators.query_args.filtering import filtering_args, where_filtering_args
 from app.services.decorators.query_args.serialization import serialization_args
 from app.services.decorators.general.permissions import RequiredPermissionsFlag, permissions_of_employee_required
 from app.services.processors.tools import RequestHelper
 from app.services.validators.base import ValidationException, BaseSessionAffectedValidator
 from app.services.validators.crud import CRUDContext, CreateValidationResult, UpdateValidationResult, \
-    ReadOrDeleteValidationResult
+    ReadOrDeleteValidationResult, CreateManyValidationResult, ChangeManyValidationResult
 
 
 class RoutesBuilder[BaseModel: Base]:
@@ -138,6 +138,8 @@ class RoutesBuilder[BaseModel: Base]:
             decorators.add(serialization_args(request, self.base))
         if self.modifiers & RequestModifiers.FILTERING:
             decorators.add(filtering_args(request, self.base))
+        if self.modifiers & RequestModifiers.WHERE_FILTERING:
+            decorators.add(where_filtering_args(request, self.base))
         if self.modifiers & RequestModifiers.GLOBAL_COMPANY:
             decorators.add(self._global_company_check_deco(current_user))
         return decorators
@@ -283,6 +285,21 @@ class RoutesBuilder[BaseModel: Base]:
             utilize_factory
         )
 
+    def useDefault_CreateManyRequest(
+            self,
+            on_validation_success: Callable[[CreateManyValidationResult, dict[str, any]], None] = None
+    ):
+        def utilize_factory(adf: BodyFactoryDetailsFactory):
+            return adf.CREATE_MANY(on_validation_success)
+
+        (self
+         .route_Reset()
+         .route_AppendCategory('bulk'))
+
+        return self.buildRequest_onBodyFactory(
+            utilize_factory
+        )
+
     def useDefault_UpdateRequest(
             self,
             on_validation_success: Callable[[UpdateValidationResult, dict[str, any]], None] = None
@@ -313,6 +330,37 @@ class RoutesBuilder[BaseModel: Base]:
             utilize_factory
         )
 
+    def useDefault_UpdateManyRequest(
+            self,
+            on_validation_success: Callable[[ChangeManyValidationResult, dict[str, any]], None] = None
+    ):
+        def utilize_factory(adf: BodyFactoryDetailsFactory):
+            return adf.UPDATE_MANY(on_validation_success)
+
+        return self._buildRequest_onWhereFiltering(utilize_factory)
+
+    def useDefault_DeleteManyRequest(
+            self,
+            on_validation_success: Callable[[ChangeManyValidationResult, dict[str, any]], None] = None
+    ):
+        def utilize_factory(adf: BodyFactoryDetailsFactory):
+            return adf.DELETE_MANY(on_validation_success)
+
+        return self._buildRequest_onWhereFiltering(utilize_factory)
+
+    def _buildRequest_onWhereFiltering(self, utilize_factory: Callable[[BodyFactoryDetailsFactory], BodyFactoryDetails]):
+        """
+        Collection root route of a bulk change, its ``filtering_query_mod`` takes filters and joins only.
+        """
+        modifiers = self.modifiers
+        (self
+         .route_Reset()
+         .modifiers_Remove(RequestModifiers.FILTERING | RequestModifiers.SERIALIZATION)
+         .modifiers_Use(RequestModifiers.WHERE_FILTERING)
+         .buildRequest_onBodyFactory(utilize_factory))
+        self.modifiers = modifiers
+        return self
+
     def useDefault_ReadSingleRequest(
             self,
             on_validation_success: Callable[[ReadOrDeleteValidationResult, dict[str, any]], None] = None
@@ -423,3 +471,4 @@ class RequestModifiers(IntFlag):
     LOGIN = 4
     PERMISSIONS = 8
     GLOBAL_COMPANY = 16
+    WHERE_FILTERING = 32
@@ -4,25 +4,35 @@ from enum import Enum
 from http import HTTPStatus
 from typing import Callable
 
-from flask import Request
+from flask import Request, Response, current_app, stream_with_context
 from flask_login import current_user
 from flask_sqlalchemy.session import Session
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Query
 
 from app.database.models import Base, User
-from app.utils.extra import CRUDResponse, AlchemyExtras, ExtraValidatorsStorageBase
-from app.services.decorators.query_args.serialization import RequestArgsParser
+from app.utils.extra import CRUDResponse, AlchemyExtras, ExtraValidatorsStorageBase, SecondaryConfig
+from app.services.decorators.query_args.serialization import RequestArgsParser, SerializationFormat, ReturnPreference
+from app.services.processors.filtering import QueryAggregation
+from app.services.processors.pagination import PaginationData, QueryPaginator
+from app.services.processors.serialization import ItemsAccessValidator, SerializerOptions, SerializationPlan
 from app.services.processors.tools import RequestHelper
-from app.services.validators.base import BaseSessionAffectedValidator
+from app.services.validators.base import BaseSessionAffectedValidator, ValidationException, \
+    ValidationExceptionType
 from app.services.validators.crud import CRUDBasicCreateValidator, CRUDBasicReadOrDeleteValidator, \
-    CRUDBasicUpdateValidator, CRUDContext, CreateValidationResult, UpdateValidationResult, ReadOrDeleteValidationResult
+    CRUDBasicUpdateValidator, CRUDContext, CreateValidationResult, UpdateValidationResult, ReadOrDeleteValidationResult, \
+    CreateIntegrityErrorMapper, CRUDBulkCreateValidator, CreateManyValidationResult, CreateManyIntegrityErrorMapper, \
+    CRUDBulkUpdateValidator, CRUDBulkDeleteValidator, ChangeManyValidationResult
 
 
 class RequestType(Enum):
     CREATE = ("create", CRUDBasicCreateValidator)
+    CREATE_MANY = ("create_many", CRUDBulkCreateValidator)
     READ_SINGLE = ("read", CRUDBasicReadOrDeleteValidator)
     UPDATE = ("update", CRUDBasicUpdateValidator)
+    UPDATE_MANY = ("update_many", CRUDBulkUpdateValidator)
     DELETE = ("delete", CRUDBasicReadOrDeleteValidator)
+    DELETE_MANY = ("delete_many", CRUDBulkDeleteValidator)
     READ_MANY = ("read_all", None)
 
     def __init__(self, name: str, validator: type[BaseSessionAffectedValidator]):
@@ -33,6 +43,8 @@ class RequestType(Enum):
 
 
 class RequestWeakBodyBuilder:
+    NEXT_CURSOR_HEADER = 'X-Next-Cursor'
+
     def __init__(self):
         self.type: RequestType | None = None
         self.model: type[Base] | None = None
@@ -41,6 +53,7 @@ class RequestWeakBodyBuilder:
         self.session: Session | None = None
         self.serialization_modifiers: RequestArgsParser.Result | None = None
         self.query_mod: Callable[[Query], Query] | None = None
+        self.query_result: Callable[[Query], any] | None = None
         self.validator: type[BaseSessionAffectedValidator[CRUDContext, any]] | None = None
         self.extra_validation_storage: type[ExtraValidatorsStorageBase] | None = None
 
@@ -72,6 +85,13 @@ class RequestWeakBodyBuilder:
         self.query_mod = query_mod
         return self
 
+    def add_query_result(self, query_result: Callable[[Query], any] | None) -> RequestWeakBodyBuilder:
+        """
+        READ_MANY result computed from the filtered query, e.g. an aggregate, instead of its serialized page.
+        """
+        self.query_result = query_result
+        return self
+
     def add_serialization_modifiers(self, serialization_modifiers: RequestArgsParser.Result) -> RequestWeakBodyBuilder:
         self.serialization_modifiers = serialization_modifiers
         return self
@@ -80,18 +100,173 @@ class RequestWeakBodyBuilder:
         self.before_result_callback = before_result_callback
         return self
 
-    def _serializable_result(self, data: Base | list[Base], session: Session):
+    @staticmethod
+    def _get_bound_user(session: Session) -> User | None:
         if isinstance(current_user, User):
-            bound_user = RequestHelper.get_current_bound_user(session, current_user)
-        else:
-            bound_user = None
-        session.add_all(data if isinstance(data, list) else [data])
+            return RequestHelper.get_current_bound_user(session, current_user)
+        return None
+
+    def _serializable_result(
+            self, data: Base | list[Base], session: Session, options: SerializerOptions | None = None
+    ):
+        bound_user = self._get_bound_user(session)
+        if not (options and options.rows_model):
+            session.add_all(data if isinstance(data, list) else [data])
         return RequestHelper.get_general_serializer(
             data, self.serialization_modifiers, bound_user,
             session,
-            self.extra_validation_storage
+            self.extra_validation_storage,
+            options
         ).serialize()
 
+    def _eager_loaded(self, query: Query) -> Query:
+        if options := RequestHelper.get_eager_loading_options(self.model, self.serialization_modifiers):
+            return query.options(*options)
+        return query
+
+    def _reloaded_eagerly(self, obj: Base) -> Base:
+        """
+        Loads relationships to be serialized of an object already fetched by the validators in a single round.
+        """
+        if not (options := RequestHelper.get_eager_loading_options(self.model, self.serialization_modifiers)):
+            return obj
+        return (self.session.query(self.model).options(*options)
+                .where(*AlchemyExtras().get_where_clause(obj)).populate_existing().one())
+
+    def _representation_requested(self) -> bool:
+        """
+        Whether a create or update responds with the serialized object, ``?return=representation``.
+        Serialization args are parsed before the write, so invalid ones do not follow a committed change.
+        """
+        if self.type not in (RequestType.CREATE, RequestType.UPDATE):
+            return False
+        if RequestArgsParser.parse_return_preference(self.request.args) != ReturnPreference.REPRESENTATION:
+            return False
+        if self.serialization_modifiers is None:
+            self.serialization_modifiers = RequestArgsParser(self.request.args, self.model)
+        return True
+
+    def _representation_result(self, obj: Base, response: CRUDResponse):
+        """
+        Serializes the object the write left loaded, as READ_SINGLE would.
+        """
+        return response.embed_representation(self._serializable_result(self._reloaded_eagerly(obj), self.session))
+
+    def _paginator(self, query: Query) -> QueryPaginator:
+        query, pagination = PaginationData.extract_from(query)
+        access_validator = ItemsAccessValidator(
+            self._get_bound_user(self.session), self.extra_validation_storage, self.session
+        )
+        items_filter = access_validator.has_item_validation(self.model) and access_validator.filter_allowed or None
+        return QueryPaginator(query, self.model, pagination, items_filter)
+
+    def _read_many_source(self, query: Query) -> tuple[QueryPaginator, SerializerOptions]:
+        """
+        Paginator of the READ_MANY page and options to serialize it with.
+        When the page needs neither relationships nor per-object validation,
+        the query selects only the serialized columns and no ORM object is created.
+        """
+        paginator = self._paginator(query)
+        plan = RequestHelper.get_serialization_plan(self.model, self.serialization_modifiers)
+        if paginator.items_filter is not None or plan.is_empty or plan.relationships:
+            return paginator, SerializerOptions(initial_items_validated=True)
+        columns = AlchemyExtras().get_columns_of(self.model)
+        return (paginator.project([columns[key] for key in plan.column_keys]),
+                SerializerOptions(initial_items_validated=True, rows_model=self.model))
+
+    def _streamed_result(self, query: Query) -> Response:
+        """
+        Serializes READ_MANY result chunk by chunk into a JSON array while it is being sent.
+        The query is executed lazily inside the stream, on the session of the request context.
+        """
+        session = self.session
+        chunk_size = SecondaryConfig().STREAMING_CHUNK_SIZE
+        json_provider = current_app.json
+
+        def generate():
+            yield '['
+            separator = ''
+            paginator, options = self._read_many_source(query)
+            for chunk in paginator.iterate(chunk_size):
+                for item in self._serializable_result(chunk, session, options):
+                    yield separator + json_provider.dumps(item)
+                    separator = ','
+            yield ']'
+
+        return Response(stream_with_context(generate()), mimetype=json_provider.mimetype)
+
+    def _columnar_plan(self) -> SerializationPlan:
+        plan = RequestHelper.get_serialization_plan(self.model, self.serialization_modifiers)
+        if plan.relationships:
+            raise ValidationException(
+                ValidationExceptionType.INVALID_SERIALIZATION_ARGS, HTTPStatus.BAD_REQUEST,
+                f'{SerializationFormat.COLUMNAR} format holds no relationships, use depth=0 or include less tables'
+            )
+        return plan
+
+    def _columnar_source(
+            self, paginator: QueryPaginator, plan: SerializationPlan
+    ) -> tuple[QueryPaginator | None, Callable[[any], tuple]]:
+        """
+        Rows come straight from the query projected on the plan columns,
+        unless objects have to be validated one by one first.
+        """
+        access_validator = ItemsAccessValidator(
+            self._get_bound_user(self.session), self.extra_validation_storage, self.session
+        )
+        if plan.is_empty or not access_validator.is_model_allowed(self.model):
+            return None, plan.extract_values
+        if paginator.items_filter is not None:
+            return paginator, plan.extract_values
+        width = len(plan.column_keys)
+        columns = AlchemyExtras().get_columns_of(self.model)
+        return paginator.project([columns[key] for key in plan.column_keys]), lambda row: tuple(row)[:width]
+
+    def _columnar_result(self, query: Query):
+        plan = self._columnar_plan()
+        paginator, to_row = self._columnar_source(self._paginator(query), plan)
+        page = paginator.fetch() if paginator else []
+        headers = {}
+        if paginator and (next_cursor := paginator.next_cursor(page)):
+            headers[self.NEXT_CURSOR_HEADER] = next_cursor
+        return {'columns': list(plan.column_keys), 'rows': [to_row(item) for item in page]}, HTTPStatus.OK, headers
+
+    def _aggregated_result(self, query: Query):
+        """
+        Grouped rows of a :class:`QueryAggregation`. Route query modifications still narrow them,
+        models validated object by object can not be aggregated.
+        """
+        access_validator = ItemsAccessValidator(
+            self._get_bound_user(self.session), self.extra_validation_storage, self.session
+        )
+        if access_validator.has_item_validation(self.model):
+            raise ValidationException(
+                ValidationExceptionType.INVALID_AGGREGATION_ARGS, HTTPStatus.FORBIDDEN,
+                f'Items of {self.model.__tablename__} are validated one by one and can not be aggregated'
+            )
+        rows = query.all()
+        if self.serialization_modifiers.format == SerializationFormat.COLUMNAR:
+            columns = [description['name'] for description in query.column_descriptions]
+            return {'columns': columns, 'rows': [tuple(row) for row in rows]}, HTTPStatus.OK
+        return [row._asdict() for row in rows], HTTPStatus.OK
+
+    def _columnar_streamed_result(self, query: Query) -> Response:
+        plan = self._columnar_plan()
+        chunk_size = SecondaryConfig().STREAMING_CHUNK_SIZE
+        json_provider = current_app.json
+
+        def generate():
+            yield f'{{"columns": {json_provider.dumps(list(plan.column_keys))}, "rows": ['
+            paginator, to_row = self._columnar_source(self._paginator(query), plan)
+            separator = ''
+            for chunk in paginator.iterate(chunk_size) if paginator else []:
+                for item in chunk:
+                    yield separator + json_provider.dumps(to_row(item))
+                    separator = ','
+            yield ']}'
+
+        return Response(stream_with_context(generate()), mimetype=json_provider.mimetype)
+
     def build(self) -> Callable[[], tuple[dict | str, HTTPStatus]]:
         assert self.session and self.model and self.type and self.request
 
@@ -101,27 +276,55 @@ class RequestWeakBodyBuilder:
                 query = self.session.query(self.model)
                 if self.query_mod is not None:
                     query = self.query_mod(query)
+                if QueryAggregation.is_aggregated(query):
+                    return self._aggregated_result(query)
+                if self.query_result is not None:
+                    return self.query_result(query)
+                query = self._eager_loaded(query)
 
-                limit = query._limit_clause is not None and query._limit_clause.value
-                offset = query._offset_clause is not None and query._offset_clause.value
-                query._limit_clause = None
-                query._offset_clause = None
-                q = query.all()
-                # ic(q.__len__(), limit, offset)
-                return self._serializable_result(list(q)[offset:offset + limit] if limit else q, self.session)
-                # return self._serializable_result(q, self.session)
+                if self.serialization_modifiers.format == SerializationFormat.COLUMNAR:
+                    if self.serialization_modifiers.streaming:
+                        return self._columnar_streamed_result(query)
+                    return self._columnar_result(query)
+                if self.serialization_modifiers.streaming:
+                    return self._streamed_result(query)
+                paginator, options = self._read_many_source(query)
+                page = paginator.fetch()
+                headers = {}
+                if next_cursor := paginator.next_cursor(page):
+                    headers[self.NEXT_CURSOR_HEADER] = next_cursor
+                return self._serializable_result(page, self.session, options), HTTPStatus.OK, headers
 
             on_validation_success_main: Callable[[any], None] | None = None
             request_result: tuple[dict | str, HTTPStatus] | None = None
+            representation = self._representation_requested()
 
             if self.type == RequestType.CREATE:
                 def on_validation_success_main(result: CreateValidationResult):
-                    RequestHelper.insert_into_db(self.session, result.object_to_create)
+                    try:
+                        RequestHelper.insert_into_db(self.session, result.object_to_create, representation)
+                    except IntegrityError as e:
+                        self.session.rollback()
+                        raise CreateIntegrityErrorMapper(self.session).map(result.object_to_create, e)
                     nonlocal request_result
+                    if representation:
+                        request_result = self._representation_result(result.object_to_create, CRUDResponse.CREATED)
+                        return
                     request_result = CRUDResponse.CREATED.embed_pk_data_from_object(
                         result.object_to_create,
                         self.model.__name__
                     )
+            elif self.type == RequestType.CREATE_MANY:
+                def on_validation_success_main(result: CreateManyValidationResult):
+                    try:
+                        pk_data = RequestHelper.insert_many_into_db(self.session, self.model, result.rows)
+                    except IntegrityError as e:
+                        self.session.rollback()
+                        raise CreateManyIntegrityErrorMapper(self.session).map(self.model, result.rows, e)
+                    nonlocal request_result
+                    request_result = CRUDResponse.CREATED.embed_pk_data(
+                        pk_data, f'{len(result.rows)} x {self.model.__name__}'
+                    )
             elif self.type == RequestType.UPDATE:
                 def on_validation_success_main(result: UpdateValidationResult):
                     nonlocal request_result
@@ -132,8 +335,25 @@ class RequestWeakBodyBuilder:
                             merged_data[col.key] = result.object_new_data[col.key]
                         else:
                             merged_data[col.key] = getattr(result.object_to_update, col.key)
-                    RequestHelper.update_to_db(self.session, result.object_to_update, result.object_new_data)
+                    RequestHelper.update_to_db(
+                        self.session, result.object_to_update, result.object_new_data, representation
+                    )
+                    if representation:
+                        request_result = self._representation_result(result.object_to_update, CRUDResponse.UPDATED)
+                        return
                     request_result = CRUDResponse.UPDATED.embed_pk_data(merged_data, self.model.__name__)
+            elif self.type == RequestType.UPDATE_MANY:
+                def on_validation_success_main(result: ChangeManyValidationResult):
+                    count = RequestHelper.update_many_in_db(
+                        self.session, self.model, result.query, result.object_new_data
+                    )
+                    nonlocal request_result
+                    request_result = CRUDResponse.UPDATED.embed_pk_data(None, f'{count} x {self.model.__name__}')
+            elif self.type == RequestType.DELETE_MANY:
+                def on_validation_success_main(result: ChangeManyValidationResult):
+                    count = RequestHelper.delete_many_from_db(self.session, self.model, result.query)
+                    nonlocal request_result
+                    request_result = CRUDResponse.DELETED.embed_pk_data(None, f'{count} x {self.model.__name__}')
             elif self.type == RequestType.DELETE:
                 def on_validation_success_main(result: ReadOrDeleteValidationResult):
                     RequestHelper.delete_from_db(self.session, result.object)
@@ -143,7 +363,7 @@ class RequestWeakBodyBuilder:
                 def on_validation_success_main(result: ReadOrDeleteValidationResult):
                     assert self.serialization_modifiers is not None
                     nonlocal request_result
-                    request_result = self._serializable_result(result.object, self.session)
+                    request_result = self._serializable_result(self._reloaded_eagerly(result.object), self.session)
 
             assert on_validation_success_main
 
@@ -152,8 +372,13 @@ class RequestWeakBodyBuilder:
                     self.before_result_callback(result)
                 on_validation_success_main(result)
 
+            query = None
+            if self.type in (RequestType.UPDATE_MANY, RequestType.DELETE_MANY):
+                assert self.query_mod is not None
+                query = self.query_mod(self.session.query(self.model))
+
             self.validator(self.session, on_validation_success_result_callback).validate(
-                CRUDContext(model=self.model, request=self.request)
+                CRUDContext(model=self.model, request=self.request, query=query)
             )
 
             return request_result
@@ -12,7 +12,9 @@ from app.services.creators.builders.weak_body import RequestWeakBodyBuilder, Req
 from app.services.decorators.query_args.serialization import RequestArgsParser
 from app.services.validators.base import BaseSessionAffectedValidator
 from app.services.validators.crud import CRUDContext, CRUDBasicCreateValidator, CRUDBasicReadOrDeleteValidator, \
-    CRUDBasicUpdateValidator, CreateValidationResult, ReadOrDeleteValidationResult, UpdateValidationResult
+    CRUDBasicUpdateValidator, CreateValidationResult, ReadOrDeleteValidationResult, UpdateValidationResult, \
+    CRUDBulkCreateValidator, CreateManyValidationResult, CRUDBulkUpdateValidator, CRUDBulkDeleteValidator, \
+    ChangeManyValidationResult
 
 
 class RequestBodyFactory:
@@ -44,6 +46,17 @@ class RequestBodyFactory:
                 .build()
                 )
 
+    def get_crud_create_many_body(
+            self, before_result_callback: Callable[[CreateManyValidationResult], None] | None = None,
+            custom_validator: type[BaseSessionAffectedValidator[CRUDContext, any]] = CRUDBulkCreateValidator
+    ):
+        return (self._get_default_body_builder_setup()
+                .add_type(RequestType.CREATE_MANY)
+                .add_validator(custom_validator)
+                .add_before_result_callback(before_result_callback)
+                .build()
+                )
+
     def get_crud_read_single_body(
             self, serialization_modifiers: RequestArgsParser.Result,
             before_result_callback: Callable[[ReadOrDeleteValidationResult], None] | None = None,
@@ -60,12 +73,14 @@ class RequestBodyFactory:
     def get_crud_read_many_body(
             self, serialization_modifiers: RequestArgsParser.Result,
             filter_on_query: Callable[[Query], Query],
-            before_query_executed_callback: Callable[[Query], Query] = None
+            before_query_executed_callback: Callable[[Query], Query] = None,
+            query_result: Callable[[Query], any] | None = None
     ):
         filters_combined = merge_chained(before_query_executed_callback, filter_on_query)
         return (self._get_default_body_builder_setup()
                 .add_type(RequestType.READ_MANY)
                 .add_query_modification(filters_combined)
+                .add_query_result(query_result)
                 .add_serialization_modifiers(serialization_modifiers)
                 .build()
                 )
@@ -81,6 +96,19 @@ class RequestBodyFactory:
                 .build()
                 )
 
+    def get_crud_update_many_body(
+            self, filtering_query_mod: Callable[[Query], Query],
+            before_result_callback: Callable[[ChangeManyValidationResult], None] | None = None,
+            custom_validator: type[BaseSessionAffectedValidator[CRUDContext, any]] = CRUDBulkUpdateValidator
+    ):
+        return (self._get_default_body_builder_setup()
+                .add_type(RequestType.UPDATE_MANY)
+                .add_validator(custom_validator)
+                .add_query_modification(filtering_query_mod)
+                .add_before_result_callback(before_result_callback)
+                .build()
+                )
+
     def get_crud_delete_body(
             self, before_result_callback: Callable[[ReadOrDeleteValidationResult], None] | None = None,
             custom_validator: type[BaseSessionAffectedValidator[CRUDContext, any]] = CRUDBasicReadOrDeleteValidator
@@ -91,3 +119,16 @@ class RequestBodyFactory:
                 .add_before_result_callback(before_result_callback)
                 .build()
                 )
+
+    def get_crud_delete_many_body(
+            self, filtering_query_mod: Callable[[Query], Query],
+            before_result_callback: Callable[[ChangeManyValidationResult], None] | None = None,
+            custom_validator: type[BaseSessionAffectedValidator[CRUDContext, any]] = CRUDBulkDeleteValidator
+    ):
+        return (self._get_default_body_builder_setup()
+                .add_type(RequestType.DELETE_MANY)
+                .add_validator(custom_validator)
+                .add_query_modification(filtering_query_mod)
+                .add_before_result_callback(before_result_callback)
+                .build()
+                )
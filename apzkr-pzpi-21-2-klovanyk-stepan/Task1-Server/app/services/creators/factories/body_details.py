@@ -1,3 +1,4 @@
+from functools import partial
 from http import HTTPStatus
 from typing import Callable
 
@@ -10,8 +11,9 @@ from app.database.models import Base, User
 from app.utils.extra import ExtraValidatorsStorageBase, merge_callbacks, combined_injected_validation, \
     ValidatorsData, merge_chained
 from app.services.creators.factories.body import RequestBodyFactory
+from app.services.validators.base import ValidationException, ValidationExceptionType
 from app.services.validators.crud import CreateValidationResult, UpdateValidationResult, \
-    ReadOrDeleteValidationResult
+    ReadOrDeleteValidationResult, CreateManyValidationResult, BulkItemsErrors, ChangeManyValidationResult
 
 
 class BodyFactoryDetails[Extension, Factory]:
@@ -93,6 +95,20 @@ class BodyFactoryDetailsFactory:
 
             return callback
 
+        def for_CreateManyValidationResult(self):
+            data = self._extra_validation_data
+
+            def callback(result: CreateManyValidationResult, request_args: dict[str, any]):
+                if validation_result := data.validate_User(current_user, self._session):
+                    raise validation_result
+                errors = BulkItemsErrors()
+                for index, obj in enumerate(result.objects_to_create):
+                    if validation_result := data.validate_DataWithUser(current_user, obj, None, self._session):
+                        errors.add(index, validation_result)
+                errors.raise_if_any(ValidationExceptionType.CREATE_MANY_VALIDATION_EXCEPTION)
+
+            return callback
+
         def for_UpdateValidationResult(self):
             validator = self._validator_universal()
 
@@ -101,6 +117,28 @@ class BodyFactoryDetailsFactory:
 
             return callback
 
+        def for_ChangeManyValidationResult(self):
+            data = self._extra_validation_data
+
+            def callback(result: ChangeManyValidationResult, request_args: dict[str, any]):
+                if validation_result := data.validate_User(current_user, self._session):
+                    raise validation_result
+                if data.restrict_QueryWithUser is None:
+                    for obj in result.query:
+                        if validation_result := data.validate_DataWithUser(
+                                current_user, obj, result.object_new_data, self._session
+                        ):
+                            raise validation_result
+                    return
+                restricted = data.restrict_QueryWithUser(
+                    current_user, result.query, result.object_new_data, self._session
+                )
+                if isinstance(restricted, ValidationException):
+                    raise restricted
+                result.query = restricted
+
+            return callback
+
         def for_ReadOrDeleteValidationResult(self):
             validator = self._validator_universal()
 
@@ -131,6 +169,21 @@ class BodyFactoryDetailsFactory:
             self._extra_validators_data_storage
         )
 
+    def CREATE_MANY(
+            self, before_result_callback: Callable[[CreateManyValidationResult, dict[str, any]], None] = None
+    ):
+        return BodyFactoryDetails(
+            merge_callbacks(
+                self._extra_validation_factory and self._extra_validation_factory.for_CreateManyValidationResult(),
+                before_result_callback
+            ),
+            [],
+            RequestBodyFactory,
+            RequestBodyFactory.get_crud_create_many_body,
+            "POST",
+            self._extra_validators_data_storage
+        )
+
     def UPDATE(self, before_result_callback: Callable[[UpdateValidationResult, dict[str, any]], None] = None):
         return BodyFactoryDetails(
             merge_callbacks(
@@ -144,6 +197,36 @@ class BodyFactoryDetailsFactory:
             self._extra_validators_data_storage
         )
 
+    def UPDATE_MANY(
+            self, before_result_callback: Callable[[ChangeManyValidationResult, dict[str, any]], None] = None
+    ):
+        return BodyFactoryDetails(
+            merge_callbacks(
+                self._extra_validation_factory and self._extra_validation_factory.for_ChangeManyValidationResult(),
+                before_result_callback
+            ),
+            ["filtering_query_mod"],
+            RequestBodyFactory,
+            RequestBodyFactory.get_crud_update_many_body,
+            "PUT",
+            self._extra_validators_data_storage
+        )
+
+    def DELETE_MANY(
+            self, before_result_callback: Callable[[ChangeManyValidationResult, dict[str, any]], None] = None
+    ):
+        return BodyFactoryDetails(
+            merge_callbacks(
+                self._extra_validation_factory and self._extra_validation_factory.for_ChangeManyValidationResult(),
+                before_result_callback
+            ),
+            ["filtering_query_mod"],
+            RequestBodyFactory,
+            RequestBodyFactory.get_crud_delete_many_body,
+            "DELETE",
+            self._extra_validators_data_storage
+        )
+
     def DELETE(self, before_result_callback: Callable[[ReadOrDeleteValidationResult, dict[str, any]], None] = None):
         return BodyFactoryDetails(
             merge_callbacks(
@@ -170,7 +253,11 @@ class BodyFactoryDetailsFactory:
             self._extra_validators_data_storage
         )
 
-    def READ_MANY(self, extra_query_mod: Callable[[Query, dict[str, any]], Query] = None):
+    def READ_MANY(
+            self,
+            extra_query_mod: Callable[[Query, dict[str, any]], Query] = None,
+            query_result: Callable[[Query], any] | None = None
+    ):
         return BodyFactoryDetails(
             merge_chained(
                 self._extra_validation_factory and self._extra_validation_factory.for_Query(),
@@ -178,7 +265,7 @@ class BodyFactoryDetailsFactory:
                 ),
             ["serialization_modifiers", "filtering_query_mod"],
             RequestBodyFactory,
-            RequestBodyFactory.get_crud_read_many_body,
+            partial(RequestBodyFactory.get_crud_read_many_body, query_result=query_result),
             "GET",
             self._extra_validators_data_storage
         )
@@ -17,3 +17,19 @@ def filtering_args(request: Request, for_type: type[Base]):
         return Wrapper
 
     return Decorator
+
+
+def where_filtering_args(request: Request, for_type: type[Base]):
+    """
+    :func:`filtering_args` of bulk UPDATE/DELETE requests, see :meth:`RequestQueryArgsResolver.process_where_args`.
+    """
+    def Decorator(func):
+        @wraps(func)
+        def Wrapper(*args, **kwargs):
+            return func(
+                *args, filtering_query_mod=RequestQueryArgsResolver(request, for_type).process_where_args(), **kwargs
+            )
+
+        return Wrapper
+
+    return Decorator
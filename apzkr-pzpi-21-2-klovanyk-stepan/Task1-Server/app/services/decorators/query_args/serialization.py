@@ -1,13 +1,27 @@
 import functools
 from dataclasses import dataclass
+from enum import StrEnum
+from http import HTTPStatus
 
 from flask import Request
 from sqlalchemy import Column
 
 from app.database.models import Base
+from app.services.validators.base import ValidationException, ValidationExceptionType
 from app.utils.extra import AlchemyExtras
 
 
+class SerializationFormat(StrEnum):
+    DEFAULT = 'default'
+    NORMALIZED = 'normalized'
+    COLUMNAR = 'columnar'
+
+
+class ReturnPreference(StrEnum):
+    MINIMAL = 'minimal'
+    REPRESENTATION = 'representation'
+
+
 class RequestArgsParser:
     delimiter = ','
 
@@ -22,17 +36,93 @@ class RequestArgsParser:
         included_tables: set[type[Base]]
         excluded_columns: set[Column]
         excluded_tables: set[type[Base]]
+        streaming: bool = False
+        depth: int | None = None
+        expand: frozenset[str] | None = None
+        format: SerializationFormat = SerializationFormat.DEFAULT
+
+    _TRUTHY = {'1', 'true', 'yes', 'y', 'on'}
 
     def __new__(cls, request_args: dict, base_model: type[Base] = None):
         include_raw_args = request_args.get('I') or ''
         exclude_raw_args = request_args.get('E') or ''
+        streaming_raw_arg = request_args.get('stream') or ''
+        depth_raw_arg = request_args.get('depth') or ''
+        expand_raw_arg = request_args.get('expand')
+        format_raw_arg = request_args.get('format') or ''
         base_model = base_model
 
+        streaming, format_ = cls.parse_flag(streaming_raw_arg), cls.parse_format(format_raw_arg)
+        if streaming and format_ == SerializationFormat.NORMALIZED:
+            raise ValidationException(
+                ValidationExceptionType.INVALID_SERIALIZATION_ARGS, HTTPStatus.BAD_REQUEST,
+                f'{format_} format can not be streamed'
+            )
+
         return cls.Result(
             *cls.specs_to_data(cls.cast_to_specs(cls.separate(include_raw_args)), base_model),
-            *cls.specs_to_data(cls.cast_to_specs(cls.separate(exclude_raw_args)), base_model)
+            *cls.specs_to_data(cls.cast_to_specs(cls.separate(exclude_raw_args)), base_model),
+            streaming=streaming,
+            depth=cls.parse_depth(depth_raw_arg),
+            expand=cls.parse_expand(expand_raw_arg, base_model),
+            format=format_
         )
 
+    @classmethod
+    def parse_format(cls, raw_arg: str) -> SerializationFormat:
+        if not (raw_arg := raw_arg.strip().lower()):
+            return SerializationFormat.DEFAULT
+        try:
+            return SerializationFormat(raw_arg)
+        except ValueError:
+            raise ValidationException(
+                ValidationExceptionType.INVALID_SERIALIZATION_ARGS, HTTPStatus.BAD_REQUEST,
+                f'Unknown format {raw_arg}, expected one of {", ".join(SerializationFormat)}'
+            )
+
+    @classmethod
+    def parse_return_preference(cls, request_args: dict) -> ReturnPreference:
+        if not (raw_arg := (request_args.get('return') or '').strip().lower()):
+            return ReturnPreference.MINIMAL
+        try:
+            return ReturnPreference(raw_arg)
+        except ValueError:
+            raise ValidationException(
+                ValidationExceptionType.INVALID_SERIALIZATION_ARGS, HTTPStatus.BAD_REQUEST,
+                f'Unknown return preference {raw_arg}, expected one of {", ".join(ReturnPreference)}'
+            )
+
+    @classmethod
+    def parse_depth(cls, raw_arg: str) -> int | None:
+        if not (raw_arg := raw_arg.strip()):
+            return None
+        if not raw_arg.isdigit():
+            raise ValidationException(
+                ValidationExceptionType.INVALID_SERIALIZATION_ARGS, HTTPStatus.BAD_REQUEST,
+                f'Depth must be a non-negative integer, got {raw_arg}'
+            )
+        return int(raw_arg)
+
+    @classmethod
+    def parse_expand(cls, raw_arg: str | None, base_model: type[Base]) -> frozenset[str] | None:
+        if raw_arg is None:
+            return None
+        paths = frozenset(path for path in cls.separate(raw_arg) if path)
+        for path in paths:
+            model = base_model
+            for key in path.split('.'):
+                if (relationship := model.__mapper__.relationships.get(key)) is None:
+                    raise ValidationException(
+                        ValidationExceptionType.INVALID_SERIALIZATION_ARGS, HTTPStatus.BAD_REQUEST,
+                        f'Relationship {key} does not exist in {model.__tablename__}'
+                    )
+                model = relationship.mapper.class_
+        return paths
+
+    @classmethod
+    def parse_flag(cls, raw_arg: str):
+        return raw_arg.strip().lower() in cls._TRUTHY
+
     @classmethod
     def separate(cls, raw_args: str):
         return [s.strip() for s in raw_args.split(cls.delimiter)]
@@ -81,11 +171,20 @@ def serialization_args(request: Request, base_model: type[Base]):
 
     Syntax example::
 
-        .../api/.../route?I=table1.column1,table2,column3&E=...
+        .../api/.../route?I=table1.column1,table2,column3&E=...&stream=1&depth=2&expand=rel1,rel2.rel3&format=normalized
 
         table1.column1 - include only column1 from table1
         table2 - include all columns from table2
         column3 - include only column3 from base_model
+        stream - READ_MANY responds with a chunked JSON array, serialized row by row
+        depth - maximum number of relationship levels serialized, 0 for flat rows
+        expand - only these relationship paths (keys from base_model) are serialized
+        format - ``normalized`` serializes every nested object once into ``included`` and refers to it,
+                 ``columnar`` responds READ_MANY with ``{"columns": [...], "rows": [[...], ...]}`` (no relationships)
+        return - ``representation`` responds create and update with the serialized object instead of its primary key
+
+    A relationship is serialized only if its target table has included columns and ``expand``,
+    when given, lists it.
 
     """
 
@@ -0,0 +1,399 @@
+from __future__ import annotations
+
+import bisect
+import enum
+import threading
+from collections import defaultdict
+from http import HTTPStatus
+from typing import Hashable, Iterable
+
+from sqlalchemy import Engine, String, and_, cast, event, false, func, inspect, literal, or_, select, union_all
+from sqlalchemy.orm import ORMExecuteState, Query, Session, object_session
+
+from app.database.models import Author, Company, Genre, Literature, LiteratureAuthor, LiteratureGenre
+from app.services.processors.filtering import RequestQuerySupportedArgs
+from app.services.validators.base import ValidationException, ValidationExceptionType
+from app.utils.base import LRUCache, SingletonMeta
+from app.utils.extra import AlchemyExtras, SecondaryConfig
+
+
+class Bitmap:
+    """
+    Set of literature ids as bits of an :class:`int`, intersections and unions run in C.
+    """
+
+    @staticmethod
+    def of(ids: Iterable[int]) -> int:
+        ids = list(ids)
+        if not ids:
+            return 0
+        data = bytearray(max(ids) // 8 + 1)
+        for id in ids:
+            data[id >> 3] |= 1 << (id & 7)
+        return int.from_bytes(data, 'little')
+
+    @staticmethod
+    def ids(bits: int) -> list[int]:
+        reversed_bits = bin(bits)[:1:-1]
+        ids = []
+        position = reversed_bits.find('1')
+        while position != -1:
+            ids.append(position)
+            position = reversed_bits.find('1', position + 1)
+        return ids
+
+    @staticmethod
+    def count(bits: int) -> int:
+        return bits.bit_count()
+
+
+class CatalogueFacet(enum.StrEnum):
+    GENRE = 'genre'
+    TYPE = 'type'
+    COMPANY = 'company'
+    MIN_AGE = 'min_age'
+
+
+class CatalogueIndex(metaclass=SingletonMeta):
+    """
+    In-process bitmap of literature ids per value of each :class:`CatalogueFacet`, min age grouped in
+    ``CATALOGUE_MIN_AGE_BUCKETS``. Built on first use, literatures changed by a committed session are re-read.
+    Changes of other processes are not seen, set ``CATALOGUE_INDEX_ENABLED`` off for multi-process deployments.
+    """
+    _DIRTY_KEY = 'catalogue_index_dirty'
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._built = False
+        self._bitmaps: dict[CatalogueFacet, dict[Hashable, int]] = {facet: defaultdict(int) for facet in CatalogueFacet}
+        self._values_of: dict[int, dict[CatalogueFacet, set[Hashable]]] = {}
+
+    @classmethod
+    def min_age_bucket(cls, min_age: int | None) -> int | None:
+        if min_age is None:
+            return None
+        buckets = SecondaryConfig().CATALOGUE_MIN_AGE_BUCKETS
+        return buckets[max(bisect.bisect_right(buckets, min_age) - 1, 0)]
+
+    def _read(self, connection, ids: list[int] | None = None) -> dict[int, dict[CatalogueFacet, set[Hashable]]]:
+        literatures = select(Literature.id, Literature.type_name, Literature.company_id, Literature.min_age)
+        genres = select(LiteratureGenre.literature_id, LiteratureGenre.genre_name)
+        if ids is not None:
+            literatures = literatures.where(Literature.id.in_(ids))
+            genres = genres.where(LiteratureGenre.literature_id.in_(ids))
+        values: dict[int, dict[CatalogueFacet, set[Hashable]]] = {}
+        for id, type_name, company_id, min_age in connection.execute(literatures):
+            values[id] = {
+                CatalogueFacet.GENRE: set(),
+                CatalogueFacet.TYPE: {type_name},
+                CatalogueFacet.COMPANY: {company_id},
+                CatalogueFacet.MIN_AGE: {self.min_age_bucket(min_age)},
+            }
+        for literature_id, genre_name in connection.execute(genres):
+            if literature_id in values:
+                values[literature_id][CatalogueFacet.GENRE].add(genre_name)
+        return values
+
+    def _set(self, id: int, values: dict[CatalogueFacet, set[Hashable]] | None):
+        bit = 1 << id
+        for facet, facet_values in self._values_of.pop(id, {}).items():
+            for value in facet_values:
+                if not (bitmap := self._bitmaps[facet][value] & ~bit):
+                    del self._bitmaps[facet][value]
+                else:
+                    self._bitmaps[facet][value] = bitmap
+        if values is None:
+            return
+        self._values_of[id] = values
+        for facet, facet_values in values.items():
+            for value in facet_values:
+                self._bitmaps[facet][value] |= bit
+
+    def _ensure_built(self, engine: Engine):
+        if self._built:
+            return
+        with engine.connect() as connection:
+            self._values_of = self._read(connection)
+        ids_per_value: dict[CatalogueFacet, dict[Hashable, list[int]]] = {
+            facet: defaultdict(list) for facet in CatalogueFacet
+        }
+        for id, values in self._values_of.items():
+            for facet, facet_values in values.items():
+                for value in facet_values:
+                    ids_per_value[facet][value].append(id)
+        self._bitmaps = {
+            facet: defaultdict(int, {value: Bitmap.of(ids) for value, ids in ids_per_value[facet].items()})
+            for facet in CatalogueFacet
+        }
+        self._built = True
+
+    def refresh(self, engine: Engine, ids: set[int] | None):
+        """
+        Re-reads ``ids`` from the database, ``None`` drops the whole index to be rebuilt on the next use.
+        """
+        with self._lock:
+            if ids is None:
+                self._bitmaps = {facet: defaultdict(int) for facet in CatalogueFacet}
+                self._values_of = {}
+                self._built = False
+            if not self._built:
+                return
+            with engine.connect() as connection:
+                values = self._read(connection, list(ids))
+            for id in ids:
+                self._set(id, values.get(id))
+
+    def bitmap(self, engine: Engine, facet: CatalogueFacet, values: Iterable[Hashable]) -> int:
+        """
+        Literatures having any of ``values`` of ``facet``.
+        """
+        with self._lock:
+            self._ensure_built(engine)
+            bits = 0
+            for value in values:
+                bits |= self._bitmaps[facet].get(value, 0)
+            return bits
+
+    def facet_values(self, engine: Engine, facet: CatalogueFacet) -> dict[Hashable, int]:
+        with self._lock:
+            self._ensure_built(engine)
+            return dict(self._bitmaps[facet])
+
+    def mark_dirty(self, session: Session, ids: Iterable[int] | None):
+        dirty = session.info.setdefault(self._DIRTY_KEY, set())
+        if ids is None or None in dirty:
+            dirty.clear()
+            dirty.add(None)
+        else:
+            dirty.update(ids)
+
+    def committed(self, session: Session):
+        if not (dirty := session.info.pop(self._DIRTY_KEY, None)):
+            return
+        self.refresh(session.get_bind(), None if None in dirty else dirty)
+
+    def rolled_back(self, session: Session):
+        session.info.pop(self._DIRTY_KEY, None)
+
+
+class CatalogueFilter:
+    """
+    ``having_genre`` (name part, every arg must match), ``having_type``, ``having_company`` and ``having_min_age``
+    (bucket, any arg may match) args of literature lists, resolved to an id bitmap by :class:`CatalogueIndex`,
+    or to SQL when it is disabled or matches more than ``CATALOGUE_INDEX_MAX_IDS`` literatures.
+    """
+    ARGS = {
+        CatalogueFacet.TYPE: 'having_type',
+        CatalogueFacet.COMPANY: 'having_company',
+        CatalogueFacet.MIN_AGE: 'having_min_age',
+    }
+    GENRE_ARG = 'having_genre'
+
+    def __init__(self, request_args):
+        self.genres = [genre for genre in request_args.getlist(self.GENRE_ARG) if genre]
+        self.values: dict[CatalogueFacet, list[Hashable]] = {}
+        for facet, arg in self.ARGS.items():
+            if raw_values := [value for value in request_args.getlist(arg) if value]:
+                self.values[facet] = [self._cast(facet, value) for value in raw_values]
+
+    @classmethod
+    def _cast(cls, facet: CatalogueFacet, value: str) -> Hashable:
+        if facet not in (CatalogueFacet.COMPANY, CatalogueFacet.MIN_AGE):
+            return value
+        try:
+            number = int(value)
+        except ValueError:
+            raise ValidationException(
+                ValidationExceptionType.INVALID_FILTER_ARGS, HTTPStatus.BAD_REQUEST,
+                f'{cls.ARGS[facet]} must be an integer: {value}'
+            )
+        return number if facet == CatalogueFacet.COMPANY else CatalogueIndex.min_age_bucket(number)
+
+    def __bool__(self):
+        return bool(self.genres or self.values)
+
+    def apply(self, query: Query) -> Query:
+        if not self:
+            return query
+        if not SecondaryConfig().CATALOGUE_INDEX_ENABLED:
+            return self._apply_sql(query)
+        engine = query.session.get_bind()
+        index = CatalogueIndex()
+        bits = None
+        for genre in self.genres:
+            names = index.facet_values(engine, CatalogueFacet.GENRE)
+            matching = [name for name in names if genre.lower() in name.lower()]
+            bits = self._intersect(bits, index.bitmap(engine, CatalogueFacet.GENRE, matching))
+        for facet, values in self.values.items():
+            bits = self._intersect(bits, index.bitmap(engine, facet, values))
+        if not bits:
+            return query.where(false())
+        if Bitmap.count(bits) > SecondaryConfig().CATALOGUE_INDEX_MAX_IDS:
+            # a broad facet would send most of the catalogue as bound parameters
+            return self._apply_sql(query)
+        return query.where(Literature.id.in_(Bitmap.ids(bits)))
+
+    @staticmethod
+    def _intersect(bits: int | None, other: int) -> int:
+        return other if bits is None else bits & other
+
+    def _apply_sql(self, query: Query) -> Query:
+        for genre in self.genres:
+            query = query.where(Literature.genres.any(Genre.name.like(f"%{genre}%")))
+        columns = {CatalogueFacet.TYPE: Literature.type_name, CatalogueFacet.COMPANY: Literature.company_id}
+        for facet, values in self.values.items():
+            if facet == CatalogueFacet.MIN_AGE:
+                buckets = SecondaryConfig().CATALOGUE_MIN_AGE_BUCKETS
+                query = query.where(or_(*[self._bucket_clause(bucket, buckets) for bucket in values]))
+            else:
+                query = query.where(columns[facet].in_(values))
+        return query
+
+    @staticmethod
+    def _bucket_clause(bucket: int | None, buckets: tuple[int, ...]):
+        if bucket is None:
+            return Literature.min_age.is_(None)
+        position = buckets.index(bucket)
+        lower = Literature.min_age >= bucket if position else Literature.min_age.is_not(None)
+        return lower if position == len(buckets) - 1 else and_(lower, Literature.min_age < buckets[position + 1])
+
+
+class FacetCounts(metaclass=SingletonMeta):
+    """
+    Literatures per genre, type, company and author of a filtered literatures query. Every facet is counted
+    by one ``UNION ALL`` of ``GROUP BY`` queries over the matching ids, cached per filter signature
+    until literatures or their genres and authors change.
+    """
+    _CHANGED_KEY = 'facet_counts_changed'
+    FACETS = ('genre', 'type', 'company', 'author')
+
+    def __init__(self):
+        self._cache: LRUCache[tuple, dict[str, any]] = LRUCache(SecondaryConfig().FACET_COUNTS_CACHE_SIZE)
+
+    def cache_info(self) -> dict[str, int]:
+        return self._cache.info()
+
+    @classmethod
+    def signature_of(cls, request_args) -> tuple:
+        """
+        Args that narrow the counted literatures: filters, joins and catalogue facets. Filters order does not matter.
+        """
+        narrowing = (RequestQuerySupportedArgs.FILTER, RequestQuerySupportedArgs.JOIN)
+        catalogue_args = {CatalogueFilter.GENRE_ARG, *CatalogueFilter.ARGS.values()}
+        return tuple(sorted(
+            (key.lower(), tuple(sorted(values)))
+            for key, values in request_args.lists()
+            if RequestQuerySupportedArgs.by_tag(key) in narrowing or key in catalogue_args
+        ))
+
+    def counts(self, query: Query, signature: tuple) -> dict[str, any]:
+        return self._cache.get_or_compute(signature, lambda: self._compute(query))
+
+    def _compute(self, query: Query) -> dict[str, any]:
+        ids = query.order_by(None).limit(None).offset(None).with_entities(Literature.id).scalar_subquery()
+
+        def grouped(facet: str, value, label, source, id_column):
+            return (
+                select(literal(facet).label('facet'), cast(value, String).label('value'),
+                       literal(None, String) if label is None else cast(label, String), func.count())
+                .select_from(source)
+                .where(id_column.in_(ids))
+                .group_by(*[column for column in (value, label) if column is not None])
+            )
+
+        statement = union_all(
+            select(literal('total'), literal(None, String), literal(None, String), func.count())
+            .where(Literature.id.in_(ids)),
+            grouped('genre', LiteratureGenre.genre_name, None, LiteratureGenre, LiteratureGenre.literature_id),
+            grouped('type', Literature.type_name, None, Literature, Literature.id),
+            grouped('company', Literature.company_id, Company.name, Literature.__table__.outerjoin(Company),
+                    Literature.id),
+            grouped('author', LiteratureAuthor.author_id, Author.pseudonym, LiteratureAuthor.__table__.join(Author),
+                    LiteratureAuthor.literature_id),
+        )
+        total, facets = 0, {facet: [] for facet in self.FACETS}
+        for facet, value, label, count in query.session.execute(statement):
+            if facet == 'total':
+                total = count
+                continue
+            entry = {'value': value, 'count': count}
+            if facet in ('company', 'author'):
+                entry.update(value=value and int(value), label=label)
+            facets[facet].append(entry)
+        for entries in facets.values():
+            entries.sort(key=lambda entry: (-entry['count'], str(entry['value'])))
+        return {'total': total, 'facets': facets}
+
+    def mark_changed(self, session: Session):
+        session.info[self._CHANGED_KEY] = True
+
+    def committed(self, session: Session):
+        if session.info.pop(self._CHANGED_KEY, False):
+            self._cache.clear()
+
+    def rolled_back(self, session: Session):
+        session.info.pop(self._CHANGED_KEY, None)
+
+
+@event.listens_for(Literature, 'after_insert')
+@event.listens_for(Literature, 'after_update')
+@event.listens_for(Literature, 'after_delete')
+def _literature_changed(mapper, connection, literature: Literature):
+    CatalogueIndex().mark_dirty(object_session(literature), [literature.id])
+    FacetCounts().mark_changed(object_session(literature))
+
+
+@event.listens_for(LiteratureGenre, 'after_insert')
+@event.listens_for(LiteratureGenre, 'after_update')
+@event.listens_for(LiteratureGenre, 'after_delete')
+def _literature_genre_changed(mapper, connection, literature_genre: LiteratureGenre):
+    ids = {literature_genre.literature_id, *inspect(literature_genre).attrs.literature_id.history.deleted}
+    CatalogueIndex().mark_dirty(object_session(literature_genre), ids)
+    FacetCounts().mark_changed(object_session(literature_genre))
+
+
+@event.listens_for(LiteratureAuthor, 'after_insert')
+@event.listens_for(LiteratureAuthor, 'after_update')
+@event.listens_for(LiteratureAuthor, 'after_delete')
+def _literature_author_changed(mapper, connection, literature_author: LiteratureAuthor):
+    FacetCounts().mark_changed(object_session(literature_author))
+
+
+_INDEXED_KEYS = {Literature.id.key, Literature.type_name.key, Literature.company_id.key, Literature.min_age.key}
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _catalogue_bulk_changed(orm_execute_state: ORMExecuteState):
+    """
+    ORM-enabled ``update()``/``delete()`` statements bypass the mapper events above, affected literature ids
+    are selected before the statement runs, updates of literature columns the index does not hold are skipped.
+    Bulk inserts and literature genres updates rebuild the index.
+    """
+    if orm_execute_state.is_select or orm_execute_state.bind_mapper is None:
+        return None
+    if orm_execute_state.bind_mapper in (inspect(Literature), inspect(LiteratureGenre), inspect(LiteratureAuthor)):
+        FacetCounts().mark_changed(orm_execute_state.session)
+    id_columns = {inspect(Literature): Literature.id, inspect(LiteratureGenre): LiteratureGenre.literature_id}
+    if (id_column := id_columns.get(orm_execute_state.bind_mapper)) is None:
+        return None
+    session = orm_execute_state.session
+    if orm_execute_state.is_insert or (orm_execute_state.is_update and id_column is LiteratureGenre.literature_id):
+        # new literature ids are unknown before the statement runs
+        CatalogueIndex().mark_dirty(session, None)
+        return None
+    if orm_execute_state.is_update and not _INDEXED_KEYS & AlchemyExtras.get_updated_keys(orm_execute_state):
+        return None
+    CatalogueIndex().mark_dirty(session, AlchemyExtras.get_affected_ids(orm_execute_state, id_column))
+    return None
+
+
+@event.listens_for(Session, 'after_commit')
+def _session_committed(session: Session):
+    CatalogueIndex().committed(session)
+    FacetCounts().committed(session)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _session_rolled_back(session: Session):
+    CatalogueIndex().rolled_back(session)
+    FacetCounts().rolled_back(session)
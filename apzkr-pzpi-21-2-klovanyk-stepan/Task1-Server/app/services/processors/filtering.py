@@ -1,18 +1,24 @@
 from __future__ import annotations
 
+import datetime
+import decimal
 import re
-from collections import UserList, defaultdict
+import threading
+from collections import UserList, deque
 from dataclasses import dataclass
 from enum import Enum
-from typing import Callable, cast
+from http import HTTPStatus
+from typing import Callable, Hashable, cast
 
-from flask import Request
-from icecream import ic
-from sqlalchemy import Column
-from sqlalchemy.orm import Query
+from flask import Request, current_app
+from sqlalchemy import Column, and_, distinct, exists, func, literal, or_, select
+from sqlalchemy.orm import Query, join
 
 from app.database.models import Base
-from app.utils.extra import merge_chained, AlchemyExtras
+from app.utils.base import LRUCache, SingletonMeta
+from app.utils.extra import merge_chained, AlchemyExtras, SecondaryConfig, UnindexedSortPolicy
+from app.services.validators.base import ValidationException, ValidationExceptionType
+from app.services.processors.pagination import KeysetCursor
 from app.services.validators.crud import DataTypesAdapter
 
 
@@ -21,6 +27,10 @@ class RequestQuerySupportedArgs(Enum):
     OFFSET = ['offset', 'shift', 'o', 'start', 'from', 'skip', 'of', 'off', 'ofst']
     MAX_COUNT = ['max_count', 'max', 'mc', 'limit', 'count', 'pagesize']
     JOIN = ['join', 'j', 'jn', 'jo', 'jn', 'joi', 'joine', 'joiner']
+    CURSOR = ['cursor', 'cur', 'after', 'crs']
+    SORT = ['sort', 's', 'order', 'order_by', 'ordering', 'srt']
+    GROUP_BY = ['group_by', 'groupby', 'gb', 'grp']
+    AGGREGATE = ['agg', 'aggregate', 'aggr']
 
     @classmethod
     def by_tag(cls, tag: str):
@@ -34,7 +44,10 @@ _args_supported = RequestQuerySupportedArgs
 
 
 class RequestQueryArgsModifiersStorage:
-    _ORDER = [_args_supported.JOIN, _args_supported.FILTER, _args_supported.OFFSET, _args_supported.MAX_COUNT]
+    _ORDER = [
+        _args_supported.JOIN, _args_supported.FILTER, _args_supported.AGGREGATE, _args_supported.SORT,
+        _args_supported.CURSOR, _args_supported.OFFSET, _args_supported.MAX_COUNT
+    ]
 
     def __init__(self):
         self._modifiers_data: dict[_args_supported, list[Callable[[Query], Query]]] \
@@ -70,7 +83,416 @@ class RequestQueryArgsModifiersStorage:
         return merge_chained(*all_merged)
 
 
+@dataclass
+class FilteringDataRaw:
+    table: str | None
+    column: str
+    operator: str
+    value: str
+
+
+@dataclass
+class FilterExpression:
+    AND = '&'
+    OR = '|'
+
+    operator: str
+    operands: list[FilterExpression | FilteringDataRaw]
+
+
+class FilterExpressionParser:
+    """
+    Parses one ``f=`` argument into a tree of :class:`FilterExpression` over :class:`FilteringDataRaw` leaves::
+
+        expression  := conjunction ('|' conjunction)*
+        conjunction := operand ('&' operand)*
+        operand     := '(' expression ')' | [table '.'] column operator value
+
+    Operators: ``= != > >= < <= ~`` (like), ``<<`` (in, comma separated values)
+    and ``><`` (between, two comma separated values).
+    A value ends at ``|``, ``&`` or a ``)`` closing a group, unless it is wrapped in double quotes.
+    A single comparison, the former ``f=`` syntax, stays a valid expression.
+    """
+    OPERATORS = ('<<', '><', '>=', '<=', '!=', '=', '>', '<', '~')
+    LIST_OPERATORS = ('<<', '><')
+    LIST_DELIMITER = ','
+    _QUOTE = '"'
+    _OPERAND = re.compile(r'\s*(?:(\w+)\s*\.\s*)?(\w+)\s*')
+
+    def __init__(self, text: str):
+        self.text = text
+        self.position = 0
+        self.depth = 0
+
+    @classmethod
+    def invalid(cls, details: str):
+        return ValidationException(ValidationExceptionType.INVALID_FILTER_ARGS, HTTPStatus.BAD_REQUEST, details)
+
+    def parse(self) -> FilterExpression | FilteringDataRaw:
+        expression = self._expression()
+        if self._peek() is not None:
+            raise self.invalid(f'Unexpected {self._peek()} at {self.position} in filter: {self.text}')
+        return expression
+
+    def _peek(self) -> str | None:
+        while self.position < len(self.text) and self.text[self.position].isspace():
+            self.position += 1
+        return self.text[self.position] if self.position < len(self.text) else None
+
+    def _accept(self, char: str) -> bool:
+        if self._peek() == char:
+            self.position += 1
+            return True
+        return False
+
+    def _combined(self, operator: str, operand: Callable[[], FilterExpression | FilteringDataRaw]):
+        operands = [operand()]
+        while self._accept(operator):
+            operands.append(operand())
+        return operands[0] if len(operands) == 1 else FilterExpression(operator, operands)
+
+    def _expression(self):
+        return self._combined(FilterExpression.OR, self._conjunction)
+
+    def _conjunction(self):
+        return self._combined(FilterExpression.AND, self._operand)
+
+    def _operand(self):
+        if self._accept('('):
+            self.depth += 1
+            expression = self._expression()
+            if not self._accept(')'):
+                raise self.invalid(f'Unclosed group in filter: {self.text}')
+            self.depth -= 1
+            return expression
+        return self._comparison()
+
+    def _comparison(self) -> FilteringDataRaw:
+        if not (match := self._OPERAND.match(self.text, self.position)):
+            raise self.invalid(f'Invalid filtering tag data: {self.text}')
+        table, column = match.groups()
+        self.position = match.end()
+        if not (operator := next((o for o in self.OPERATORS if self.text.startswith(o, self.position)), None)):
+            raise self.invalid(f'Invalid filtering tag data: {self.text}')
+        self.position += len(operator)
+        return FilteringDataRaw(table, column, operator, self._value())
+
+    def _value(self) -> str:
+        if self._peek() == self._QUOTE:
+            end = self.text.find(self._QUOTE, self.position + 1)
+            if end < 0:
+                raise self.invalid(f'Unclosed quote in filter: {self.text}')
+            value, self.position = self.text[self.position + 1:end], end + 1
+            return value
+        start = self.position
+        while self.position < len(self.text):
+            char = self.text[self.position]
+            if char in (FilterExpression.OR, FilterExpression.AND) or char == ')' and self.depth:
+                break
+            self.position += 1
+        return self.text[start:self.position].strip()
+
+
+@dataclass(frozen=True)
+class CompiledArgs:
+    """
+    Cached result of one args tag: its query modifiers and the tables they reference,
+    which :class:`JoinPathResolver` joins to the base model.
+    """
+    modifiers: tuple[Callable[[Query], Query], ...] = ()
+    tables: frozenset[type[Base]] = frozenset()
+
+
+@dataclass(frozen=True)
+class JoinStep:
+    """
+    ``to_many`` steps go from a parent to the rows referencing it, joining them multiplies the rows of the query.
+    """
+    table: type[Base]
+    onclause: any
+    to_many: bool = False
+
+
+@dataclass(frozen=True)
+class SemiJoin:
+    """
+    A clause over tables behind a to-many step: ``direct_tables`` are joined to the base model,
+    ``semi_tables`` only appear in the correlated ``exists_clause``.
+    """
+    clause: any
+    exists_clause: any
+    direct_tables: frozenset[type[Base]]
+    semi_tables: frozenset[type[Base]]
+
+
+class JoinPathResolver(metaclass=SingletonMeta):
+    """
+    Shortest join paths between models over the foreign key graph of :class:`AlchemyExtras`.
+    Paths are searched breadth first, neighbours in table name order, and cached per (base, target).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._paths: dict[tuple[type[Base], type[Base]], tuple[JoinStep, ...]] = {}
+        self._adjacency = self._build_adjacency()
+
+    @classmethod
+    def _build_adjacency(cls) -> dict[type[Base], dict[type[Base], tuple[any, bool]]]:
+        extras = AlchemyExtras()
+        adjacency: dict[type[Base], dict[type[Base], tuple[any, bool]]] = {
+            table: {} for table in extras.get_all_tables().values()
+        }
+        for child_table in sorted(adjacency, key=lambda t: t.__tablename__):
+            for key, child in sorted(extras.get_columns_of(child_table).items()):
+                parent, _ = extras.get_parent_and_children_of(child)
+                if parent is None:
+                    continue
+                parent_table = extras.get_table_by_name(parent.table.name)
+                if parent_table is child_table:
+                    continue
+                # the first foreign key between two tables, in column name order, wins
+                adjacency[child_table].setdefault(parent_table, (child == parent, False))
+                adjacency[parent_table].setdefault(child_table, (child == parent, True))
+        return adjacency
+
+    def path(self, base: type[Base], target: type[Base]) -> tuple[JoinStep, ...]:
+        with self._lock:
+            if (base, target) not in self._paths:
+                self._paths[(base, target)] = self._search(base, target)
+            return self._paths[(base, target)]
+
+    def _search(self, base: type[Base], target: type[Base]) -> tuple[JoinStep, ...]:
+        previous: dict[type[Base], type[Base] | None] = {base: None}
+        queue = deque([base])
+        while queue:
+            table = queue.popleft()
+            if table is target:
+                break
+            for neighbour in sorted(self._adjacency[table], key=lambda t: t.__tablename__):
+                if neighbour not in previous:
+                    previous[neighbour] = table
+                    queue.append(neighbour)
+        if target not in previous:
+            raise ValueError(f'No join path from {base.__tablename__} to {target.__tablename__}')
+        steps = []
+        table = target
+        while previous[table] is not None:
+            steps.append(JoinStep(table, *self._adjacency[previous[table]][table]))
+            table = previous[table]
+        return tuple(reversed(steps))
+
+    def steps(self, base: type[Base], targets: frozenset[type[Base]]) -> list[JoinStep]:
+        steps: dict[type[Base], JoinStep] = {}
+        for target in sorted(targets - {base}, key=lambda t: t.__tablename__):
+            for step in self.path(base, target):
+                steps.setdefault(step.table, step)
+        return list(steps.values())
+
+    def crosses_to_many(self, base: type[Base], target: type[Base]) -> bool:
+        return any(step.to_many for step in self.path(base, target))
+
+    def semi_join(self, base: type[Base], targets: frozenset[type[Base]], clause) -> SemiJoin | None:
+        """
+        Moves the part of ``clause`` paths after their first to-many step into a correlated EXISTS subquery,
+        so filtering by e.g. ``genre.name`` never repeats a literature once per matching genre.
+        ``None`` when every path goes along many-to-one steps only.
+        """
+        direct_tables: set[type[Base]] = set()
+        branches: dict[type[Base], dict[type[Base], JoinStep]] = {}
+        for target in sorted(targets - {base}, key=lambda t: t.__tablename__):
+            path = self.path(base, target)
+            first = next((i for i, step in enumerate(path) if step.to_many), len(path))
+            direct_tables.update(step.table for step in path[:first])
+            if first < len(path):
+                branch = branches.setdefault(path[first].table, {})
+                for step in path[first:]:
+                    branch.setdefault(step.table, step)
+        if not branches:
+            return None
+        froms, correlations = [], []
+        for branch in branches.values():
+            head, *rest = branch.values()
+            correlations.append(head.onclause)
+            from_ = head.table
+            for step in rest:
+                from_ = join(from_, step.table, step.onclause)
+            froms.append(from_)
+        semi_tables = frozenset(table for branch in branches.values() for table in branch)
+        subquery = select(literal(1)).select_from(*froms).where(*correlations, clause).correlate_except(
+            *semi_tables
+        )
+        return SemiJoin(clause, exists(subquery), frozenset(direct_tables), semi_tables)
+
+    @classmethod
+    def joined_table_names(cls, query: Query) -> set[str]:
+        entities = [*query._raw_columns, *[join[0] for join in query._setup_joins]]
+        return {name for entity in entities if (name := getattr(entity, 'name', None))}
+
+    def modifier(self, base: type[Base], targets: frozenset[type[Base]]) -> Callable[[Query], Query]:
+        """
+        Joins every table of ``targets`` once, skipping tables already joined by the query,
+        e.g. by route query modifiers.
+        """
+        steps = self.steps(base, targets)
+
+        def inner(query: Query):
+            joined = self.joined_table_names(query)
+            for step in steps:
+                if step.table.__tablename__ not in joined:
+                    query = query.join(step.table, step.onclause)
+                    joined.add(step.table.__tablename__)
+            return query
+
+        return inner
+
+
+class QueryAggregation:
+    """
+    ``group_by=room_id,booking.registration_time:date&agg=count,max(expiration_time)`` turns a READ_MANY query
+    into grouped rows: one per distinct group value, holding the group values and the aggregates.
+
+    Aggregates: ``count`` (base rows of the group), ``count(column)``, ``count_distinct(column)``,
+    ``sum``, ``avg``, ``min`` and ``max`` of a column. ``sum``/``avg`` need numeric columns,
+    ``min``/``max`` comparable ones. ``:date`` truncates a grouped date and time to its day, labelled ``date(column)``.
+    ``sort`` orders aggregated rows by their labels, e.g. ``sort=-count,room_id``.
+    Aggregated queries are marked with the :attr:`EXECUTION_OPTION` execution option.
+    """
+    EXECUTION_OPTION = 'aggregated'
+    GRANULARITIES = {'date': func.date}
+    _NUMERIC = (int, float, decimal.Decimal)
+    _COMPARABLE = (*_NUMERIC, str, datetime.date, datetime.time, datetime.timedelta)
+    _GROUP_REGEX = re.compile(r'^\s*(?:(\w+)\s*\.\s*)?(\w+)\s*(?::\s*(\w+))?\s*$')
+    _SORT_REGEX = re.compile(r'^\s*([+-]?)\s*([^:\s]+?)\s*(?::\s*(asc|desc))?\s*$', re.IGNORECASE)
+    _AGGREGATE_REGEX = re.compile(r'^\s*(\w+)\s*(?:\(\s*(?:(\w+)\s*\.\s*)?(\w+)\s*\))?\s*$')
+
+    def __init__(
+            self, base_type: type[Base], group_by_data: list[str], aggregate_data: list[str], sort_data: list[str]
+    ):
+        self.base_type = base_type
+        self.group_by_items = self._items_of(group_by_data)
+        self.aggregate_items = self._items_of(aggregate_data)
+        self.sort_items = self._items_of(sort_data)
+        self.tables: set[type[Base]] = set()
+
+    @staticmethod
+    def _items_of(tags_data: list[str]) -> list[str]:
+        # commas inside aggregate parentheses never occur, a plain split is enough
+        return [item for tag_data in tags_data for item in tag_data.split(',') if item.strip()]
+
+    @classmethod
+    def is_aggregated(cls, query: Query) -> bool:
+        return bool(query.get_execution_options().get(cls.EXECUTION_OPTION))
+
+    @classmethod
+    def _invalid(cls, details: str):
+        return ValidationException(ValidationExceptionType.INVALID_AGGREGATION_ARGS, HTTPStatus.BAD_REQUEST, details)
+
+    def _column(self, table_data: str | None, column_data: str) -> tuple[Column, str]:
+        extras = AlchemyExtras()
+        try:
+            table = extras.get_table_by_name(table_data) if table_data else self.base_type
+            column = extras.get_columns_of(table)[column_data]
+        except KeyError:
+            raise self._invalid(f'Unknown column {table_data and table_data + "." or ""}{column_data}')
+        self.tables.add(table)
+        return column, column_data if table is self.base_type else f'{table.__tablename__}.{column_data}'
+
+    @classmethod
+    def _python_type(cls, column: Column) -> type | None:
+        try:
+            return column.type.python_type
+        except NotImplementedError:
+            return None
+
+    def _group_by(self, item: str):
+        if not (match := self._GROUP_REGEX.match(item)):
+            raise self._invalid(f'Invalid group by: {item}')
+        table_data, column_data, granularity = match.groups()
+        column, label = self._column(table_data, column_data)
+        if granularity is None:
+            return column.label(label)
+        if granularity not in self.GRANULARITIES:
+            raise self._invalid(f'Unknown granularity {granularity}, use one of {", ".join(self.GRANULARITIES)}')
+        if not issubclass(self._python_type(column) or object, datetime.date):
+            raise self._invalid(f'{label}:{granularity} needs a date or time column')
+        return self.GRANULARITIES[granularity](column).label(f'{granularity}({label})')
+
+    def _aggregate(self, item: str):
+        if not (match := self._AGGREGATE_REGEX.match(item)):
+            raise self._invalid(f'Invalid aggregate: {item}')
+        function, table_data, column_data = match.groups()
+        function = function.lower()
+        if column_data is None:
+            if function != 'count':
+                raise self._invalid(f'{function} needs a column: {function}(column)')
+            pk = sorted(AlchemyExtras().get_pk_of(self.base_type), key=lambda c: c.key)
+            return (func.count(distinct(pk[0])) if len(pk) == 1 else func.count()).label('count')
+        column, label = self._column(table_data, column_data)
+        python_type = self._python_type(column)
+        label = f'{function}({label})'
+        if function == 'count':
+            return func.count(column).label(label)
+        if function == 'count_distinct':
+            return func.count(distinct(column)).label(label)
+        if function in ('sum', 'avg'):
+            if python_type is bool or not issubclass(python_type or object, self._NUMERIC):
+                raise self._invalid(f'{label} needs a numeric column')
+            return getattr(func, function)(column).label(label)
+        if function in ('min', 'max'):
+            if python_type is bool or not issubclass(python_type or object, self._COMPARABLE):
+                raise self._invalid(f'{label} needs a comparable column')
+            return getattr(func, function)(column).label(label)
+        raise self._invalid(f'Unknown aggregate function: {function}')
+
+    def _ordering(self, item: str, labels: dict[str, any]):
+        if not (match := self._SORT_REGEX.match(item)):
+            raise self._invalid(f'Invalid sort: {item}')
+        sign, label, direction = match.groups()
+        if label not in labels:
+            raise self._invalid(f'Aggregated rows are sorted by their labels: {", ".join(labels)}')
+        descending = sign == '-' or (direction or '').lower() == 'desc'
+        return labels[label].desc() if descending else labels[label].asc()
+
+    def compile(self) -> CompiledArgs:
+        groups = [self._group_by(item) for item in self.group_by_items]
+        aggregates = [self._aggregate(item) for item in self.aggregate_items] or [self._aggregate('count')]
+        labels = {label.name: label for label in [*groups, *aggregates]}
+        orderings = [self._ordering(item, labels) for item in self.sort_items]
+
+        def modifier(query: Query):
+            query = query.with_entities(*groups, *aggregates).execution_options(**{self.EXECUTION_OPTION: True})
+            if groups:
+                query = query.group_by(*[group.element for group in groups])
+            return query.order_by(*orderings) if orderings else query
+
+        return CompiledArgs((modifier,), frozenset(self.tables))
+
+
 class RequestQueryArgsResolver:
+    """
+    Compiled JOIN, FILTER and SORT modifiers are cached per (model, tag, normalized args), so repeated queries
+    skip parsing, table/column lookups and values adaptation.
+    Tables referenced by any of them are joined once, along the shortest path found by :class:`JoinPathResolver`.
+    Filters never join tables behind a to-many step of that path, they check them with EXISTS.
+    """
+    _cache: LRUCache[Hashable, CompiledArgs] | None = None
+
+    @classmethod
+    def _get_cache(cls) -> LRUCache[Hashable, CompiledArgs]:
+        if cls._cache is None:
+            cls._cache = LRUCache(SecondaryConfig().QUERY_ARGS_CACHE_SIZE)
+        return cls._cache
+
+    @classmethod
+    def cache_info(cls) -> dict[str, int]:
+        return cls._get_cache().info()
+
+    def _cached_modifiers(
+            self, tag: _args_supported, args_key: tuple[str, ...], compile_: Callable[[], CompiledArgs]
+    ) -> CompiledArgs:
+        compiled = self._get_cache().get_or_compute((self.base_type, tag, args_key), compile_)
+        self._referenced_tables |= compiled.tables
+        return compiled
 
     def __init__(self, request: Request, for_type: type[Base]):
         self.all_args = request.args
@@ -78,12 +500,31 @@ class RequestQueryArgsResolver:
         # ic(request.url)
         self.modifiers_storage = RequestQueryArgsModifiersStorage()
         self._filtered: list[tuple[_args_supported, str]] | None = None
+        self._referenced_tables: frozenset[type[Base]] = frozenset()
 
     def process_args(self):
         self._filter_args()
         self._tags_resolve()
         return self.modifiers_storage.composed()
 
+    def process_where_args(self):
+        """
+        Modifiers selecting the rows of a bulk UPDATE/DELETE: filters and joins only, at least one filter.
+        """
+        self._filter_args()
+        if unsupported := self._filtered.keys() - {_args_supported.FILTER, _args_supported.JOIN}:
+            raise ValidationException(
+                ValidationExceptionType.INVALID_BULK_CHANGE_ARGS, HTTPStatus.BAD_REQUEST,
+                f'Unsupported arguments: {", ".join(sorted(tag.value[0] for tag in unsupported))}'
+            )
+        if not self._filtered.get(_args_supported.FILTER):
+            raise ValidationException(
+                ValidationExceptionType.INVALID_BULK_CHANGE_ARGS, HTTPStatus.BAD_REQUEST,
+                'Provide a filter selecting the objects to change'
+            )
+        self._tags_resolve()
+        return self.modifiers_storage.composed()
+
     def _filter_args(self):
         self._filtered = {t: [value for value in values if value]
                           for key in self.all_args
@@ -96,15 +537,21 @@ class RequestQueryArgsResolver:
         if self._filtered is None:
             raise ValueError('Args was not filtered')
 
+        aggregated = _args_supported.GROUP_BY in self._filtered or _args_supported.AGGREGATE in self._filtered
         for tag, tags_data in self._filtered.items():
             if tag == _args_supported.JOIN:
-                self.modifiers_storage[tag].extend(
-                    self._resolve_join_tags_data(tags_data)
-                )
+                self.modifiers_storage[tag].extend(self._cached_modifiers(
+                    tag, tuple(tags_data), lambda: self._resolve_join_tags_data(tags_data)
+                ).modifiers)
             elif tag == _args_supported.FILTER:
-                self.modifiers_storage[tag].extend(
-                    self._resolve_filtering_tags_data(tags_data)
-                )
+                # filters are AND-ed, their order does not matter
+                self.modifiers_storage[tag].extend(self._cached_modifiers(
+                    tag, tuple(sorted(tags_data)), lambda: self._resolve_filtering_tags_data(tags_data)
+                ).modifiers)
+            elif tag == _args_supported.SORT and not aggregated:
+                self.modifiers_storage[tag].extend(self._cached_modifiers(
+                    tag, tuple(tags_data), lambda: self._resolve_sort_tags_data(tags_data)
+                ).modifiers)
             elif tag == _args_supported.OFFSET:
                 self.modifiers_storage[tag].append(
                     self._offset_to_offset_modifier(self._resolve_offset_tags_data(tags_data))
@@ -113,6 +560,29 @@ class RequestQueryArgsResolver:
                 self.modifiers_storage[tag].append(
                     self._max_count_to_max_count_modifier(self._resolve_max_count_tags_data(tags_data))
                 )
+            elif tag == _args_supported.CURSOR:
+                self.modifiers_storage[tag].append(
+                    KeysetCursor.modifier(self._take_one_tag_data(tags_data, take_last=True), self.base_type)
+                )
+
+        if aggregated:
+            if _args_supported.CURSOR in self._filtered:
+                raise ValidationException(
+                    ValidationExceptionType.INVALID_AGGREGATION_ARGS, HTTPStatus.BAD_REQUEST,
+                    'Aggregated rows are paginated by offset only'
+                )
+            group_by_data = self._filtered.get(_args_supported.GROUP_BY, [])
+            aggregate_data = self._filtered.get(_args_supported.AGGREGATE, [])
+            sort_data = self._filtered.get(_args_supported.SORT, [])
+            self.modifiers_storage[_args_supported.AGGREGATE].extend(self._cached_modifiers(
+                _args_supported.AGGREGATE, (tuple(group_by_data), tuple(aggregate_data), tuple(sort_data)),
+                lambda: QueryAggregation(self.base_type, group_by_data, aggregate_data, sort_data).compile()
+            ).modifiers)
+
+        if self._referenced_tables - {self.base_type}:
+            self.modifiers_storage[_args_supported.JOIN].append(
+                JoinPathResolver().modifier(self.base_type, self._referenced_tables)
+            )
 
     @classmethod
     def _offset_to_offset_modifier(cls, offset: int) -> Callable[[Query], Query]:
@@ -120,91 +590,145 @@ class RequestQueryArgsResolver:
 
     @classmethod
     def _max_count_to_max_count_modifier(cls, max_count: int) -> Callable[[Query], Query]:
-        return lambda query: cast(Query, query).limit(str(max_count))
+        return lambda query: cast(Query, query).limit(max_count)
 
     def _resolve_join_tags_data(self, tags_data: list[str]):
-        def inner():
-            for tag_data in tags_data:
-                table = self._table_data_to_table(tag_data)
-                yield self._table_to_join_modifier(table)
-
-        return list(inner())
-
-    @classmethod
-    def _table_to_join_modifier(cls, table: type[Base]) -> Callable[[Query], Query]:
-        def modifier(query: Query):
-            return query.join(table)
-
-        return modifier
+        """
+        Explicit joins only name tables, they are joined together with the implicit ones.
+        """
+        return CompiledArgs(tables=frozenset(self._table_data_to_table(tag_data) for tag_data in tags_data))
 
     def _resolve_filtering_tags_data(self, tags_data: list[str]):
-        def inner():
-            in_data: dict[type[Base], dict[Column, list[any]]] \
-                = defaultdict(lambda: defaultdict(lambda: list()))
-            for tag_data in tags_data:
-                raw_filtering_data = self._tag_data_to_filtering_data_raw(tag_data)
-                filtering_data = self._filtering_data_raw_to_filtering_data(raw_filtering_data)
-                # if filtering_data.operator == "<<":
-                #     in_data[filtering_data.table][filtering_data.column]+=[filtering_data.value]
-                # else:
-                yield self._filtering_data_to_filtering_modifier(filtering_data)
-            # yield self._in_data_to_in_modifier(in_data)
-
-        return list(inner())
-
-    def _in_data_to_in_modifier(self, in_data: dict[type[Base], dict[Column, list[any]]]):
-        def modifier(query: Query):
-            for table in in_data:
-                for column in in_data[table]:
-                    query = query.where(column.in_(in_data[table][column]))
-            return query
-
-        return modifier
-
-    _FILTERING_REGEX = r"^[\d\s\W]*(?:(\w+?)[\s\W]*[.])?[\d\s\W]*(\w+?)[\s\W]*?([=><~!]+)(.*)$"
+        """
+        Tables reached along many-to-one steps are joined. A filter over tables behind a to-many step
+        becomes a correlated EXISTS instead, unless the query already joins them, e.g. on ``j=``.
+        """
+        tables: set[type[Base]] = set()
+        modifiers = []
+        for tag_data in tags_data:
+            clause_tables: set[type[Base]] = set()
+            clause = self._filter_expression_to_clause(FilterExpressionParser(tag_data).parse(), clause_tables)
+            semi_join = JoinPathResolver().semi_join(self.base_type, frozenset(clause_tables), clause)
+            if semi_join is None:
+                tables |= clause_tables
+                modifiers.append(self._clause_to_filtering_modifier(clause))
+            else:
+                tables |= semi_join.direct_tables
+                modifiers.append(self._semi_join_to_filtering_modifier(semi_join))
+        return CompiledArgs(tuple(modifiers), frozenset(tables))
+
+    def _filter_expression_to_clause(self, expression: FilterExpression | FilteringDataRaw, tables: set[type[Base]]):
+        if isinstance(expression, FilterExpression):
+            combine = or_ if expression.operator == FilterExpression.OR else and_
+            return combine(*[self._filter_expression_to_clause(operand, tables) for operand in expression.operands])
+        filtering_data = self._filtering_data_raw_to_filtering_data(expression)
+        tables.add(filtering_data.table)
+        return self._filtering_data_to_clause(filtering_data)
 
     @classmethod
-    def _tag_data_to_filtering_data_raw(cls, tag_data: str):
-        match = re.match(cls._FILTERING_REGEX, tag_data)
-        if not match:
-            raise ValueError(f'Invalid filtering tag data: {tag_data}')
+    def _clause_to_filtering_modifier(cls, clause) -> Callable[[Query], Query]:
+        return lambda query: query.where(clause)
 
-        table, column, operator, value = match.groups()
-        ic(table, column, operator, value)
+    @classmethod
+    def _semi_join_to_filtering_modifier(cls, semi_join: SemiJoin) -> Callable[[Query], Query]:
+        semi_table_names = {table.__tablename__ for table in semi_join.semi_tables}
 
-        if column is None or operator is None or value is None:
-            raise ValueError(f'Invalid filtering tag data: {tag_data}')
+        def inner(query: Query):
+            if semi_table_names <= JoinPathResolver.joined_table_names(query):
+                return query.where(semi_join.clause)
+            return query.where(semi_join.exists_clause)
 
-        return cls.FilteringDataRaw(table, column, operator, value)
+        return inner
 
     def _filtering_data_raw_to_filtering_data(self, data_raw: FilteringDataRaw) -> FilteringData:
-        return self.FilteringData(
-            table=(table_base := self._table_data_to_table(data_raw.table)),
-            column=(column := self._column_data_to_column(table_base, data_raw.column)),
-            operator=data_raw.operator,
-            value=self._value_data_to_column_value(table_base, column, data_raw.value)
-        )
+        try:
+            table_base = self._table_data_to_table(data_raw.table)
+            column = self._column_data_to_column(table_base, data_raw.column)
+        except KeyError:
+            raise FilterExpressionParser.invalid(
+                f'Unknown column {data_raw.table and data_raw.table + "." or ""}{data_raw.column}'
+            )
+        if data_raw.operator in FilterExpressionParser.LIST_OPERATORS:
+            values = [value.strip() for value in data_raw.value.split(FilterExpressionParser.LIST_DELIMITER)]
+            if data_raw.operator == '><' and len(values) != 2:
+                raise FilterExpressionParser.invalid(f'Between requires exactly two values: {data_raw.value}')
+        else:
+            values = [data_raw.value]
+        try:
+            value = [self._value_data_to_column_value(table_base, column, value) for value in values]
+        except (ValueError, TypeError):
+            raise FilterExpressionParser.invalid(f'Invalid value of {column.table.name}.{column.key}: {data_raw.value}')
+        if data_raw.operator not in FilterExpressionParser.LIST_OPERATORS:
+            value = value[0]
+        return self.FilteringData(table=table_base, column=column, operator=data_raw.operator, value=value)
 
     @classmethod
-    def _filtering_data_to_filtering_modifier(cls, filtering_data: FilteringData):
-        def modifier(query: Query):
-            if filtering_data.operator == '=':
-                return query.where(filtering_data.column == filtering_data.value)
-            if filtering_data.operator == '!=':
-                return query.where(filtering_data.column != filtering_data.value)
-            if filtering_data.operator == '>':
-                return query.where(filtering_data.column > filtering_data.value)
-            if filtering_data.operator == '>=':
-                return query.where(filtering_data.column >= filtering_data.value)
-            if filtering_data.operator == '<':
-                return query.where(filtering_data.column < filtering_data.value)
-            if filtering_data.operator == '<=':
-                return query.where(filtering_data.column <= filtering_data.value)
-            if filtering_data.operator == '~':
-                return query.where(filtering_data.column.like(f"%{filtering_data.value}%"))
-            raise ValueError(f'Unknown operator: {filtering_data.operator}')
-
-        return modifier
+    def _filtering_data_to_clause(cls, filtering_data: FilteringData):
+        if filtering_data.operator == '=':
+            return filtering_data.column == filtering_data.value
+        if filtering_data.operator == '!=':
+            return filtering_data.column != filtering_data.value
+        if filtering_data.operator == '>':
+            return filtering_data.column > filtering_data.value
+        if filtering_data.operator == '>=':
+            return filtering_data.column >= filtering_data.value
+        if filtering_data.operator == '<':
+            return filtering_data.column < filtering_data.value
+        if filtering_data.operator == '<=':
+            return filtering_data.column <= filtering_data.value
+        if filtering_data.operator == '~':
+            return filtering_data.column.like(f"%{filtering_data.value}%")
+        if filtering_data.operator == '<<':
+            return filtering_data.column.in_(filtering_data.value)
+        if filtering_data.operator == '><':
+            return filtering_data.column.between(*filtering_data.value)
+        raise ValueError(f'Unknown operator: {filtering_data.operator}')
+
+    _SORT_REGEX = re.compile(r'^\s*([+-]?)\s*(?:(\w+)\s*\.\s*)?(\w+)\s*(?::\s*(asc|desc))?\s*$', re.IGNORECASE)
+
+    def _resolve_sort_tags_data(self, tags_data: list[str]):
+        """
+        ``sort=-name,type_name:asc,company.id`` - ``-`` prefix or ``:desc`` suffix sorts descending.
+        Sort columns precede the primary key tiebreakers of keyset cursors.
+        """
+        clauses = []
+        tables = set()
+        for item in (item for tag_data in tags_data for item in tag_data.split(',') if item.strip()):
+            if not (match := self._SORT_REGEX.match(item)):
+                raise ValidationException(
+                    ValidationExceptionType.INVALID_SORT_ARGS, HTTPStatus.BAD_REQUEST, f'Invalid sort tag data: {item}'
+                )
+            sign, table_data, column_data, direction = match.groups()
+            try:
+                table = self._table_data_to_table(table_data)
+                column = self._column_data_to_column(table, column_data)
+            except KeyError:
+                raise ValidationException(
+                    ValidationExceptionType.INVALID_SORT_ARGS, HTTPStatus.BAD_REQUEST, f'Unknown sort column: {item}'
+                )
+            self._validate_sort_column(column)
+            if table is not self.base_type and JoinPathResolver().crosses_to_many(self.base_type, table):
+                raise ValidationException(
+                    ValidationExceptionType.INVALID_SORT_ARGS, HTTPStatus.BAD_REQUEST,
+                    f'Sorting by {table.__tablename__}.{column.key} would repeat {self.base_type.__tablename__} rows'
+                )
+            tables.add(table)
+            descending = sign == '-' or (direction or '').lower() == 'desc'
+            clauses.append(column.desc() if descending else column.asc())
+        modifiers = (lambda query: query.order_by(*clauses),) if clauses else ()
+        return CompiledArgs(modifiers, frozenset(tables))
+
+    @classmethod
+    def _validate_sort_column(cls, column: Column):
+        policy = SecondaryConfig().SORT_UNINDEXED_POLICY
+        if policy == UnindexedSortPolicy.ALLOW or AlchemyExtras().is_column_indexed(column):
+            return
+        ident = f'{column.table.name}.{column.key}'
+        if policy == UnindexedSortPolicy.REJECT:
+            raise ValidationException(
+                ValidationExceptionType.SORT_COLUMN_NOT_INDEXED, HTTPStatus.BAD_REQUEST, ident
+            )
+        current_app.logger.warning(f'Sorting by {ident}, which is not indexed')
 
     def _table_data_to_table(self, table_data: str | None):
         if not table_data:
@@ -220,13 +744,6 @@ class RequestQueryArgsResolver:
         adapter = DataTypesAdapter(table_base)
         return adapter.adapt_types({column.key: value})[column.key]
 
-    @dataclass
-    class FilteringDataRaw:
-        table: str
-        column: str
-        operator: str
-        value: str
-
     @dataclass
     class FilteringData:
         table: type[Base]
@@ -0,0 +1,275 @@
+from __future__ import annotations
+
+import base64
+import binascii
+import copy
+import datetime
+import json
+from dataclasses import dataclass
+from http import HTTPStatus
+from itertools import batched
+from typing import Callable, Iterable, Iterator
+
+from sqlalchemy import Column, and_, or_, false
+from sqlalchemy.orm import Query
+from sqlalchemy.sql import operators
+from sqlalchemy.sql.elements import UnaryExpression
+
+from app.database.models import Base
+from app.services.validators.base import ValidationException, ValidationExceptionType
+from app.utils.extra import AlchemyExtras, SecondaryConfig
+
+
+@dataclass
+class PaginationData:
+    offset: int = 0
+    limit: int | None = None
+
+    @classmethod
+    def extract_from(cls, query: Query) -> tuple[Query, PaginationData]:
+        """
+        Takes LIMIT/OFFSET clauses, put by :class:`RequestQueryArgsResolver` modifiers, off the query.
+        The paginator decides itself how they end up in SQL.
+        """
+        limit = query._limit_clause is not None and query._limit_clause.value or None
+        offset = query._offset_clause is not None and query._offset_clause.value or 0
+        return query.limit(None).offset(None), cls(int(offset), limit and int(limit))
+
+
+@dataclass(frozen=True)
+class OrderingColumn:
+    column: Column
+    descending: bool = False
+
+    @property
+    def ident(self):
+        return f'{self.column.table.name}.{self.column.key}{self.descending and ":desc" or ""}'
+
+    def as_clause(self):
+        return self.column.desc() if self.descending else self.column.asc()
+
+    def equals(self, value: any):
+        return self.column.is_(None) if value is None else self.column == value
+
+    def after(self, value: any):
+        """
+        NULLs are ordered as the smallest values, like MySQL and SQLite do.
+        """
+        if not self.descending:
+            return self.column.is_not(None) if value is None else self.column > value
+        if value is None:
+            return false()
+        return or_(self.column < value, self.column.is_(None)) if self.column.nullable else self.column < value
+
+
+class QueryOrdering:
+    """
+    Total ordering of a READ_MANY query: its own ORDER BY columns completed by the primary key of the model.
+    Keyset pagination requires every ordering column to belong to the model.
+    """
+
+    def __init__(self, query: Query, model: type[Base]):
+        self.model = model
+        self.columns: list[OrderingColumn] = []
+        self.is_keyset_capable = True
+        for clause in query._order_by_clauses:
+            if (ordering := self._as_model_ordering(clause)) is None:
+                self.is_keyset_capable = False
+                break
+            self.columns.append(ordering)
+        ordered = {ordering.column.key for ordering in self.columns}
+        self._tiebreakers = [OrderingColumn(pk) for pk in sorted(AlchemyExtras().get_pk_of(model), key=lambda c: c.key)
+                             if pk.key not in ordered]
+        self.columns += self._tiebreakers
+
+    def _as_model_ordering(self, clause) -> OrderingColumn | None:
+        descending = False
+        if isinstance(clause, UnaryExpression) and clause.modifier in (operators.desc_op, operators.asc_op):
+            descending = clause.modifier is operators.desc_op
+            clause = clause.element
+        column = AlchemyExtras().get_columns_of(self.model).get(getattr(clause, 'key', None))
+        if column is None or getattr(clause, 'table', None) is not column.table:
+            return None
+        return OrderingColumn(column, descending)
+
+    @property
+    def signature(self) -> list[str]:
+        return [ordering.ident for ordering in self.columns]
+
+    def validate_keyset_capable(self):
+        if not self.is_keyset_capable:
+            raise ValidationException(
+                ValidationExceptionType.INVALID_CURSOR, HTTPStatus.BAD_REQUEST,
+                f'Only columns of {self.model.__tablename__} can order keyset pages'
+            )
+        return self
+
+    def apply(self, query: Query) -> Query:
+        if not self.is_keyset_capable:
+            return query.order_by(*[ordering.as_clause() for ordering in self._tiebreakers])
+        return query.order_by(None).order_by(*[ordering.as_clause() for ordering in self.columns])
+
+
+class KeysetCursor:
+    """
+    Opaque pagination token: base64 encoded ordering signature and the ordering values of the last returned row.
+    Resuming from it is a ``WHERE (sort key, pk) > (last sort key, last pk)`` instead of an OFFSET scan.
+    """
+    _DATETIME_TAG = '$dt'
+
+    def __init__(self, ordering: QueryOrdering, values: list[any]):
+        self.ordering = ordering
+        self.values = values
+
+    @classmethod
+    def from_item(cls, ordering: QueryOrdering, item: Base):
+        return cls(ordering, [getattr(item, ordering_column.column.key) for ordering_column in ordering.columns])
+
+    @classmethod
+    def _encode_value(cls, value: any):
+        if isinstance(value, datetime.datetime):
+            return {cls._DATETIME_TAG: value.isoformat()}
+        return value
+
+    @classmethod
+    def _decode_value(cls, value: any):
+        if isinstance(value, dict) and cls._DATETIME_TAG in value:
+            return datetime.datetime.fromisoformat(value[cls._DATETIME_TAG])
+        return value
+
+    def encode(self) -> str:
+        raw = json.dumps({'o': self.ordering.signature, 'v': [self._encode_value(v) for v in self.values]})
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+    @classmethod
+    def decode(cls, token: str, ordering: QueryOrdering):
+        try:
+            data = json.loads(base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)))
+            signature, values = data['o'], data['v']
+        except (binascii.Error, ValueError, KeyError, TypeError) as e:
+            raise ValidationException(ValidationExceptionType.INVALID_CURSOR, HTTPStatus.BAD_REQUEST, e)
+        if signature != ordering.signature or len(values) != len(ordering.columns):
+            raise ValidationException(
+                ValidationExceptionType.INVALID_CURSOR, HTTPStatus.BAD_REQUEST,
+                'Cursor was issued for a different ordering'
+            )
+        return cls(ordering, [cls._decode_value(value) for value in values])
+
+    def predicate(self):
+        columns = self.ordering.columns
+        return or_(*[
+            and_(
+                *[equal.equals(value) for equal, value in zip(columns[:i], self.values[:i])],
+                columns[i].after(self.values[i])
+            )
+            for i in range(len(columns))
+        ])
+
+    @classmethod
+    def modifier(cls, token: str, model: type[Base]) -> Callable[[Query], Query]:
+        def inner(query: Query):
+            ordering = QueryOrdering(query, model).validate_keyset_capable()
+            return ordering.apply(query).where(cls.decode(token, ordering).predicate())
+
+        return inner
+
+
+class QueryPaginator[T: Base]:
+    """
+    Executes READ_MANY queries page by page.
+
+    Without items filter the page is a plain SQL ``LIMIT/OFFSET``.
+    With items filter (per-object permission validation) rows are over-fetched in growing batches
+    until the page holds exactly ``limit`` allowed items, so offset is counted in allowed items.
+    """
+
+    def __init__(
+            self,
+            query: Query,
+            model: type[T],
+            pagination: PaginationData,
+            items_filter: Callable[[list[T]], list[T]] | None = None
+    ):
+        self.ordering = QueryOrdering(query, model)
+        self.query = self.ordering.apply(query)
+        self.pagination = pagination
+        self.items_filter = items_filter
+
+    def project(self, columns: list[Column]) -> QueryPaginator:
+        """
+        Paginator over rows of ``columns`` instead of objects, available only without items filter.
+        Ordering columns missing from ``columns`` are selected after them, so cursors can still be taken.
+        """
+        assert self.items_filter is None
+        keys = {column.key for column in columns}
+        projected = copy.copy(self)
+        projected.query = self.query.with_entities(
+            *columns, *[ordering.column for ordering in self.ordering.columns if ordering.column.key not in keys]
+        )
+        return projected
+
+    def next_cursor(self, page: list[T]) -> str | None:
+        if not self.ordering.is_keyset_capable:
+            return None
+        if self.pagination.limit is None or not page or len(page) < self.pagination.limit:
+            return None
+        return KeysetCursor.from_item(self.ordering, page[-1]).encode()
+
+    def fetch(self) -> list[T]:
+        return [item for chunk in self.iterate() for item in chunk]
+
+    def iterate(self, chunk_size: int | None = None) -> Iterator[list[T]]:
+        """
+        Yields the page in chunks. With ``chunk_size`` rows are streamed from the cursor via ``yield_per``
+        and no chunk holds more than ``chunk_size`` items, so the whole result never sits in memory.
+        """
+        if self.items_filter is None:
+            query = self._page_query()
+            if chunk_size is None:
+                yield query.all()
+                return
+            yield from map(list, batched(query.yield_per(chunk_size), chunk_size))
+        elif self.pagination.limit is None:
+            chunk_size = chunk_size or SecondaryConfig().PAGINATION_MAX_BATCH_SIZE
+            yield from self._skip_offset(
+                self.items_filter(list(batch)) for batch in batched(self.query.yield_per(chunk_size), chunk_size)
+            )
+        else:
+            yield from self._skip_offset(self._filtered_batches(chunk_size))
+
+    def _page_query(self) -> Query:
+        query = self.query
+        if self.pagination.offset:
+            query = query.offset(self.pagination.offset)
+        if self.pagination.limit is not None:
+            query = query.limit(self.pagination.limit)
+        return query
+
+    def _skip_offset(self, chunks: Iterable[list[T]]) -> Iterator[list[T]]:
+        to_skip = self.pagination.offset
+        for chunk in chunks:
+            if to_skip:
+                skipped, to_skip = min(to_skip, len(chunk)), max(to_skip - len(chunk), 0)
+                chunk = chunk[skipped:]
+            if chunk:
+                yield chunk
+
+    def _initial_batch_size(self, max_batch_size: int) -> int:
+        config = SecondaryConfig()
+        wanted = self.pagination.offset + self.pagination.limit
+        return min(max(wanted * config.PAGINATION_OVERFETCH_FACTOR, config.PAGINATION_MIN_BATCH_SIZE), max_batch_size)
+
+    def _filtered_batches(self, max_batch_size: int | None) -> Iterator[list[T]]:
+        max_batch_size = max_batch_size or SecondaryConfig().PAGINATION_MAX_BATCH_SIZE
+        remaining = self.pagination.offset + self.pagination.limit
+        raw_offset = 0
+        batch_size = self._initial_batch_size(max_batch_size)
+        while True:
+            batch = self.query.offset(raw_offset).limit(batch_size).all()
+            raw_offset += len(batch)
+            allowed = self.items_filter(batch)[:remaining]
+            remaining -= len(allowed)
+            yield allowed
+            if not remaining or len(batch) < batch_size:
+                return
+            batch_size = min(batch_size * 2, max_batch_size)
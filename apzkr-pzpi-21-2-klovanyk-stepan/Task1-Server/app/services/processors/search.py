@@ -0,0 +1,375 @@
+from __future__ import annotations
+
+import bisect
+import math
+import re
+import threading
+from abc import ABC, abstractmethod
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from http import HTTPStatus
+
+from flask import current_app
+from sqlalchemy import Connection, Float, Integer, case, event, func, inspect, or_, select, text
+from sqlalchemy.dialects.mysql import match
+from sqlalchemy.orm import ORMExecuteState, Query, Session, object_session
+
+from app.database.models import Literature
+from app.services.validators.base import ValidationException, ValidationExceptionType
+from app.utils.base import SingletonMeta
+from app.utils.extra import AlchemyExtras, SearchBackendType, SecondaryConfig
+
+
+@dataclass(frozen=True)
+class SearchDocument:
+    id: int
+    name: str
+    description: str
+
+
+class SearchQuery:
+    """
+    Words of a ``?q=`` search, each matched as a prefix. All words must match.
+    """
+    _WORD = re.compile(r'\w+')
+
+    def __init__(self, words: list[str]):
+        self.words = words
+
+    @classmethod
+    def tokenize(cls, value: str | None) -> list[str]:
+        return cls._WORD.findall((value or '').lower())
+
+    @classmethod
+    def parse(cls, value: str | None) -> SearchQuery:
+        if not (words := cls.tokenize(value)):
+            raise ValidationException(
+                ValidationExceptionType.INVALID_SEARCH_QUERY, HTTPStatus.BAD_REQUEST, 'Provide words to search as q'
+            )
+        return cls(words)
+
+
+class SearchBackend(ABC):
+    """
+    Ranked search over literature name and description.
+
+    Transactional backends write through the connection of the changing session,
+    the others are written after its commit.
+    """
+    transactional = True
+
+    @classmethod
+    def is_available(cls, connection: Connection) -> bool:
+        return True
+
+    @abstractmethod
+    def prepare(self, connection: Connection) -> None:
+        raise NotImplementedError()
+
+    @abstractmethod
+    def write(self, connection: Connection | None, documents: list[SearchDocument], removed: list[int]) -> None:
+        raise NotImplementedError()
+
+    @abstractmethod
+    def ranked(self, query: Query, search_query: SearchQuery) -> Query:
+        """
+        ``query`` narrowed to matching literatures, ordered by relevance.
+        """
+        raise NotImplementedError()
+
+
+class Fts5SearchBackend(SearchBackend):
+    """
+    SQLite FTS5 table keyed by literature id, ranked with bm25. Name matches weigh more than description ones.
+    """
+    TABLE = 'literature_search'
+    NAME_WEIGHT = 10.0
+
+    @classmethod
+    def is_available(cls, connection: Connection) -> bool:
+        return any(option == 'ENABLE_FTS5' for option, in connection.execute(text('PRAGMA compile_options')))
+
+    def prepare(self, connection: Connection) -> None:
+        exists = connection.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"), {'name': self.TABLE}
+        ).first()
+        if exists:
+            return
+        connection.execute(text(
+            f"CREATE VIRTUAL TABLE {self.TABLE} USING fts5(name, description, tokenize='unicode61 remove_diacritics 2')"
+        ))
+        connection.execute(text(
+            f"INSERT INTO {self.TABLE}(rowid, name, description) "
+            f"SELECT id, name, coalesce(description, '') FROM {Literature.__tablename__}"
+        ))
+
+    def write(self, connection: Connection | None, documents: list[SearchDocument], removed: list[int]) -> None:
+        stale = [{'id': id} for id in [*removed, *[document.id for document in documents]]]
+        if stale:
+            connection.execute(text(f'DELETE FROM {self.TABLE} WHERE rowid = :id'), stale)
+        if documents:
+            connection.execute(
+                text(f'INSERT INTO {self.TABLE}(rowid, name, description) VALUES (:id, :name, :description)'),
+                [{'id': d.id, 'name': d.name or '', 'description': d.description or ''} for d in documents]
+            )
+
+    def ranked(self, query: Query, search_query: SearchQuery) -> Query:
+        matches = text(
+            f'SELECT rowid AS id, bm25({self.TABLE}, {self.NAME_WEIGHT}, 1.0) AS score '
+            f'FROM {self.TABLE} WHERE {self.TABLE} MATCH :match'
+        ).bindparams(match=' '.join(f'"{word}"*' for word in search_query.words))
+        matches = matches.columns(id=Integer, score=Float).subquery()
+        # bm25 scores are negative, the best match is the smallest one
+        return query.join(matches, matches.c.id == Literature.id).order_by(matches.c.score.asc())
+
+
+class MySqlFulltextSearchBackend(SearchBackend):
+    """
+    InnoDB FULLTEXT index on literature name and description, maintained by MySQL itself.
+    The index is declared on :class:`Literature`, tables created before it need it added by hand,
+    until then searches fall back to the in-process index.
+    """
+    INDEX = 'ft_literature_search'
+
+    @classmethod
+    def is_available(cls, connection: Connection) -> bool:
+        indexes = inspect(connection).get_indexes(Literature.__tablename__)
+        if any(index['name'] == cls.INDEX for index in indexes):
+            return True
+        current_app.logger.warning(f'FULLTEXT index {cls.INDEX} is missing on {Literature.__tablename__}')
+        return False
+
+    def prepare(self, connection: Connection) -> None:
+        pass
+
+    def write(self, connection: Connection | None, documents: list[SearchDocument], removed: list[int]) -> None:
+        pass
+
+    def ranked(self, query: Query, search_query: SearchQuery) -> Query:
+        relevance = match(
+            Literature.name, Literature.description, against=' '.join(f'+{word}*' for word in search_query.words)
+        ).in_boolean_mode()
+        return query.where(relevance).order_by(relevance.desc())
+
+
+class InvertedIndexSearchBackend(SearchBackend):
+    """
+    In-process inverted index ranked with BM25, for databases without full-text search.
+    Built from the table on the first search, kept up to date by committed changes of this process only.
+    """
+    transactional = False
+    NAME_WEIGHT = 3
+    K1 = 1.2
+    B = 0.75
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._built = False
+        self._postings: dict[str, dict[int, int]] = defaultdict(dict)
+        self._vocabulary: list[str] = []
+        self._terms_of: dict[int, Counter[str]] = {}
+        self._total_length = 0
+
+    def prepare(self, connection: Connection) -> None:
+        pass
+
+    def _build(self, connection: Connection):
+        rows = connection.execute(select(Literature.id, Literature.name, Literature.description))
+        self._add([SearchDocument(*row) for row in rows])
+        self._built = True
+
+    def _add(self, documents: list[SearchDocument]):
+        for document in documents:
+            self._remove(document.id)
+            terms = Counter()
+            for word in SearchQuery.tokenize(document.name):
+                terms[word] += self.NAME_WEIGHT
+            terms.update(SearchQuery.tokenize(document.description))
+            self._terms_of[document.id] = terms
+            self._total_length += terms.total()
+            for word, frequency in terms.items():
+                if word not in self._postings:
+                    bisect.insort(self._vocabulary, word)
+                self._postings[word][document.id] = frequency
+
+    def _remove(self, id: int):
+        if (terms := self._terms_of.pop(id, None)) is None:
+            return
+        self._total_length -= terms.total()
+        for word in terms:
+            del self._postings[word][id]
+            if not self._postings[word]:
+                del self._postings[word]
+                del self._vocabulary[bisect.bisect_left(self._vocabulary, word)]
+
+    def write(self, connection: Connection | None, documents: list[SearchDocument], removed: list[int]) -> None:
+        with self._lock:
+            if not self._built:
+                return
+            for id in removed:
+                self._remove(id)
+            self._add(documents)
+
+    def _prefixed(self, prefix: str) -> list[str]:
+        start = bisect.bisect_left(self._vocabulary, prefix)
+        end = bisect.bisect_left(self._vocabulary, prefix + '\uffff')
+        return self._vocabulary[start:end]
+
+    def scores(self, search_query: SearchQuery) -> dict[int, float]:
+        count = len(self._terms_of)
+        average_length = self._total_length / count if count else 0
+        scores: dict[int, float] | None = None
+        for prefix in search_query.words:
+            word_scores: dict[int, float] = defaultdict(float)
+            for word in self._prefixed(prefix):
+                postings = self._postings[word]
+                idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+                for id, frequency in postings.items():
+                    length_norm = 1 - self.B + self.B * self._terms_of[id].total() / average_length
+                    word_scores[id] += idf * frequency * (self.K1 + 1) / (frequency + self.K1 * length_norm)
+            scores = word_scores if scores is None else {
+                id: score + word_scores[id] for id, score in scores.items() if id in word_scores
+            }
+        return scores or {}
+
+    def ranked(self, query: Query, search_query: SearchQuery) -> Query:
+        with self._lock:
+            if not self._built:
+                self._build(query.session.connection())
+            scores = self.scores(search_query)
+        best = sorted(scores, key=lambda id: (-scores[id], id))[:SecondaryConfig().SEARCH_MAX_RESULTS]
+        if not best:
+            return query.where(False)
+        return query.where(Literature.id.in_(best)).order_by(
+            case({id: position for position, id in enumerate(best)}, value=Literature.id)
+        )
+
+
+class LiteratureSearchIndex(metaclass=SingletonMeta):
+    """
+    Picks the search backend of the database on first use: FTS5 on SQLite, FULLTEXT on MySQL,
+    in-process inverted index otherwise or when ``SEARCH_BACKEND`` asks for it.
+    Changes of literatures are written to it incrementally, see the session events below.
+    """
+    _PENDING_KEY = 'literature_search_pending'
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._backend: SearchBackend | None = None
+
+    def backend(self, connection: Connection) -> SearchBackend:
+        with self._lock:
+            if self._backend is None:
+                self._backend = self._prepared_backend(connection)
+            return self._backend
+
+    @classmethod
+    def _prepared_backend(cls, connection: Connection) -> SearchBackend:
+        wanted = SecondaryConfig().SEARCH_BACKEND
+        if wanted != SearchBackendType.INVERTED_INDEX:
+            dialect_backends = {'sqlite': Fts5SearchBackend, 'mysql': MySqlFulltextSearchBackend}
+            backend_type = dialect_backends.get(connection.dialect.name)
+            if backend_type and backend_type.is_available(connection):
+                backend = backend_type()
+                backend.prepare(connection)
+                return backend
+        return InvertedIndexSearchBackend()
+
+    def ranked(self, query: Query, value: str | None) -> Query:
+        search_query = SearchQuery.parse(value)
+        return self.backend(query.session.connection()).ranked(query, search_query)
+
+    def changed(self, session: Session, documents: list[SearchDocument], removed: list[int]):
+        if not documents and not removed:
+            return
+        backend = self.backend(session.connection())
+        if backend.transactional:
+            backend.write(session.connection(), documents, removed)
+            return
+        pending = session.info.setdefault(self._PENDING_KEY, [])
+        pending.append((documents, removed))
+
+    def committed(self, session: Session):
+        for documents, removed in session.info.pop(self._PENDING_KEY, []):
+            self._backend.write(None, documents, removed)
+
+    def rolled_back(self, session: Session):
+        session.info.pop(self._PENDING_KEY, None)
+
+
+_SEARCHED_KEYS = {Literature.name.key, Literature.description.key}
+
+
+def _document_of(literature: Literature) -> SearchDocument:
+    return SearchDocument(literature.id, literature.name, literature.description)
+
+
+@event.listens_for(Literature, 'after_insert')
+def _literature_inserted(mapper, connection, literature: Literature):
+    LiteratureSearchIndex().changed(object_session(literature), [_document_of(literature)], [])
+
+
+@event.listens_for(Literature, 'after_update')
+def _literature_updated(mapper, connection, literature: Literature):
+    state = inspect(literature)
+    if state.attrs.name.history.has_changes() or state.attrs.description.history.has_changes():
+        LiteratureSearchIndex().changed(object_session(literature), [_document_of(literature)], [])
+
+
+@event.listens_for(Literature, 'after_delete')
+def _literature_deleted(mapper, connection, literature: Literature):
+    LiteratureSearchIndex().changed(object_session(literature), [], [literature.id])
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _literatures_bulk_changed(orm_execute_state: ORMExecuteState):
+    """
+    ORM-enabled ``insert(Literature)``/``update(Literature)``/``delete(Literature)`` statements bypass
+    the mapper events above. Affected ids are selected before the statement runs, updates leaving name and
+    description alone are skipped; inserted rows are the ones past the greatest id seen before it,
+    or given their ids explicitly.
+    """
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return None
+    if orm_execute_state.bind_mapper is not inspect(Literature):
+        return None
+    session = orm_execute_state.session
+    if orm_execute_state.is_insert:
+        return _literatures_bulk_inserted(orm_execute_state)
+    if orm_execute_state.is_update and not _SEARCHED_KEYS & AlchemyExtras.get_updated_keys(orm_execute_state):
+        return None
+    ids = AlchemyExtras.get_affected_ids(orm_execute_state, Literature.id)
+    result = orm_execute_state.invoke_statement()
+    if ids and orm_execute_state.is_delete:
+        LiteratureSearchIndex().changed(session, [], ids)
+    elif ids:
+        _literatures_reindexed(session, Literature.id.in_(ids))
+    return result
+
+
+def _literatures_bulk_inserted(orm_execute_state: ORMExecuteState):
+    session = orm_execute_state.session
+    parameters = orm_execute_state.parameters or []
+    explicit_ids = [row['id'] for row in (parameters if isinstance(parameters, list) else [parameters])
+                    if row.get('id') is not None]
+    last_id = session.connection().execute(select(func.max(Literature.id))).scalar()
+    result = orm_execute_state.invoke_statement()
+    _literatures_reindexed(session, or_(Literature.id > (last_id or 0), Literature.id.in_(explicit_ids)))
+    return result
+
+
+def _literatures_reindexed(session: Session, whereclause):
+    rows = session.connection().execute(
+        select(Literature.id, Literature.name, Literature.description).where(whereclause)
+    )
+    LiteratureSearchIndex().changed(session, [SearchDocument(*row) for row in rows], [])
+
+
+@event.listens_for(Session, 'after_commit')
+def _session_committed(session: Session):
+    LiteratureSearchIndex().committed(session)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _session_rolled_back(session: Session):
+    LiteratureSearchIndex().rolled_back(session)
@@ -1,18 +1,23 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from concurrent.futures import ThreadPoolExecutor, as_completed, Future
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from enum import IntEnum, auto
-from typing import Callable, cast
+from itertools import batched
+from operator import attrgetter
+from typing import Callable, Hashable, cast
 
 import sqlalchemy.engine.row
 from icecream import ic
 from sqlalchemy import Column
-from sqlalchemy.orm import Session, object_session
+from sqlalchemy.orm import Session, object_session, selectinload, joinedload
+from sqlalchemy.orm.strategy_options import _AbstractLoad
 
 from app.database.models import Base, User, Country
-from app.utils.extra import AlchemyExtras, ExtraValidatorsStorageBase
+from app.utils.base import LRUCache, SingletonMeta
+from app.utils.extra import AlchemyExtras, ExtraValidatorsStorageBase, SecondaryConfig
 
 
 class FilteringOptions[T]:
@@ -48,6 +53,13 @@ class ColumnFilterBase(DataFilter[Column], ABC):
         self.columns: set[Column] = set()
         self.is_exclude_mode: bool = is_exclude_mode
 
+    @property
+    def signature(self) -> Hashable:
+        return (
+            self.__class__.__name__, self.is_exclude_mode,
+            frozenset(f'{column.table.name}.{column.key}' for column in self.columns)
+        )
+
     def predicate(self, item: Column) -> bool:
         return self._is_item_excluded(item) if self.is_exclude_mode else self._is_item_included(item)
 
@@ -87,6 +99,13 @@ class CombinedColumnFilter(DataFilter[Column]):
         self.included = included
         self.excluded = excluded
 
+    def __call__(self, columns: dict[str, Column]) -> dict[str, Column]:
+        return self.filter_on.dict_values(columns)
+
+    @property
+    def signature(self) -> Hashable:
+        return self.included.signature, self.excluded.signature
+
 
 class CombinedColumnFilterBuilder:
     def __init__(self):
@@ -119,6 +138,55 @@ class CombinedColumnFilterBuilder:
         return CombinedColumnFilter(self.included, self.excluded)
 
 
+class ItemsAccessValidator:
+    def __init__(
+            self,
+            requestor: User | None,
+            extra_validation_data_storage: type[ExtraValidatorsStorageBase] | None,
+            session: Session
+    ):
+        self.requestor = requestor
+        self.extra_validation_data_storage = extra_validation_data_storage
+        self.session = session
+
+    def is_level_allowed(self, item: Base) -> bool:
+        return self.is_model_allowed(item.__class__)
+
+    def is_model_allowed(self, model: type[Base]) -> bool:
+        if not (storage := self.extra_validation_data_storage):
+            return True
+
+        validators_storage = storage()[model]
+        if not self.requestor:
+            return not validators_storage.validate_NoUser()
+        else:
+            return not validators_storage.validate_User(self.requestor, self.session)
+
+    def is_item_allowed(self, item: Base) -> bool:
+        if not (storage := self.extra_validation_data_storage):
+            return True
+
+        validators_storage = storage()[item.__class__]
+        if not self.requestor:
+            return not validators_storage.validate_DataWithoutUser(item, None, self.session)
+        else:
+            return not validators_storage.validate_DataWithUser(self.requestor, item, None, self.session)
+
+    def has_item_validation(self, model: type[Base]) -> bool:
+        if not (storage := self.extra_validation_data_storage):
+            return False
+        return storage()[model].has_DataValidators()
+
+    def filter_allowed(self, items: list[Base]) -> list[Base]:
+        """
+        Uses the set-based validator of the model when the requestor is known and one is registered.
+        """
+        if items and self.requestor and (storage := self.extra_validation_data_storage):
+            if (validate_many := storage()[items[0].__class__].validate_ManyWithUser) is not None:
+                return validate_many(self.requestor, items, self.session)
+        return [item for item in items if self.is_item_allowed(item)]
+
+
 class SerializationThreadingMode(IntEnum):
     DISABLED = auto()
     FULL = auto()
@@ -127,8 +195,182 @@ class SerializationThreadingMode(IntEnum):
 
 @dataclass
 class SerializerOptions:
+    """
+    ``rows_model`` is the model projected ``Row`` s of the initial data were selected from.
+    Such rows are serialized through its plan and are never validated one by one.
+    """
     threading_mode: SerializationThreadingMode = SerializationThreadingMode.PARTIAL
     threading_partial_threshold: int = 2000
+    initial_items_validated: bool = False
+    normalized: bool = False
+    rows_model: type[Base] | None = None
+
+
+@dataclass(frozen=True)
+class SerializationScope:
+    """
+    Relationships allowed below a serialized object: remaining ``depth`` and dotted ``expand`` paths.
+    ``None`` leaves the respective dimension unrestricted.
+    """
+    depth: int | None = None
+    expand: frozenset[str] | None = None
+
+    def allows(self, key: str) -> bool:
+        if self.depth is not None and self.depth <= 0:
+            return False
+        return self.expand is None or any(path.partition('.')[0] == key for path in self.expand)
+
+    def enter(self, key: str) -> SerializationScope:
+        return SerializationScope(
+            None if self.depth is None else self.depth - 1,
+            None if self.expand is None else frozenset(
+                rest for head, _, rest in (path.partition('.') for path in self.expand) if head == key and rest
+            )
+        )
+
+
+@dataclass(frozen=True)
+class RelationshipSerializationStep:
+    key: str
+    excluded_pairs: tuple[tuple[Column, Column], ...]
+    scope: SerializationScope = SerializationScope()
+
+
+@dataclass(frozen=True)
+class SerializationPlan:
+    """
+    What to emit for objects of one model under one columns filter and one set of excluded relation pairs.
+    Compiled once by :class:`SerializationPlansStorage`, so per object only attribute fetches remain.
+    """
+    model: type[Base]
+    column_keys: tuple[str, ...]
+    relationships: tuple[RelationshipSerializationStep, ...]
+    _columns_getter: Callable[[Base], any] | None = field(init=False, repr=False, compare=False, default=None)
+
+    def __post_init__(self):
+        if self.column_keys:
+            object.__setattr__(self, '_columns_getter', attrgetter(*self.column_keys))
+
+    @property
+    def is_empty(self):
+        return not self.column_keys
+
+    def extract_values(self, obj: Base) -> tuple:
+        if len(self.column_keys) == 1:
+            return self._columns_getter(obj),
+        return self._columns_getter(obj)
+
+    def extract_columns(self, obj: Base) -> dict[str, any]:
+        return dict(zip(self.column_keys, self.extract_values(obj)))
+
+
+class SerializationPlansStorage:
+    """
+    Bounded cache of :class:`SerializationPlan` per (model, columns filter signature, excluded relation pairs, scope).
+    Columns filters without ``signature`` are compiled on every call.
+
+    A relationship is planned only when the client asked for it: its target has columns passing the filter
+    and it is allowed by the :class:`SerializationScope`.
+    """
+    _cache: LRUCache[Hashable, SerializationPlan] | None = None
+
+    @staticmethod
+    def _ident(col: Column):
+        return f'{col.table.name}.{col.key}'
+
+    @classmethod
+    def _get_cache(cls) -> LRUCache[Hashable, SerializationPlan]:
+        if cls._cache is None:
+            cls._cache = LRUCache(SecondaryConfig().SERIALIZATION_PLANS_CACHE_SIZE)
+        return cls._cache
+
+    @classmethod
+    def cache_info(cls) -> dict[str, int]:
+        return cls._get_cache().info()
+
+    @classmethod
+    def get(
+            cls,
+            model: type[Base],
+            columns_filter: Callable[[dict[str, Column]], dict[str, Column]],
+            excluded_pairs: list[tuple[Column, Column]],
+            scope: SerializationScope = SerializationScope()
+    ) -> SerializationPlan:
+        if (signature := getattr(columns_filter, 'signature', None)) is None:
+            return cls.compile(model, columns_filter, excluded_pairs, scope)
+        key = (
+            model, signature,
+            frozenset((cls._ident(parent), cls._ident(child)) for parent, child in excluded_pairs),
+            scope
+        )
+        return cls._get_cache().get_or_compute(key, lambda: cls.compile(model, columns_filter, excluded_pairs, scope))
+
+    @classmethod
+    def compile(
+            cls,
+            model: type[Base],
+            columns_filter: Callable[[dict[str, Column]], dict[str, Column]],
+            excluded_pairs: list[tuple[Column, Column]],
+            scope: SerializationScope = SerializationScope()
+    ) -> SerializationPlan:
+        cols = columns_filter(AlchemyExtras().get_columns_of(model))
+        if not cols:
+            return SerializationPlan(model, (), ())
+
+        excluded_idents = {(cls._ident(parent), cls._ident(child)) for parent, child in excluded_pairs}
+        relationships = []
+        for relationship in AlchemyExtras().get_relationships_of(model):
+            if not scope.allows(relationship.key):
+                continue
+            if not columns_filter(AlchemyExtras().get_columns_of(relationship.mapper.class_)):
+                continue
+            pairs = [(parent, child)
+                     for parent, child in AlchemyExtras().get_relationship_parent_and_child_pairs(relationship)
+                     if (cls._ident(parent), cls._ident(child)) not in excluded_idents]
+            if pairs:
+                relationships.append(RelationshipSerializationStep(
+                    relationship.key, tuple([*excluded_pairs, *pairs, *[pair[::-1] for pair in pairs]]),
+                    scope.enter(relationship.key)
+                ))
+        return SerializationPlan(model, tuple(column.key for column in cols.values()), tuple(relationships))
+
+
+class EagerLoadingPlanner:
+    """
+    Turns the serialization plans of a request into loader options, so relationships walked by the serializer
+    are loaded per query and per depth level instead of per object.
+    Collections are loaded with ``selectinload``, scalar relationships with ``joinedload``.
+    """
+
+    def __init__(
+            self,
+            columns_filter: Callable[[dict[str, Column]], dict[str, Column]],
+            scope: SerializationScope = SerializationScope(),
+            max_depth: int | None = None
+    ):
+        self.columns_filter = columns_filter
+        self.scope = scope
+        self.max_depth = SecondaryConfig().EAGER_LOADING_MAX_DEPTH if max_depth is None else max_depth
+
+    def options_for(self, model: type[Base]) -> list[_AbstractLoad]:
+        return self._options_of(model, [], self.scope, 0)
+
+    def _options_of(
+            self, model: type[Base], excluded_pairs: list[tuple[Column, Column]], scope: SerializationScope, depth: int
+    ) -> list[_AbstractLoad]:
+        if depth >= self.max_depth:
+            return []
+        options = []
+        relationships = model.__mapper__.relationships
+        for step in SerializationPlansStorage.get(model, self.columns_filter, excluded_pairs, scope).relationships:
+            relationship = relationships[step.key]
+            loader = (selectinload if relationship.uselist else joinedload)(getattr(model, step.key))
+            if inner_options := self._options_of(
+                    relationship.mapper.class_, list(step.excluded_pairs), step.scope, depth + 1
+            ):
+                loader = loader.options(*inner_options)
+            options.append(loader)
+        return options
 
 
 class ObjectSerializationResultAssembler:
@@ -140,79 +382,113 @@ class ObjectSerializationResultAssembler:
     def __init__(
             self, obj: Base,
             recursive_layer_handler_builder: Callable[
-                [Base | list[Base], list[tuple[Column, Column]]], LayerProcessorBase]
+                [Base | list[Base], list[tuple[Column, Column]], SerializationScope], LayerProcessorBase]
     ):
         self.obj = obj
         self.recursive_layer_handler_builder = recursive_layer_handler_builder
         self._result = self.empty()
-        self._cols_to_serialize = AlchemyExtras().get_columns_of(obj.__class__)
-        self._relationships_to_serialize = {
-            relationship: AlchemyExtras().get_relationship_parent_and_child_pairs(relationship) for relationship in
-            AlchemyExtras().get_relationships_of(obj.__class__)
-        }
-        self._later_excluded_pairs: list[tuple[Column, Column]] = []
+        self._plan: SerializationPlan | None = None
 
     @dataclass
     class Result:
         dict_data: dict[str, any] = field(default_factory=dict)
         sync_calls: list[Callable[[], None]] = field(default_factory=list)
 
-    def apply_columns_filter(self, filter_: Callable[[dict[str, Column]], dict[str, Column]]):
-        self._cols_to_serialize = filter_(self._cols_to_serialize)
-        return self
-
-    def apply_relationships_filter(self, excluded_pairs: list[tuple[Column, Column]]):
-        self._later_excluded_pairs += excluded_pairs
-        self._relationships_to_serialize = {
-            rel: [tuple([parent, child])
-                  for parent, child in pairs if
-                  [self._ident(parent), self._ident(child)] not in [[self._ident(e_parent), self._ident(e_child)] for
-                                                                    e_parent,
-                                                                    e_child in
-                                                                    excluded_pairs]]
-            for rel, pairs in self._relationships_to_serialize.items()
-        }
+    @dataclass
+    class DetachedResult:
+        """
+        Object data copied into plain values, safe to be assembled outside the thread owning the session.
+        """
+        keys: tuple[str, ...]
+        values: tuple
+        relations: dict[str, any] = field(default_factory=dict)
+
+        def as_dict(self) -> dict[str, any]:
+            data = dict(zip(self.keys, self.values))
+            data.update(self.relations)
+            return data
+
+    def apply_plan(self, plan: SerializationPlan):
+        self._plan = plan
         return self
 
-    def _ident(self, col: Column):
-        return f'{col.table.name}.{col.key}'
-
     def build_result(self):
         self._result_builder()
         return self._result
 
     def _result_builder(self):
-        if not self._cols_to_serialize:
+        if self._plan.is_empty:
             return
-        self._apply_columns_data()
-        self._apply_relations_data()
-
-    def _apply_columns_data(self):
-        for column in self._cols_to_serialize.values():
-            self._result.dict_data[column.key] = getattr(self.obj, column.key)
-
-    def _create_sync_call(self, key: str, pairs_to_exclude: list[tuple[Column, Column]]):
-        adjusted_excluded_pairs = self._later_excluded_pairs + [*pairs_to_exclude, *[pair[::-1]
-                                                                                     for pair in pairs_to_exclude]]
-        fill_on_key = key
-
+        self._result.dict_data = self._plan.extract_columns(self.obj)
+        self._result.sync_calls = [self._create_sync_call(step) for step in self._plan.relationships]
+
+    def build_detached_result(self) -> DetachedResult | None:
+        """
+        Resolves relationships in place and snapshots column values, leaving only dict assembly to be done.
+        """
+        if self._plan.is_empty:
+            return None
+        relations = {}
+        for step in self._plan.relationships:
+            if (inner_data := self._relationship_data(step)) is not None:
+                relations[step.key] = inner_data
+        return self.DetachedResult(self._plan.column_keys, self._plan.extract_values(self.obj), relations)
+
+    def _relationship_data(self, step: RelationshipSerializationStep):
+        data = getattr(self.obj, step.key)
+        next_layer_handler = self.recursive_layer_handler_builder(data, list(step.excluded_pairs), step.scope)
+        inner_data = next_layer_handler.handle_data()
+        if type(inner_data) is dict and not inner_data:
+            return None
+        return inner_data
+
+    def _create_sync_call(self, step: RelationshipSerializationStep):
         def call():
-            data = getattr(self.obj, fill_on_key)
-            next_layer_handler = self.recursive_layer_handler_builder(data, adjusted_excluded_pairs)
-            inner_data = next_layer_handler.handle_data()
-            if type(inner_data) is dict and not inner_data:
-                return
-            self._result.dict_data[fill_on_key] = inner_data
+            if (inner_data := self._relationship_data(step)) is not None:
+                self._result.dict_data[step.key] = inner_data
 
         return call
 
-    def _apply_relations_data(
-            self,
-    ):
-        for relationship, pairs in self._relationships_to_serialize.items():
-            for parent, child in pairs:
-                if parent.key in self._cols_to_serialize or child.key in self._cols_to_serialize:
-                    self._result.sync_calls.append(self._create_sync_call(relationship.key, pairs))
+
+class IdentityMap:
+    """
+    Objects met below the root in normalized mode. Each (table, primary key) is serialized once per plan
+    into the ``included`` section, every occurrence in the tree becomes a reference.
+    """
+    TYPE_KEY = '$type'
+    ID_KEY = '$id'
+
+    def __init__(self):
+        self._entries: dict[tuple[str, str], list[dict[str, any]]] = defaultdict(list)
+        self._seen: set[tuple[int, str, str]] = set()
+        self._plans: list[SerializationPlan] = []
+        self._pk_getters: dict[type[Base], Callable[[Base], tuple]] = {}
+
+    def _ident_of(self, obj: Base) -> str:
+        if (getter := self._pk_getters.get(obj.__class__)) is None:
+            keys = sorted(column.key for column in AlchemyExtras().get_pk_of(obj.__class__))
+            getter = self._pk_getters[obj.__class__] = lambda o, get=attrgetter(*keys): \
+                get(o) if len(keys) > 1 else (get(o),)
+        return ','.join(str(value) for value in getter(obj))
+
+    def reference_of(self, obj: Base) -> dict[str, str]:
+        return {self.TYPE_KEY: obj.__class__.__tablename__, self.ID_KEY: self._ident_of(obj)}
+
+    def is_registered(self, plan: SerializationPlan, reference: dict[str, str]) -> bool:
+        return (id(plan), reference[self.TYPE_KEY], reference[self.ID_KEY]) in self._seen
+
+    def register(self, plan: SerializationPlan, reference: dict[str, str], dict_data: dict[str, any]):
+        self._plans.append(plan)
+        self._seen.add((id(plan), reference[self.TYPE_KEY], reference[self.ID_KEY]))
+        self._entries[reference[self.TYPE_KEY], reference[self.ID_KEY]].append(dict_data)
+
+    def included(self) -> dict[str, dict[str, dict[str, any]]]:
+        included = defaultdict(dict)
+        for (table, ident), parts in self._entries.items():
+            merged = included[table].setdefault(ident, {})
+            for part in parts:
+                merged.update(part)
+        return dict(included)
 
 
 class LayerProcessorBase(ABC):
@@ -226,6 +502,11 @@ class LayerProcessorBase(ABC):
             extra_validation_data_storage: type[ExtraValidatorsStorageBase],
             session: Session,
             result_builder: type[ObjectSerializationResultAssembler] = ObjectSerializationResultAssembler,
+            items_validated: bool = False,
+            scope: SerializationScope = SerializationScope(),
+            identity_map: IdentityMap | None = None,
+            as_references: bool = False,
+            rows_model: type[Base] | None = None,
     ):
         self.object_one_or_many = object_one_or_many
         self.excluded_relation_pairs = excluded_relation_pairs
@@ -235,11 +516,20 @@ class LayerProcessorBase(ABC):
         self.extra_validation_data_storage = extra_validation_data_storage
         self.session = session
         self.result_builder = result_builder
+        self.items_validated = items_validated
+        self.scope = scope
+        self.identity_map = identity_map
+        self.as_references = as_references and identity_map is not None
+        self.rows_model = rows_model
+        self.access_validator = ItemsAccessValidator(requestor, extra_validation_data_storage, session)
+        self._plans: dict[type[Base], SerializationPlan] = {}
 
     def handle_data(self):
         if isinstance(many := self.object_one_or_many, list):
             if self._is_empty() or not self._is_level_access_allowed(many[0]):
                 return []
+            if self.items_validated:
+                return self._handle_many(many)
             return self._handle_many(self._filter_many_with_validation(many))
         elif isinstance(single := self.object_one_or_many, Base):
             if not self._is_level_access_allowed(single) or not self._is_item_allowed(single):
@@ -251,7 +541,7 @@ class LayerProcessorBase(ABC):
         pass
 
     def _filter_many_with_validation(self, objs: list[Base]) -> list[Base]:
-        return [obj for obj in objs if self._is_item_allowed(obj)]
+        return self.access_validator.filter_allowed(objs)
 
     def _handle_single(self, obj: Base) -> dict[str, any]:
         return self._result_sync_only_finalizer(self._serialize(obj))
@@ -269,30 +559,22 @@ class LayerProcessorBase(ABC):
         return isinstance(self.object_one_or_many, list) and not self.object_one_or_many
 
     def _is_level_access_allowed(self, item: Base):
-        if not (storage := self.extra_validation_data_storage):
-            return True
+        if self._is_projected_row(item):
+            return self.access_validator.is_model_allowed(self.rows_model)
+        return self.access_validator.is_level_allowed(item)
 
-        validators_storage = storage()[item.__class__]
-        if not self.requestor:
-            return not validators_storage.validate_NoUser()
-        else:
-            return not validators_storage.validate_User(self.requestor, self.session)
+    def _is_projected_row(self, item: any):
+        return self.rows_model is not None and isinstance(item, sqlalchemy.engine.row.Row)
 
     def _is_item_allowed(self, item: Base):
-        if not (storage := self.extra_validation_data_storage):
-            return True
-
-        validators_storage = storage()[item.__class__]
-        if not self.requestor:
-            return not validators_storage.validate_DataWithoutUser(item, None, self.session)
-        else:
-            return not validators_storage.validate_DataWithUser(self.requestor, item, None, self.session)
+        return self.access_validator.is_item_allowed(item)
 
 
     def _create_next_layer_handler(
             self,
             object_one_or_many: Base | list[Base],
-            adjusted_excluded_pairs: list[tuple[Column, Column]]
+            adjusted_excluded_pairs: list[tuple[Column, Column]],
+            scope: SerializationScope
     ):
         return self.next_layer_handler_retriever()(
             columns_filter=self.columns_filter,
@@ -302,18 +584,41 @@ class LayerProcessorBase(ABC):
             extra_validation_data_storage=self.extra_validation_data_storage,
             session=self.session,
             result_builder=self.result_builder,
-            next_layer_handler_retriever=self.next_layer_handler_retriever
+            next_layer_handler_retriever=self.next_layer_handler_retriever,
+            scope=scope,
+            identity_map=self.identity_map,
+            as_references=True
         )
 
+    def _plan_of(self, model: type[Base]) -> SerializationPlan:
+        if (plan := self._plans.get(model)) is None:
+            plan = self._plans[model] = SerializationPlansStorage.get(
+                model, self.columns_filter, self.excluded_relation_pairs, self.scope
+            )
+        return plan
+
     def _serialize(
             self, obj: Base
     ):
+        if self._is_projected_row(obj):
+            return self.result_builder.Result(self._plan_of(self.rows_model).extract_columns(obj), [])
+        if self.as_references and not isinstance(obj, sqlalchemy.engine.row.Row):
+            return self._serialize_as_reference(obj)
         return (self.result_builder(obj, self._create_next_layer_handler)
-                .apply_columns_filter(self.columns_filter)
-                .apply_relationships_filter(self.excluded_relation_pairs)
+                .apply_plan(self._plan_of(obj.__class__))
                 .build_result()) if not isinstance(obj, sqlalchemy.engine.row.Row) \
             else (self.result_builder.Result(dict(obj._mapping), []))
 
+    def _serialize_as_reference(self, obj: Base):
+        if (plan := self._plan_of(obj.__class__)).is_empty:
+            return self.result_builder.empty()
+        reference = self.identity_map.reference_of(obj)
+        if self.identity_map.is_registered(plan, reference):
+            return self.result_builder.Result(reference, [])
+        result = self.result_builder(obj, self._create_next_layer_handler).apply_plan(plan).build_result()
+        self.identity_map.register(plan, reference, result.dict_data)
+        return self.result_builder.Result(reference, result.sync_calls)
+
 
 class SynchronousLayerProcessor(LayerProcessorBase):
     def _handle_many(self, objs: list[Base]) -> list[dict[str, any]]:
@@ -327,19 +632,48 @@ class SynchronousLayerProcessor(LayerProcessorBase):
         return list(inner())
 
 
+class SerializationExecutor(metaclass=SingletonMeta):
+    """
+    Process-wide bounded pool shared by every :class:`ThreadedLayerProcessor` layer and request.
+    Workers only receive detached data, never ORM objects or the session.
+    """
+
+    def __init__(self):
+        self._executor = ThreadPoolExecutor(
+            max_workers=SecondaryConfig().SERIALIZATION_MAX_WORKERS,
+            thread_name_prefix='serializer'
+        )
+
+    def map_ordered[T, R](self, function: Callable[[T], R], items: list[T], chunk_size: int) -> list[R]:
+        if len(items) <= chunk_size:
+            return [function(item) for item in items]
+
+        def chunk_call(chunk: tuple[T, ...]) -> list[R]:
+            return [function(item) for item in chunk]
+
+        return [result for chunk in self._executor.map(chunk_call, batched(items, chunk_size)) for result in chunk]
+
+
 class ThreadedLayerProcessor(LayerProcessorBase):
-    def _handle_many(self, objs: list[Base]) -> list[dict[str, any]]:
-        def inner():
-            with ThreadPoolExecutor(max_workers=6) as executor:
-                futures: list[Future] = [executor.submit(self._serialize, obj) for obj in objs if
-                                         self._is_item_allowed(obj)]
-                for future in as_completed(futures):
-                    if not self._check_continuum_allowed(future.result()):
-                        [f.cancel() for f in futures if not f.done()]
-                        break
-                    yield self._result_sync_only_finalizer(future.result())
+    def _detach(self, obj: Base) -> ObjectSerializationResultAssembler.DetachedResult | None:
+        if self._is_projected_row(obj):
+            plan = self._plan_of(self.rows_model)
+            return self.result_builder.DetachedResult(plan.column_keys, plan.extract_values(obj))
+        if isinstance(obj, sqlalchemy.engine.row.Row):
+            return self.result_builder.DetachedResult(tuple(obj._fields), tuple(obj))
+        return (self.result_builder(obj, self._create_next_layer_handler)
+                .apply_plan(self._plan_of(obj.__class__))
+                .build_detached_result())
 
-        return list(inner())
+    def _handle_many(self, objs: list[Base]) -> list[dict[str, any]]:
+        detached = []
+        for obj in objs:
+            if (result := self._detach(obj)) is None:
+                break
+            detached.append(result)
+        return SerializationExecutor().map_ordered(
+            self.result_builder.DetachedResult.as_dict, detached, SecondaryConfig().SERIALIZATION_CHUNK_SIZE
+        )
 
 
 class Serializer2:
@@ -351,6 +685,7 @@ class Serializer2:
             modifiers: CombinedColumnFilter = None,
             options: SerializerOptions = None,
             extra_validation_data_storage: type[ExtraValidatorsStorageBase] = None,
+            scope: SerializationScope = None,
     ):
         self.initial_object = initial_object
         self.requestor = requestor
@@ -361,8 +696,11 @@ class Serializer2:
         self.options = options or SerializerOptions()
         self.extra_validation_data_storage = extra_validation_data_storage
         self.session = session
+        self.scope = scope or SerializationScope()
 
     def _use_threading(self):
+        if self.options.normalized:
+            return False
         if self.options.threading_mode == SerializationThreadingMode.DISABLED:
             return False
         if self.options.threading_mode == SerializationThreadingMode.FULL:
@@ -375,16 +713,28 @@ class Serializer2:
         return ThreadedLayerProcessor if self._use_threading() else SynchronousLayerProcessor
 
     def serialize(self):
-        return (retriever := self._layer_handler_retriever)()(
+        """
+        In normalized mode returns ``{'data': ..., 'included': {table: {pk: object}}}``,
+        nested objects in both sections being ``{'$type': table, '$id': pk}`` references.
+        """
+        identity_map = IdentityMap() if self.options.normalized else None
+        data = (retriever := self._layer_handler_retriever)()(
             object_one_or_many=self.initial_object,
             excluded_relation_pairs=[],
-            columns_filter=self.modifiers.filter_on.dict_values,
+            columns_filter=self.modifiers,
             # columns_filter=lambda x: x,
             next_layer_handler_retriever=retriever,
             requestor=self.requestor,
             extra_validation_data_storage=self.extra_validation_data_storage,
-            session=self.session
+            session=self.session,
+            items_validated=self.options.initial_items_validated,
+            scope=self.scope,
+            identity_map=identity_map,
+            rows_model=self.options.rows_model
         ).handle_data()
+        if identity_map is None:
+            return data
+        return {'data': data, 'included': identity_map.included()}
 
 
 class Serializer2Builder:
@@ -422,5 +772,9 @@ class Serializer2Builder:
         self.init_data.update({'session': session})
         return self
 
+    def apply_scope(self, scope: SerializationScope):
+        self.init_data.update({'scope': scope})
+        return self
+
     def build(self):
         return Serializer2(**self.init_data)
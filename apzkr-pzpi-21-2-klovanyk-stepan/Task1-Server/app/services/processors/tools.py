@@ -1,16 +1,21 @@
 from __future__ import annotations
 
+import dataclasses
 import datetime
 from http import HTTPStatus
 
 from flask_sqlalchemy.session import Session
-from sqlalchemy import update, delete
+from sqlalchemy import update, delete, insert, select, tuple_, inspect
+from sqlalchemy.orm import Query
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm.strategy_options import _AbstractLoad
 
 from app.database.models import Company, Employee, Base, Establishment, User, Booking
-from app.utils.extra import AlchemyExtras, ExtraValidatorsStorageBase
-from app.services.decorators.query_args.serialization import RequestArgsParser
+from app.utils.extra import AlchemyExtras, ExtraValidatorsStorageBase, SecondaryConfig
+from app.services.decorators.query_args.serialization import RequestArgsParser, SerializationFormat
 from app.services.processors.serialization import CombinedColumnFilterBuilder, Serializer2Builder, \
-    CombinedColumnFilter
+    CombinedColumnFilter, SerializerOptions, EagerLoadingPlanner, SerializationScope, SerializationPlan, \
+    SerializationPlansStorage
 from app.services.validators.base import ValidationException, ValidationExceptionType
 
 
@@ -36,13 +41,22 @@ class RequestHelper:
             *serialization_modifiers.excluded_columns
         ).build()
 
+    @staticmethod
+    def get_serialization_scope(serialization_modifiers: RequestArgsParser.Result) -> SerializationScope:
+        max_depth = SecondaryConfig().SERIALIZATION_MAX_DEPTH
+        depth = serialization_modifiers.depth
+        if max_depth is not None:
+            depth = max_depth if depth is None else min(depth, max_depth)
+        return SerializationScope(depth, serialization_modifiers.expand)
+
     @staticmethod
     def get_general_serializer(
             data: Base | list[Base],
             serialization_modifiers: RequestArgsParser.Result,
             requestor: User,
             session: Session,
-            extra_validation_data_storage: type[ExtraValidatorsStorageBase] | None = None
+            extra_validation_data_storage: type[ExtraValidatorsStorageBase] | None = None,
+            options: SerializerOptions | None = None
     ):
         def modifiers(builder: CombinedColumnFilterBuilder) \
                 -> CombinedColumnFilter:
@@ -54,22 +68,111 @@ class RequestHelper:
                 .define_requestor(requestor)
                 .apply_extra_validation_data_storage(extra_validation_data_storage)
                 .apply_session(session)
+                .apply_options(dataclasses.replace(
+                    options or SerializerOptions(),
+                    normalized=serialization_modifiers.format == SerializationFormat.NORMALIZED
+                ))
+                .apply_scope(RequestHelper.get_serialization_scope(serialization_modifiers))
                 .build()
                 )
 
     @staticmethod
-    def insert_into_db(session: Session, object_to_add: Base):
+    def get_serialization_plan(
+            model: type[Base],
+            serialization_modifiers: RequestArgsParser.Result
+    ) -> SerializationPlan:
+        return SerializationPlansStorage.get(
+            model,
+            RequestHelper.get_basic_modifiers(CombinedColumnFilterBuilder(), serialization_modifiers),
+            [],
+            RequestHelper.get_serialization_scope(serialization_modifiers)
+        )
+
+    @staticmethod
+    def get_eager_loading_options(
+            model: type[Base],
+            serialization_modifiers: RequestArgsParser.Result
+    ) -> list[_AbstractLoad]:
+        return EagerLoadingPlanner(
+            RequestHelper.get_basic_modifiers(CombinedColumnFilterBuilder(), serialization_modifiers),
+            RequestHelper.get_serialization_scope(serialization_modifiers)
+        ).options_for(model)
+
+    @staticmethod
+    def insert_into_db(session: Session, object_to_add: Base, keep_loaded: bool = False):
+        """
+        With ``keep_loaded`` the object stays loaded past the commit. Its primary key and server defaults
+        come back from the INSERT itself where the dialect supports RETURNING.
+        """
         session.add(object_to_add)
+        if not keep_loaded:
+            session.commit()
+            return
+        session.flush()
+        RequestHelper.commit_keeping_loaded(session, object_to_add)
+
+    @staticmethod
+    def commit_keeping_loaded(session: Session, obj: Base, values: dict[str, any] | None = None):
+        """
+        Commits without expiring column attributes of ``obj``, so serializing it afterwards needs no refresh SELECT.
+        ``values`` read back from the database take precedence over the ones the object holds.
+        """
+        columns = AlchemyExtras().get_columns_of(obj.__class__)
+        loaded = {key: value for key, value in inspect(obj).dict.items() if key in columns}
+        loaded.update(values or {})
         session.commit()
+        for key, value in loaded.items():
+            set_committed_value(obj, key, value)
 
     @staticmethod
-    def update_to_db(session: Session, object_to_update: Base, object_update_data: dict[str, any]):
-        session.execute(
-            update(object_to_update.__class__).where(*AlchemyExtras().get_where_clause(object_to_update)).values(
-                **object_update_data
-            )
+    def insert_many_into_db(session: Session, model: type[Base], rows: list[dict[str, any]]) -> list[dict[str, any]] | None:
+        """
+        Writes ``rows`` with a single executemany INSERT and returns the primary key of every row, in ``rows`` order.
+        Keys the rows hold are taken from them, generated ones come back from RETURNING sorted by parameter order,
+        which dialects without a sentinel column (SQLite) run as one INSERT per row.
+        Dialects without RETURNING for executemany (MySQL) omit generated keys: ``None`` is returned.
+        """
+        statement = insert(model)
+        primary_key = sorted(AlchemyExtras().get_pk_of(model), key=lambda column: column.key)
+        if all(row.get(column.key) is not None for row in rows for column in primary_key):
+            session.execute(statement, rows)
+            session.commit()
+            return [{column.key: row[column.key] for column in primary_key} for row in rows]
+        if not session.get_bind().dialect.insert_executemany_returning_sort_by_parameter_order:
+            session.execute(statement, rows)
+            session.commit()
+            return None
+        result = session.execute(
+            statement.returning(*[getattr(model, column.key) for column in primary_key], sort_by_parameter_order=True),
+            rows
         )
+        pk_data = [row._asdict() for row in result]
         session.commit()
+        return pk_data
+
+    @staticmethod
+    def update_to_db(
+            session: Session, object_to_update: Base, object_update_data: dict[str, any], keep_loaded: bool = False
+    ):
+        """
+        With ``keep_loaded`` the object stays loaded past the commit. The updated row is read back by the UPDATE
+        itself where the dialect supports RETURNING, otherwise the values the session synchronized into it are kept.
+        """
+        model = object_to_update.__class__
+        statement = update(model).where(*AlchemyExtras().get_where_clause(object_to_update)).values(
+            **object_update_data
+        )
+        if not keep_loaded:
+            session.execute(statement)
+            session.commit()
+            return
+        returned = None
+        if session.get_bind().dialect.update_returning:
+            columns = AlchemyExtras().get_columns_of(model)
+            returned = session.execute(statement.returning(*[getattr(model, key) for key in columns])).one()._asdict()
+        else:
+            session.execute(statement)
+        RequestHelper.commit_keeping_loaded(session, object_to_update, returned)
 
     @staticmethod
     def delete_from_db(session: Session, object_to_delete: Base):
@@ -80,6 +183,50 @@ class RequestHelper:
         )
         session.commit()
 
+    @staticmethod
+    def get_bulk_where_clause(model: type[Base], query: Query):
+        """
+        WHERE clause of a bulk UPDATE/DELETE changing the rows ``query`` selects.
+        A query selecting from the model table alone lends its own criteria, a joined one is matched by primary keys
+        selected from it as a derived table, which MySQL accepts on the changed table too.
+        """
+        if query.statement.get_final_froms() == [model.__table__]:
+            return query.whereclause
+        primary_key = sorted(AlchemyExtras().get_pk_of(model), key=lambda column: column.key)
+        rows = query.with_entities(*primary_key).order_by(None).subquery()
+        keys = select(*rows.c)
+        return (tuple_(*primary_key) if len(primary_key) > 1 else primary_key[0]).in_(keys)
+
+    @staticmethod
+    def get_required_bulk_where_clause(model: type[Base], query: Query):
+        """
+        :meth:`get_bulk_where_clause` of a query that must narrow the rows down, a bulk change never hits every row.
+        """
+        if (clause := RequestHelper.get_bulk_where_clause(model, query)) is None:
+            raise ValidationException(
+                ValidationExceptionType.INVALID_BULK_CHANGE_ARGS, HTTPStatus.BAD_REQUEST,
+                'Provide a filter selecting the objects to change'
+            )
+        return clause
+
+    @staticmethod
+    def update_many_in_db(session: Session, model: type[Base], query: Query, update_data: dict[str, any]) -> int:
+        statement = update(model).values(**update_data).execution_options(synchronize_session=False).where(
+            RequestHelper.get_required_bulk_where_clause(model, query)
+        )
+        count = session.execute(statement).rowcount
+        session.commit()
+        return count
+
+    @staticmethod
+    def delete_many_from_db(session: Session, model: type[Base], query: Query) -> int:
+        statement = delete(model).execution_options(synchronize_session=False).where(
+            RequestHelper.get_required_bulk_where_clause(model, query)
+        )
+        count = session.execute(statement).rowcount
+        session.commit()
+        return count
+
     @staticmethod
     def is_employee_company_global(employee: Employee) -> bool:
         return employee.establishment.company.global_access_company
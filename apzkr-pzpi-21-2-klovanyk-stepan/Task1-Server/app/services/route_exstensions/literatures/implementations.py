@@ -1,6 +1,7 @@
 from http import HTTPStatus
 from io import BytesIO
 from os import PathLike
+from functools import partial
 from typing import AnyStr, BinaryIO, cast, Callable
 
 from PIL import Image
@@ -13,12 +14,14 @@ from sqlalchemy.orm import Session, Query
 from app.database.models import Literature, Base, LiteratureGenre, LiteratureAuthor, Author
 from app.services.creators.builders.routes import RoutesBuilder
 from app.services.creators.factories.body_details import BodyFactoryDetailsFactory, BodyFactoryDetails
+from app.services.processors.catalogue import FacetCounts
+from app.services.processors.search import LiteratureSearchIndex
 from app.services.processors.tools import RequestHelper
 from app.services.route_exstensions.literatures.base import LiteratureFileManagingBase, LiteratureFilesPostingBase, \
     LiteratureThumbnailFileName, LiteraturePdfFileName, LiteratureFilesGettingBase, DropDetailsBase
 from app.services.route_exstensions.literatures.validators_additions import is_user_can_fully_read_any_literature, \
     availableLiteratures_ForEmployeeToRead, availableLiteratures_ForEmployeeToEdit, availableLiteratures_ForUser, \
-    multi_genre_filtering_query_mod
+    catalogue_filtering_query_mod
 from app.services.validators.base import ValidationException, ValidationExceptionType
 from app.services.validators.crud import ReadOrDeleteValidationResult
 from app.utils.file_manager.files import FileManager
@@ -174,7 +177,7 @@ class LiteratureFullyReadableDetailsImpl[T: Query, R: Query](
 
             return availableLiteratures_ForUser(result, bound_user, session)
 
-        return multi_genre_filtering_query_mod(inside(), request_args)
+        return catalogue_filtering_query_mod(inside(), request_args)
 
     def details_provider(self, body_factory_details_factory: BodyFactoryDetailsFactory) \
             -> Callable[[Callable[[T, dict[str, any]], R]], BodyFactoryDetails]:
@@ -184,6 +187,51 @@ class LiteratureFullyReadableDetailsImpl[T: Query, R: Query](
         return ["GET"]
 
 
+class LiteratureSearchDetailsImpl[T: Query, R: Query](
+    RoutesBuilder.AdvancedDetailsBase[T, R]
+):
+    """
+    ``?q=`` full-text search, literatures ranked by relevance. Pagination and serialization args work as usual.
+    """
+    def response_mod(self, response: any, session: Session, request_data: dict[str, any]) -> dict:
+        return response
+
+    def before_result_callback(self, result: T, session: Session, request_args: dict[str, any]) -> R:
+        ranked = LiteratureSearchIndex().ranked(result, request.args.get('q'))
+        return catalogue_filtering_query_mod(ranked, request_args)
+
+    def details_provider(self, body_factory_details_factory: BodyFactoryDetailsFactory) \
+            -> Callable[[Callable[[T, dict[str, any]], R]], BodyFactoryDetails]:
+        return body_factory_details_factory.READ_MANY
+
+    def methods_provider(self) -> list[str]:
+        return ["GET"]
+
+
+class LiteratureFacetsDetailsImpl[T: Query, R: Query](
+    RoutesBuilder.AdvancedDetailsBase[T, R]
+):
+    """
+    Counts of the literatures matching the list filters per genre, type, company and author.
+    """
+    def response_mod(self, response: any, session: Session, request_data: dict[str, any]) -> dict:
+        return response
+
+    def before_result_callback(self, result: T, session: Session, request_args: dict[str, any]) -> R:
+        return catalogue_filtering_query_mod(result, request_args)
+
+    @staticmethod
+    def facet_counts(query: Query):
+        return FacetCounts().counts(query, FacetCounts.signature_of(request.args)), HTTPStatus.OK
+
+    def details_provider(self, body_factory_details_factory: BodyFactoryDetailsFactory) \
+            -> Callable[[Callable[[T, dict[str, any]], R]], BodyFactoryDetails]:
+        return partial(body_factory_details_factory.READ_MANY, query_result=self.facet_counts)
+
+    def methods_provider(self) -> list[str]:
+        return ["GET"]
+
+
 class LiteratureFullyEditableDetailsImpl[T: Query, R: Query](
     RoutesBuilder.AdvancedDetailsBase[T, R]
 ):
@@ -202,7 +250,7 @@ class LiteratureFullyEditableDetailsImpl[T: Query, R: Query](
                 return result
             return availableLiteratures_ForEmployeeToEdit(result, employee)
 
-        return multi_genre_filtering_query_mod(inside(), request_args)
+        return catalogue_filtering_query_mod(inside(), request_args)
 
     def details_provider(self, body_factory_details_factory: BodyFactoryDetailsFactory) \
             -> Callable[[Callable[[T, dict[str, any]], R]], BodyFactoryDetails]:
@@ -6,7 +6,8 @@ from sqlalchemy import or_, select, distinct
 from sqlalchemy.orm import Session, Query
 
 from app.blueprints.bookings import BookingsQueryHelper
-from app.database.models import User, Literature, Employee, Booking, Company, Establishment, Room, Genre
+from app.database.models import User, Literature, Employee, Booking, Company, Establishment, Room
+from app.services.processors.catalogue import CatalogueFilter
 from app.services.processors.tools import RequestHelper
 from app.services.validators.base import ValidationException, ValidationExceptionType
 from app.utils.extra import ValidatorsData
@@ -45,6 +46,30 @@ def validate_IsLiteratureCanBeFullyRead(
         return validateCase_User(bound_user, session)
 
 
+def validate_AreLiteraturesCanBeFullyRead(
+        user: User,
+        literatures: list[Literature],
+        session: Session
+) -> list[Literature]:
+    """
+    Set-based form of :func:`validate_IsLiteratureCanBeFullyRead`, a single query for the whole list.
+    """
+    bound_user = RequestHelper.get_current_bound_user(session, user)
+
+    if employee := bound_user.employee:
+        if employee.establishment.company.global_access_company:
+            return literatures
+        available = availableLiteratures_ForEmployeeToRead(session.query(Literature.id), employee)
+    else:
+        available = availableLiteratures_ForUser(session.query(Literature.id), bound_user, session)
+
+    allowed_ids = {
+        literature_id for literature_id, in
+        available.where(Literature.id.in_({literature.id for literature in literatures}))
+    }
+    return [literature for literature in literatures if literature.id in allowed_ids]
+
+
 def validate_IsLiteratureCanBeEdited(
         user: User,
         literature: Literature,
@@ -80,6 +105,39 @@ def validate_IsLiteratureCanBeEdited(
         )
 
 
+def restrict_LiteraturesCanBeEdited(
+        user: User,
+        query: Query,
+        extra: dict[str, any] | None,
+        session: Session
+) -> Query | ValidationException:
+    """
+    Query form of :func:`validate_IsLiteratureCanBeEdited`, narrows a bulk change to the editable literatures.
+    """
+    bound_user = RequestHelper.get_current_bound_user(session, user)
+    if not (employee := bound_user.employee):
+        return ValidationException(ValidationExceptionType.NOT_EMPLOYEE, HTTPStatus.FORBIDDEN)
+
+    if (extra and (ee := extra.get('editor_email')) and ee != employee.user_email):
+        return ValidationException(
+            ValidationExceptionType.NOT_ENOUGH_PERMISSIONS,
+            HTTPStatus.FORBIDDEN,
+            "You can't edit literature from other's name"
+        )
+
+    if employee.establishment.company.global_access_company:
+        return query
+
+    employee_company = RequestHelper.get_company_of_employee(employee)
+    if extra and (ci := extra.get('company_id')) and ci != employee_company.id:
+        return ValidationException(
+            ValidationExceptionType.NOT_ENOUGH_PERMISSIONS,
+            HTTPStatus.FORBIDDEN,
+            'Companies mismatch'
+        )
+    return query.where(Literature.company_id == employee_company.id)
+
+
 def validate_IsUserCanReadAny(user: User, session: Session) -> ValidationException | None:
     bound_user = RequestHelper.get_current_bound_user(session, user)
     if not is_user_can_fully_read_any_literature(bound_user, session):
@@ -95,13 +153,15 @@ def entryEdit_userOnly(data: ValidatorsData[Literature, User]):
 
 def entryEdit_forPdfReading(data: ValidatorsData[Literature, User]):
     data.extend_UserValidator(validate_IsUserCanReadAny)
-    data.extend_DataWithUserValidator(validate_IsLiteratureCanBeFullyRead)
+    data.extend_DataWithUserValidator(
+        validate_IsLiteratureCanBeFullyRead, many_func=validate_AreLiteraturesCanBeFullyRead
+    )
     pass
 
 
 def entryEdit_forEditing(data: ValidatorsData[Literature, User]):
     data.extend_UserValidator(validate_IsUserCanReadAny)
-    data.extend_DataWithUserValidator(validate_IsLiteratureCanBeEdited)
+    data.extend_DataWithUserValidator(validate_IsLiteratureCanBeEdited, query_func=restrict_LiteraturesCanBeEdited)
     pass
 
 
@@ -154,8 +214,5 @@ def availableLiteratures_ForUser(result: Query, bound_user: User, session: Sessi
     return result.join(Company).where(Company.id.in_(companies_ids))
 
 
-def multi_genre_filtering_query_mod(query: Query, request_data: dict[str, any]) -> Query:
-    genres = request.args.getlist('having_genre')
-    for genre in genres:
-        query = query.where(Literature.genres.any(Genre.name.like(f"%{genre}%")))
-    return query
+def catalogue_filtering_query_mod(query: Query, request_data: dict[str, any]) -> Query:
+    return CatalogueFilter(request.args).apply(query)
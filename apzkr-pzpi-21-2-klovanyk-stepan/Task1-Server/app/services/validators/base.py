@@ -1,10 +1,13 @@
 from __future__ import annotations
 
+import time
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
+from functools import partial
 from http import HTTPStatus
 from typing import Optional, Callable
 
+from flask import Request
 from marshmallow import ValidationError
 from marshmallow.validate import Email as EmailValidator
 from sqlalchemy.orm import Session
@@ -27,6 +30,14 @@ class ValidationExceptionType(MessageType):
     REQUEST_BODY_MISSING_PK = 'Missing primary key in request body'
     REQUEST_BODY_MISSING_FIELD = 'Missing field in request body'
     REQUEST_BODY_UNKNOWN_FIELD = 'Unknown field in request body'
+    INVALID_CURSOR = 'Provided pagination cursor is invalid'
+    INVALID_SERIALIZATION_ARGS = 'Provided serialization arguments are invalid'
+    SORT_COLUMN_NOT_INDEXED = 'Sorting by a column without index is not allowed'
+    INVALID_SEARCH_QUERY = 'Provided search query is invalid'
+    INVALID_FILTER_ARGS = 'Provided filter arguments are invalid'
+    INVALID_SORT_ARGS = 'Provided sort arguments are invalid'
+    INVALID_AGGREGATION_ARGS = 'Provided aggregation arguments are invalid'
+    INVALID_BULK_CHANGE_ARGS = 'Provided arguments of a bulk change are invalid'
 
     # Database and object-related errors
     RESOURCE_NOT_FOUND = 'Resource not found'
@@ -35,6 +46,7 @@ class ValidationExceptionType(MessageType):
     PK_OBJECT_NOT_FOUND = 'Object with provided primary key not found'
     PK_FIELDS_COUNT_MISMATCH = 'PK fields count mismatch'
     DIRECT_RELATIONSHIPS_UNSUPPORTED = 'Direct relationships are not supported'
+    INTEGRITY_CONSTRAINT_VIOLATED = 'Database integrity constraint violated'
 
     # Specific domain-related errors
     NO_BOOKINGS_AVAILABLE = 'No bookings available'
@@ -62,6 +74,7 @@ class ValidationExceptionType(MessageType):
     UPDATE_VALIDATION_EXCEPTION = 'Update validators exception'
     READ_VALIDATION_EXCEPTION = 'Read validators exception'
     CREATE_VALIDATION_EXCEPTION = 'Create validators exception'
+    CREATE_MANY_VALIDATION_EXCEPTION = 'Bulk create validators exception'
 
 
 
@@ -112,12 +125,87 @@ class BaseValidator[Accepts, Provides](ABC):
         self.next_validator = next_validator
         return next_validator
 
+    def process(self, context: Accepts, session: Session | None = None, request: Request | None = None) -> Provides:
+        """
+        This validator alone, without its callback and next validator.
+        A validator keeping no per-request state is shared by every :class:`ValidationPipeline` run this way.
+        """
+        return self._validation_body(context)
+
 
 class BaseSessionAffectedValidator[Accepts, Provides](BaseValidator[Accepts, Provides], ABC):
-    def __init__(self, session: Session, *args, **kwargs):
+    def __init__(self, session: Session | None = None, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.session = session
 
+
+class BaseSessionArgumentValidator[Accepts, Provides](BaseSessionAffectedValidator[Accepts, Provides], ABC):
+    """
+    Session affected validator taking the session as an argument of :meth:`process`,
+    so it can be a :class:`ValidationPipeline` stage. Linked into a chain it uses its own session.
+    """
+
+    def _validation_body(self, context: Accepts) -> Provides:
+        return self.process(context, self.session)
+
+    @abstractmethod
+    def process(self, context: Accepts, session: Session | None = None, request: Request | None = None) -> Provides:
+        pass
+
+
+@dataclass(frozen=True)
+class ValidationStage[Accepts, Provides]:
+    """
+    Validator of a :class:`ValidationPipeline`. It runs only when ``enabled`` allows it for the session at hand,
+    and reports its name and duration in seconds to ``timing_hook``.
+    """
+    validator: BaseValidator[Accepts, Provides]
+    enabled: Callable[[Session], bool] | None = None
+    timing_hook: Callable[[str, float], None] | None = None
+
+    @property
+    def name(self) -> str:
+        return type(self.validator).__name__
+
+    def run(self, context: Accepts, session: Session | None, request: Request | None) -> Provides:
+        if self.timing_hook is None:
+            return self.validator.process(context, session, request)
+        started = time.perf_counter()
+        try:
+            return self.validator.process(context, session, request)
+        finally:
+            self.timing_hook(self.name, time.perf_counter() - started)
+
+
+@dataclass(frozen=True)
+class ValidationPipeline[Accepts, Provides]:
+    """
+    Immutable sequence of validators, built once and run for every request.
+    Unlike a chain linked by :meth:`BaseValidator.set_next` it holds no per-request state:
+    the session and the request are call arguments and each stage provides the context of the next one.
+    """
+    name: str
+    stages: tuple[ValidationStage, ...]
+
+    @classmethod
+    def of(cls, name: str, *stages: BaseValidator | ValidationStage) -> ValidationPipeline:
+        return cls(name, tuple(stage if isinstance(stage, ValidationStage) else ValidationStage(stage)
+                               for stage in stages))
+
+    def validate(self, context: Accepts, session: Session | None = None, request: Request | None = None) -> Provides:
+        for stage in self.stages:
+            if stage.enabled is None or stage.enabled(session):
+                context = stage.run(context, session, request)
+        return context
+
+    def with_timing_hook(self, timing_hook: Callable[[str, str, float], None] | None) -> ValidationPipeline:
+        """
+        Copy of the pipeline reporting ``(pipeline name, stage name, seconds)`` of every stage to ``timing_hook``.
+        """
+        stage_hook = timing_hook and partial(timing_hook, self.name)
+        return replace(self, stages=tuple(replace(stage, timing_hook=stage_hook) for stage in self.stages))
+
+
 class BasicEmailValidator(BaseValidator[str, str]):
     def _validation_body(self, context: str) -> str:
         try:
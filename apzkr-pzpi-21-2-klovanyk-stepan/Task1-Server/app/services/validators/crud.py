@@ -1,17 +1,26 @@
+from __future__ import annotations
+
 import datetime
+import json
 from dataclasses import dataclass
+from enum import Enum
 from http import HTTPStatus
+from typing import Callable
 
 from flask import Request
 from flask_sqlalchemy.session import Session
+from sqlalchemy import Column, select, tuple_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Query
 from werkzeug.exceptions import BadRequest, UnsupportedMediaType
 
 from app import Globals
 from app.database.models import Base, User
-from app.utils.extra import AlchemyExtras
+from app.utils.extra import AlchemyExtras, SecondaryConfig
 from app.services.validators.base import (ValidationExceptionType, BasicPhoneNumberLengthValidator,
                                           BasicEmailValidator, \
-    BaseDataConverter, ValidationException, BaseValidator, BaseSessionAffectedValidator)
+    BaseDataConverter, ValidationException, BaseValidator, BaseSessionAffectedValidator, BaseSessionArgumentValidator,
+                                          ValidationStage, ValidationPipeline)
 
 
 class RequestJsonTypeValidator(BaseValidator[Request, dict]):
@@ -52,20 +61,95 @@ class UserDataConverter(BaseDataConverter):
         return {"password": "password_hash"}
 
 
+class ModelLoader:
+    """
+    Builds instances of one model from converted request data. Compiled once per model from
+    :class:`AlchemyExtras` column metadata, so per field only a coercion and the nullable and length checks remain.
+    Errors are reported per field, as a schema load would.
+    """
+    _loaders: dict[type[Base], ModelLoader] = {}
+
+    def __init__(self, model: type[Base]):
+        self.model = model
+        self.coercers: dict[str, Callable[[any], any]] = {}
+        self.datetime_keys: set[str] = set()
+        self.nullable_keys: set[str] = set()
+        self.max_lengths: dict[str, int] = {}
+        self.required_keys: list[str] = []
+        self.presence_required_keys: list[str] = []
+
+        for key, column in AlchemyExtras().get_columns_of(model).items():
+            python_type = self._python_type_of(column)
+            if python_type is datetime.datetime:
+                self.datetime_keys.add(key)
+            elif python_type is not None:
+                self.coercers[key] = python_type
+            if column.nullable:
+                self.nullable_keys.add(key)
+            if python_type is str and (length := getattr(column.type, 'length', None)):
+                self.max_lengths[key] = length
+            if not (column.nullable or column.default is not None or column.server_default is not None
+                    or column is column.table.autoincrement_column):
+                self.required_keys.append(key)
+            if not column.autoincrement:
+                self.presence_required_keys.append(key)
+
+    @classmethod
+    def of(cls, model: type[Base]) -> ModelLoader:
+        if (loader := cls._loaders.get(model)) is None:
+            loader = cls._loaders[model] = cls(model)
+        return loader
+
+    @staticmethod
+    def _python_type_of(column: Column) -> type | None:
+        try:
+            return column.type.python_type
+        except NotImplementedError:
+            return None
+
+    @staticmethod
+    def _parse_datetime(value: any) -> datetime.datetime:
+        if isinstance(value, datetime.datetime):
+            return value
+        if not isinstance(value, str):
+            raise ValueError(value)
+        return datetime.datetime.fromisoformat(value)
+
+    def load(self, data: dict[str, any]) -> Base:
+        """
+        Datetime fields are parsed in place, so ``data`` can be written as a row afterwards too.
+        """
+        errors: dict[str, list[str]] = {
+            key: ['Missing data for required field.'] for key in self.required_keys if key not in data
+        }
+        for key, value in data.items():
+            if value is None:
+                if key not in self.nullable_keys:
+                    errors[key] = ['Field may not be null.']
+            elif key in self.datetime_keys:
+                try:
+                    data[key] = self._parse_datetime(value)
+                except ValueError:
+                    errors[key] = ['Not a valid datetime.']
+            elif (max_length := self.max_lengths.get(key)) is not None and len(value) > max_length:
+                errors[key] = [f'Longer than maximum length {max_length}.']
+        if errors:
+            raise ValidationException(ValidationExceptionType.MARSHMALLOW_VALIDATION_EXCEPTION, HTTPStatus.BAD_REQUEST, errors)
+        return self.model(**data)
+
+
 class DataTypesAdapter:
     def __init__(self, model: type[Base]):
         self.model = model
 
     def adapt_types(self, data: dict[str, any]) -> dict[str, any]:
-        all_columns = AlchemyExtras().get_columns_of(self.model)
-        for column_name, column in all_columns.items():
-            if column_name in data.keys():
-                if column.type.python_type == datetime.datetime:
-                    continue
-                elif data[column_name] is None and column.nullable:
-                    continue
-                else:
-                    data[column_name] = column.type.python_type(data[column_name])
+        loader = ModelLoader.of(self.model)
+        for key, value in data.items():
+            if (coerce := loader.coercers.get(key)) is None:
+                continue
+            if value is None and key in loader.nullable_keys:
+                continue
+            data[key] = coerce(value)
         return data
 
 
@@ -134,18 +218,16 @@ class IntegrityAllFieldsPresenceValidator(BaseValidator[ConvertedData, Converted
         self.force_add_nullables = force_add_nullables
 
     def _validation_body(self, context: ConvertedData) -> ConvertedData:
-        all_columns = AlchemyExtras().get_columns_of(context.model)
-        for column_name, column in all_columns.items():
-            if context.data.get(column_name) is None and self.force_add_nullables and column.nullable:
-                context.data[column_name] = None
-                continue
-
-            if column.autoincrement:
-                continue
-
-            if column_name not in context.data.keys():
+        loader = ModelLoader.of(context.model)
+        if self.force_add_nullables:
+            for key in loader.nullable_keys:
+                if context.data.get(key) is None:
+                    context.data[key] = None
+
+        for key in loader.presence_required_keys:
+            if key not in context.data:
                 raise ValidationException(
-                    ValidationExceptionType.REQUEST_BODY_MISSING_FIELD, HTTPStatus.BAD_REQUEST, f'{column_name} not found'
+                    ValidationExceptionType.REQUEST_BODY_MISSING_FIELD, HTTPStatus.BAD_REQUEST, f'{key} not found'
                 )
         return context
 
@@ -161,29 +243,46 @@ class IntegrityPrimaryKeyPresenceValidator(BaseValidator[ConvertedData, Converte
         return context
 
 
-class ExistencePrimaryKeyValidator(BaseSessionAffectedValidator[ConvertedData, tuple[ConvertedData, Base]]):
-    def _validation_body(self, context: ConvertedData) -> tuple[ConvertedData, Base]:
+class ExistencePrimaryKeyValidator(BaseSessionArgumentValidator[ConvertedData, tuple[ConvertedData, Base]]):
+    def process(
+            self, context: ConvertedData, session: Session | None = None, request: Request | None = None
+    ) -> tuple[ConvertedData, Base]:
         primary_key = AlchemyExtras().get_pk_of(context.model)
         primary_key_data = {column.key: context.data[column.key] for column in primary_key if
                             column.key in context.data}
 
-        if (found_object := self.session.get(context.model, primary_key_data)) is None:
+        if (found_object := session.get(context.model, primary_key_data)) is None:
             raise ValidationException(
                 ValidationExceptionType.PK_OBJECT_NOT_FOUND, HTTPStatus.BAD_REQUEST, f'{primary_key} not found'
             )
         return context, found_object
 
 
-class NonExistencePrimaryKeyValidator(BaseSessionAffectedValidator[ConvertedData, ConvertedData]):
-    def __init__(self, session: Session, excluded_pk_from_header: dict[str, any] | None = None, *args, **kwargs):
+class NonExistencePrimaryKeyValidator(BaseSessionArgumentValidator[ConvertedData, ConvertedData]):
+    """
+    With ``excluding_request_pk`` the primary key of the request route, the one of the object being updated, passes.
+    """
+
+    def __init__(self, session: Session | None = None, excluding_request_pk: bool = False, *args, **kwargs):
         super().__init__(session, *args, **kwargs)
-        self.excluded_pk_from_header = excluded_pk_from_header
+        self.excluding_request_pk = excluding_request_pk
 
-    def _validation_body(self, context: ConvertedData) -> ConvertedData:
+    @staticmethod
+    def _request_pk_of(model: type[Base], request: Request) -> dict[str, any]:
+        view_args = request.view_args or {}
+        return DataTypesAdapter(model).adapt_types(
+            {column.key: view_args[column.key] for column in AlchemyExtras().get_pk_of(model) if column.key in view_args}
+        )
+
+    def process(
+            self, context: ConvertedData, session: Session | None = None, request: Request | None = None
+    ) -> ConvertedData:
         primary_key = AlchemyExtras().get_pk_of(context.model)
         primary_key_data = {column.key: context.data[column.key] for column in primary_key if
                             column.key in context.data}
-        if len(primary_key_data) == 0 or self.excluded_pk_from_header == primary_key_data:
+        if len(primary_key_data) == 0:
+            return context
+        if self.excluding_request_pk and self._request_pk_of(context.model, request) == primary_key_data:
             return context
 
         if len(primary_key_data) != len(primary_key):
@@ -194,15 +293,17 @@ class NonExistencePrimaryKeyValidator(BaseSessionAffectedValidator[ConvertedData
                                                                                       f'PK {required}'
             )
 
-        if self.session.get(context.model, primary_key_data) is not None:
+        if session.get(context.model, primary_key_data) is not None:
             raise ValidationException(
                 ValidationExceptionType.PK_OBJECT_ALREADY_EXISTS, HTTPStatus.BAD_REQUEST, f'{primary_key} already exists'
             )
         return context
 
 
-class ExistenceForeignKeysValidator(BaseSessionAffectedValidator[ConvertedData, ConvertedData]):
-    def _validation_body(self, context: ConvertedData) -> ConvertedData:
+class ExistenceForeignKeysValidator(BaseSessionArgumentValidator[ConvertedData, ConvertedData]):
+    def process(
+            self, context: ConvertedData, session: Session | None = None, request: Request | None = None
+    ) -> ConvertedData:
         all_relationships = AlchemyExtras().get_relationships_of(context.model)
         relationships_data = [pair for relationship in all_relationships for pair in
                               AlchemyExtras().get_relationship_parent_and_child_pairs(relationship)]
@@ -210,28 +311,104 @@ class ExistenceForeignKeysValidator(BaseSessionAffectedValidator[ConvertedData,
         foreign_keys_data = {column: context.data[column.key] for column in parents_and_children}
         for child, value in foreign_keys_data.items():
             parent = parents_and_children[child]
-            if self.session.get(AlchemyExtras().get_table_by_name(parent.table.name), {parent.key: value}) is None:
+            if session.get(AlchemyExtras().get_table_by_name(parent.table.name), {parent.key: value}) is None:
                 raise ValidationException(
                     ValidationExceptionType.PARENT_OBJECT_NOT_FOUND, HTTPStatus.BAD_REQUEST, child
                 )
         return context
 
 
-class MarshmallowLoadValidator(BaseSessionAffectedValidator[ConvertedData, Base]):
+class ModelLoadValidator(BaseValidator[ConvertedData, Base]):
     def _validation_body(self, context: ConvertedData) -> Base:
-        schema = AlchemyExtras().get_schema_of(context.model)
-        try:
-            return schema(session=self.session).load(context.data)
-        except Exception as e:
-            raise ValidationException(
-                ValidationExceptionType.MARSHMALLOW_VALIDATION_EXCEPTION, HTTPStatus.BAD_REQUEST, e
+        return ModelLoader.of(context.model).load(context.data)
+
+
+class CRUDPipelineType(Enum):
+    CREATE = 'create'
+    CREATE_ITEM = 'create_item'
+    PRIMARY_KEY_LOOKUP = 'primary_key_lookup'
+    UPDATE = 'update'
+    UPDATE_MANY = 'update_many'
+
+
+def is_create_pessimistic(session: Session) -> bool:
+    return not SecondaryConfig().CREATE_OPTIMISTIC
+
+
+def are_create_foreign_keys_looked_up(session: Session) -> bool:
+    return is_create_pessimistic(session) or not AlchemyExtras.are_foreign_keys_enforced(session.get_bind())
+
+
+class CRUDValidationPipelines:
+    """
+    :class:`ValidationPipeline` per (model, :class:`CRUDPipelineType`), prepared when blueprints are registered
+    and shared by every request. A timing hook, when set, receives the duration of every stage.
+    """
+    _pipelines: dict[tuple[type[Base], CRUDPipelineType], ValidationPipeline] = {}
+    _timing_hook: Callable[[str, str, float], None] | None = None
+
+    @classmethod
+    def get(cls, model: type[Base], type_: CRUDPipelineType) -> ValidationPipeline:
+        if (pipeline := cls._pipelines.get((model, type_))) is None:
+            pipeline = cls._pipelines[model, type_] = cls.build(model, type_).with_timing_hook(cls._timing_hook)
+        return pipeline
+
+    @classmethod
+    def prepare(cls, *models: type[Base]):
+        for model in models:
+            for type_ in CRUDPipelineType:
+                cls.get(model, type_)
+
+    @classmethod
+    def set_timing_hook(cls, timing_hook: Callable[[str, str, float], None] | None):
+        cls._timing_hook = timing_hook
+        cls._pipelines = {key: pipeline.with_timing_hook(timing_hook) for key, pipeline in cls._pipelines.items()}
+
+    @staticmethod
+    def build(model: type[Base], type_: CRUDPipelineType) -> ValidationPipeline:
+        name = f'{model.__name__}.{type_.value}'
+        if type_ == CRUDPipelineType.CREATE:
+            return ValidationPipeline.of(
+                name,
+                RequestJsonTypeValidator(), RawJsonDataConversionValidator(model), TypesAdapterValidator(),
+                IntegrityRedundantFieldsValidator(), IntegrityAllFieldsPresenceValidator(),
+                ValidationStage(NonExistencePrimaryKeyValidator(), enabled=is_create_pessimistic),
+                ValidationStage(ExistenceForeignKeysValidator(), enabled=are_create_foreign_keys_looked_up),
+                ModelLoadValidator()
+            )
+        if type_ == CRUDPipelineType.CREATE_ITEM:
+            return ValidationPipeline.of(
+                name,
+                RawJsonDataConversionValidator(model), TypesAdapterValidator(), IntegrityRedundantFieldsValidator(),
+                IntegrityAllFieldsPresenceValidator()
+            )
+        if type_ == CRUDPipelineType.PRIMARY_KEY_LOOKUP:
+            return ValidationPipeline.of(
+                name,
+                RawJsonDataConversionValidator(model), TypesAdapterValidator(), IntegrityPrimaryKeyPresenceValidator(),
+                ExistencePrimaryKeyValidator()
             )
+        if type_ == CRUDPipelineType.UPDATE:
+            return ValidationPipeline.of(
+                name,
+                RequestJsonTypeValidator(), RawJsonDataConversionValidator(model), TypesAdapterValidator(),
+                IntegrityRedundantFieldsValidator(), NonExistencePrimaryKeyValidator(excluding_request_pk=True),
+                ExistenceForeignKeysValidator()
+            )
+        if type_ == CRUDPipelineType.UPDATE_MANY:
+            return ValidationPipeline.of(
+                name,
+                RequestJsonTypeValidator(), RawJsonDataConversionValidator(model), TypesAdapterValidator(),
+                IntegrityRedundantFieldsValidator(), PrimaryKeyUnchangedValidator(), ExistenceForeignKeysValidator()
+            )
+        raise ValueError(type_)
 
 
 @dataclass
 class CRUDContext:
     model: type[Base]
     request: Request
+    query: Query | None = None
 
 
 @dataclass
@@ -240,33 +417,230 @@ class CreateValidationResult:
 
 
 class CRUDBasicCreateValidator(BaseSessionAffectedValidator[CRUDContext, CreateValidationResult]):
+    """
+    With ``CREATE_OPTIMISTIC`` primary and foreign keys are left to the database constraints:
+    no lookups precede the INSERT and a failing one is mapped back by :class:`CreateIntegrityErrorMapper`.
+    Foreign keys are still looked up when the database does not enforce them.
+    """
 
     def _validation_body(self, context: CRUDContext) -> CreateValidationResult:
-        object_to_create: Base | None = None
-
-        def on_validation_success(new_object: Base):
-            nonlocal object_to_create
-            object_to_create = new_object
-
-        body_validators = RequestJsonTypeValidator()
-        body_validators.set_next(RawJsonDataConversionValidator(context.model)).set_next(
-            TypesAdapterValidator()
-            ).set_next(IntegrityRedundantFieldsValidator()).set_next(IntegrityAllFieldsPresenceValidator()).set_next(
-            NonExistencePrimaryKeyValidator(self.session)
-            ).set_next(ExistenceForeignKeysValidator(self.session)).set_next(
-            MarshmallowLoadValidator(self.session, on_validation_success)
-            )
-
+        pipeline = CRUDValidationPipelines.get(context.model, CRUDPipelineType.CREATE)
         try:
-            body_validators.validate(context.request)
+            object_to_create = pipeline.validate(context.request, self.session, context.request)
         except ValidationException as e:
             raise ValidationException(ValidationExceptionType.CREATE_VALIDATION_EXCEPTION, HTTPStatus.BAD_REQUEST, e)
 
-        assert object_to_create is not None
-
         return CreateValidationResult(object_to_create)
 
 
+class CreateIntegrityErrorMapper:
+    """
+    Translates an :class:`IntegrityError` of an INSERT into the :class:`ValidationException` the pessimistic
+    create validators would have raised, by replaying their lookups once the transaction is rolled back.
+    """
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def map(self, failed_object: Base, error: IntegrityError) -> ValidationException:
+        model = failed_object.__class__
+        data = {key: value for key in AlchemyExtras().get_columns_of(model)
+                if (value := getattr(failed_object, key)) is not None}
+        lookups = NonExistencePrimaryKeyValidator(self.session)
+        lookups.set_next(ExistenceForeignKeysValidator(self.session))
+        try:
+            lookups.validate(ConvertedData(data, model))
+            cause = ValidationException(
+                ValidationExceptionType.INTEGRITY_CONSTRAINT_VIOLATED, HTTPStatus.BAD_REQUEST, str(error.orig)
+            )
+        except ValidationException as e:
+            cause = e
+        return ValidationException(ValidationExceptionType.CREATE_VALIDATION_EXCEPTION, HTTPStatus.BAD_REQUEST, cause)
+
+
+class RequestJsonItemsValidator(RequestJsonTypeValidator):
+    """
+    Accepts a JSON array of objects or NDJSON (``application/x-ndjson``), one object per line.
+    """
+    NDJSON_MIMETYPES = ('application/x-ndjson', 'application/jsonl')
+
+    def _validation_body(self, context: Request) -> list[dict]:
+        if context.mimetype in self.NDJSON_MIMETYPES:
+            try:
+                items = [json.loads(line) for line in context.get_data(as_text=True).splitlines() if line.strip()]
+            except ValueError as e:
+                raise ValidationException(ValidationExceptionType.INVALID_JSON, HTTPStatus.BAD_REQUEST, e)
+        else:
+            items = super()._validation_body(context)
+        if not isinstance(items, list) or not all(isinstance(item, dict) for item in items):
+            raise ValidationException(
+                ValidationExceptionType.INVALID_JSON, HTTPStatus.BAD_REQUEST, 'Expected a list of objects'
+            )
+        if not 0 < len(items) <= SecondaryConfig().BULK_CREATE_MAX_ITEMS:
+            raise ValidationException(
+                ValidationExceptionType.INVALID_JSON, HTTPStatus.BAD_REQUEST,
+                f'Expected from 1 to {SecondaryConfig().BULK_CREATE_MAX_ITEMS} objects'
+            )
+        return items
+
+
+class BulkItemsErrors:
+    """
+    Errors of a batch by item index, raised together as one :class:`ValidationException`.
+    """
+
+    def __init__(self):
+        self.errors: dict[int, ValidationException] = {}
+
+    def add(self, index: int, error: ValidationException):
+        self.errors.setdefault(index, error)
+
+    def __contains__(self, index: int):
+        return index in self.errors
+
+    def as_exception(self, response_type: ValidationExceptionType) -> ValidationException | None:
+        if not self.errors:
+            return None
+        status_codes = {error.http_status_code for error in self.errors.values()}
+        return ValidationException(
+            response_type,
+            status_codes.pop() if len(status_codes) == 1 else HTTPStatus.BAD_REQUEST,
+            '\n'.join(f'Item {index}:\n{error}' for index, error in sorted(self.errors.items()))
+        )
+
+    def raise_if_any(self, response_type: ValidationExceptionType):
+        if exception := self.as_exception(response_type):
+            raise exception
+
+
+class BulkKeysLookup:
+    """
+    Batched form of :class:`NonExistencePrimaryKeyValidator` and :class:`ExistenceForeignKeysValidator`:
+    one ``IN`` query for the primary keys and one per parent column, whatever the size of the batch.
+    """
+
+    def __init__(self, session: Session, model: type[Base]):
+        self.session = session
+        self.model = model
+
+    def validate(self, items: dict[int, dict[str, any]], errors: BulkItemsErrors):
+        self._validate_primary_keys(items, errors)
+        self._validate_foreign_keys(items, errors)
+
+    def _validate_primary_keys(self, items: dict[int, dict[str, any]], errors: BulkItemsErrors):
+        primary_key = sorted(AlchemyExtras().get_pk_of(self.model), key=lambda column: column.key)
+        keys: dict[tuple, int] = {}
+        for index, data in items.items():
+            present = [column.key for column in primary_key if data.get(column.key) is not None]
+            if not present:
+                continue
+            if len(present) != len(primary_key):
+                errors.add(index, ValidationException(
+                    ValidationExceptionType.PK_FIELDS_COUNT_MISMATCH, HTTPStatus.BAD_REQUEST,
+                    f'Missing fields {set(column.key for column in primary_key) - set(present)}'
+                ))
+                continue
+            key = tuple(data[column.key] for column in primary_key)
+            if key in keys:
+                errors.add(index, ValidationException(
+                    ValidationExceptionType.PK_OBJECT_ALREADY_EXISTS, HTTPStatus.BAD_REQUEST,
+                    f'{key} repeats item {keys[key]}'
+                ))
+                continue
+            keys[key] = index
+        if not keys:
+            return
+        lookup = tuple_(*primary_key) if len(primary_key) > 1 else primary_key[0]
+        values = list(keys) if len(primary_key) > 1 else [key for key, in keys]
+        for existing in self.session.execute(select(*primary_key).where(lookup.in_(values))):
+            errors.add(keys[tuple(existing)], ValidationException(
+                ValidationExceptionType.PK_OBJECT_ALREADY_EXISTS, HTTPStatus.BAD_REQUEST, f'{tuple(existing)} already exists'
+            ))
+
+    def _validate_foreign_keys(self, items: dict[int, dict[str, any]], errors: BulkItemsErrors):
+        all_relationships = AlchemyExtras().get_relationships_of(self.model)
+        pairs = {child: parent for relationship in all_relationships for parent, child in
+                 AlchemyExtras().get_relationship_parent_and_child_pairs(relationship)
+                 if child.table is self.model.__table__}
+        for child, parent in pairs.items():
+            referencing: dict[any, list[int]] = {}
+            for index, data in items.items():
+                if index not in errors and (value := data.get(child.key)) is not None:
+                    referencing.setdefault(value, []).append(index)
+            if not referencing:
+                continue
+            found = set(self.session.execute(select(parent).where(parent.in_(list(referencing)))).scalars())
+            for value in referencing.keys() - found:
+                for index in referencing[value]:
+                    errors.add(index, ValidationException(
+                        ValidationExceptionType.PARENT_OBJECT_NOT_FOUND, HTTPStatus.BAD_REQUEST, child
+                    ))
+
+
+@dataclass
+class CreateManyValidationResult:
+    objects_to_create: list[Base]
+    rows: list[dict[str, any]]
+
+
+class CRUDBulkCreateValidator(BaseSessionAffectedValidator[CRUDContext, CreateManyValidationResult]):
+    """
+    Runs the create validators over every item of the batch, collecting errors per item,
+    and replaces their per-object lookups by :class:`BulkKeysLookup`.
+    """
+
+    def _validation_body(self, context: CRUDContext) -> CreateManyValidationResult:
+        items: list[dict] = []
+        item_pipeline = CRUDValidationPipelines.get(context.model, CRUDPipelineType.CREATE_ITEM)
+        loader = ModelLoader.of(context.model)
+
+        def on_items_success(request_items: list[dict]):
+            nonlocal items
+            items = request_items
+
+        try:
+            RequestJsonItemsValidator(on_items_success).validate(context.request)
+        except ValidationException as e:
+            raise ValidationException(ValidationExceptionType.CREATE_MANY_VALIDATION_EXCEPTION, e.http_status_code, e)
+
+        errors = BulkItemsErrors()
+        rows: dict[int, dict[str, any]] = {}
+        objects: dict[int, Base] = {}
+        for index, item in enumerate(items):
+            try:
+                converted = item_pipeline.validate(item, self.session)
+                loaded = loader.load(converted.data)
+            except ValidationException as e:
+                errors.add(index, e)
+                continue
+            rows[index], objects[index] = converted.data, loaded
+        BulkKeysLookup(self.session, context.model).validate(rows, errors)
+        errors.raise_if_any(ValidationExceptionType.CREATE_MANY_VALIDATION_EXCEPTION)
+
+        return CreateManyValidationResult(list(objects.values()), list(rows.values()))
+
+
+class CreateManyIntegrityErrorMapper:
+    """
+    Counterpart of :class:`CreateIntegrityErrorMapper` for a failed batch INSERT.
+    """
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def map(self, model: type[Base], rows: list[dict[str, any]], error: IntegrityError) -> ValidationException:
+        errors = BulkItemsErrors()
+        BulkKeysLookup(self.session, model).validate(dict(enumerate(rows)), errors)
+        if exception := errors.as_exception(ValidationExceptionType.CREATE_MANY_VALIDATION_EXCEPTION):
+            return exception
+        return ValidationException(
+            ValidationExceptionType.CREATE_MANY_VALIDATION_EXCEPTION, HTTPStatus.BAD_REQUEST,
+            ValidationException(
+                ValidationExceptionType.INTEGRITY_CONSTRAINT_VIOLATED, HTTPStatus.BAD_REQUEST, str(error.orig)
+            )
+        )
+
+
 @dataclass
 class ReadOrDeleteValidationResult:
     object: Base
@@ -275,30 +649,12 @@ class ReadOrDeleteValidationResult:
 class CRUDBasicReadOrDeleteValidator(BaseSessionAffectedValidator[CRUDContext, ReadOrDeleteValidationResult]):
 
     def _validation_body(self, context: CRUDContext) -> ReadOrDeleteValidationResult:
-        final_object: Base | None = None
-
-        def on_validation_success(data: tuple[ConvertedData, Base]):
-            nonlocal final_object
-            final_object = data[1]
-
-        header_validators = RawJsonDataConversionValidator(context.model)
-        header_validators.set_next(
-            TypesAdapterValidator()
-        ).set_next(
-            IntegrityPrimaryKeyPresenceValidator()
-        ).set_next(
-            ExistencePrimaryKeyValidator(
-                self.session, on_validation_success
-            )
-        )
-
+        pipeline = CRUDValidationPipelines.get(context.model, CRUDPipelineType.PRIMARY_KEY_LOOKUP)
         try:
-            header_validators.validate(context.request.view_args)
+            _, final_object = pipeline.validate(context.request.view_args, self.session, context.request)
         except ValidationException as e:
             raise ValidationException(ValidationExceptionType.READ_VALIDATION_EXCEPTION, HTTPStatus.BAD_REQUEST, e)
 
-        assert final_object is not None
-
         return ReadOrDeleteValidationResult(final_object)
 
 
@@ -310,47 +666,56 @@ class UpdateValidationResult:
 
 class CRUDBasicUpdateValidator(BaseSessionAffectedValidator[CRUDContext, UpdateValidationResult]):
     def _validation_body(self, context: CRUDContext) -> UpdateValidationResult:
-        data_to_update: dict[str, any] = {}
-        object_to_update: Base | None = None
-
-        def on_header_validation_success(data: tuple[ConvertedData, Base]):
-            nonlocal object_to_update
-            object_to_update = data[1]
-
-        def on_body_validation_success(data: ConvertedData):
-            nonlocal data_to_update
-            data_to_update = data.data
-
-        header_validators = RawJsonDataConversionValidator(context.model)
-        header_validators.set_next(TypesAdapterValidator()).set_next(
-            IntegrityPrimaryKeyPresenceValidator()
-        ).set_next(
-            ExistencePrimaryKeyValidator(self.session, on_header_validation_success)
-        )
+        header_pipeline = CRUDValidationPipelines.get(context.model, CRUDPipelineType.PRIMARY_KEY_LOOKUP)
+        body_pipeline = CRUDValidationPipelines.get(context.model, CRUDPipelineType.UPDATE)
+        try:
+            _, object_to_update = header_pipeline.validate(context.request.view_args, self.session, context.request)
+            data_to_update = body_pipeline.validate(context.request, self.session, context.request).data
+        except ValidationException as e:
+            raise ValidationException(ValidationExceptionType.UPDATE_VALIDATION_EXCEPTION, HTTPStatus.BAD_REQUEST, e)
 
-        body_validators = RequestJsonTypeValidator()
-        body_validators_cont = body_validators.set_next(RawJsonDataConversionValidator(context.model)).set_next(
-            TypesAdapterValidator()
-        ).set_next(
-            IntegrityRedundantFieldsValidator()
-        )
+        return UpdateValidationResult(data_to_update, object_to_update)
 
-        try:
-            header_validators.validate(context.request.view_args)
-            body_validators_cont.set_next(
-                NonExistencePrimaryKeyValidator(
-                    self.session, excluded_pk_from_header={col.key: getattr(object_to_update, col.key) for col in
-                        AlchemyExtras().get_pk_of(object_to_update.__class__)}
-                    )
-            ).set_next(
-                ExistenceForeignKeysValidator(
-                    self.session, on_body_validation_success
-                )
+
+@dataclass
+class ChangeManyValidationResult:
+    """
+    ``query`` selects the objects to change, extra validation may narrow it down.
+    ``object_new_data`` is ``None`` for deletion.
+    """
+    query: Query
+    object_new_data: dict[str, any] | None = None
+
+
+class PrimaryKeyUnchangedValidator(BaseValidator[ConvertedData, ConvertedData]):
+    def _validation_body(self, context: ConvertedData) -> ConvertedData:
+        if changed := {column.key for column in AlchemyExtras().get_pk_of(context.model)} & context.data.keys():
+            raise ValidationException(
+                ValidationExceptionType.INVALID_BULK_CHANGE_ARGS, HTTPStatus.BAD_REQUEST,
+                f'Primary key fields {changed} can not be changed in bulk'
             )
-            body_validators.validate(context.request)
+        if not context.data:
+            raise ValidationException(
+                ValidationExceptionType.INVALID_BULK_CHANGE_ARGS, HTTPStatus.BAD_REQUEST, 'Nothing to update'
+            )
+        return context
+
+
+class CRUDBulkUpdateValidator(BaseSessionAffectedValidator[CRUDContext, ChangeManyValidationResult]):
+    def _validation_body(self, context: CRUDContext) -> ChangeManyValidationResult:
+        pipeline = CRUDValidationPipelines.get(context.model, CRUDPipelineType.UPDATE_MANY)
+        try:
+            data_to_update = pipeline.validate(context.request, self.session, context.request).data
         except ValidationException as e:
             raise ValidationException(ValidationExceptionType.UPDATE_VALIDATION_EXCEPTION, HTTPStatus.BAD_REQUEST, e)
 
-        assert object_to_update is not None
+        assert context.query is not None
 
-        return UpdateValidationResult(data_to_update, object_to_update)
+        return ChangeManyValidationResult(context.query, data_to_update)
+
+
+class CRUDBulkDeleteValidator(BaseSessionAffectedValidator[CRUDContext, ChangeManyValidationResult]):
+    def _validation_body(self, context: CRUDContext) -> ChangeManyValidationResult:
+        assert context.query is not None
+
+        return ChangeManyValidationResult(context.query)
@@ -1,7 +1,10 @@
 from __future__ import annotations
 
+import threading
 from abc import abstractmethod, ABC, ABCMeta
+from collections import OrderedDict
 from enum import StrEnum
+from typing import Callable, Hashable
 
 
 class SingletonMeta(type):
@@ -72,3 +75,42 @@ class MessageType(StrEnum):
 
     def as_response_formatted(self, http_status_code: int, *format_values):
         return {"message": self.value % format_values}, http_status_code
+
+
+class LRUCache[K: Hashable, V]:
+    """
+    Thread-safe bounded mapping, evicting the least recently used entry when full.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict[K, V] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key: K, factory: Callable[[], V]) -> V:
+        with self._lock:
+            if key in self._data:
+                self.hits += 1
+                self._data.move_to_end(key)
+                return self._data[key]
+            self.misses += 1
+        value = factory()
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = 0
+
+    def info(self) -> dict[str, int]:
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self._data), 'max_size': self.max_size}
+
+    def __len__(self):
+        return len(self._data)
@@ -2,14 +2,14 @@ import enum
 from abc import abstractmethod, ABC
 from collections import defaultdict
 from copy import deepcopy
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, fields
 from http import HTTPStatus
 from pathlib import Path
 from typing import Callable
 
 from flask import Blueprint
-from sqlalchemy import Column
-from sqlalchemy.orm import RelationshipProperty, InstrumentedAttribute, Session
+from sqlalchemy import Column, PrimaryKeyConstraint, UniqueConstraint, inspect, select
+from sqlalchemy.orm import RelationshipProperty, InstrumentedAttribute, Session, Query, ORMExecuteState
 
 from app.database.models import Base, User
 from app.database.schemas import BaseSchema
@@ -17,11 +17,41 @@ from app.utils.base import SingletonMeta, SingletonAbstractMeta
 from app.services.validators.base import ValidationException
 
 
+class UnindexedSortPolicy(enum.StrEnum):
+    ALLOW = 'allow'
+    WARN = 'warn'
+    REJECT = 'reject'
+
+
+class SearchBackendType(enum.StrEnum):
+    AUTO = 'auto'
+    INVERTED_INDEX = 'inverted_index'
+
+
 class SecondaryConfig(metaclass=SingletonMeta):
     def __init__(self):
         self.BLUEPRINTS_PATH = Path('app', 'blueprints')
         self.ESTABLISHMENT_PORT_RANGE = (49152, 65535)
         self.IOT_REG_FILE_NAME = 'IOT_REG'
+        self.PAGINATION_MIN_BATCH_SIZE = 50
+        self.PAGINATION_MAX_BATCH_SIZE = 2000
+        self.PAGINATION_OVERFETCH_FACTOR = 2
+        self.STREAMING_CHUNK_SIZE = 500
+        self.SERIALIZATION_PLANS_CACHE_SIZE = 512
+        self.EAGER_LOADING_MAX_DEPTH = 4
+        self.SERIALIZATION_MAX_DEPTH = 6
+        self.SERIALIZATION_MAX_WORKERS = 6
+        self.SERIALIZATION_CHUNK_SIZE = 256
+        self.QUERY_ARGS_CACHE_SIZE = 1024
+        self.SORT_UNINDEXED_POLICY = UnindexedSortPolicy.WARN
+        self.SEARCH_BACKEND = SearchBackendType.AUTO
+        self.SEARCH_MAX_RESULTS = 1000
+        self.CATALOGUE_INDEX_ENABLED = True
+        self.CATALOGUE_MIN_AGE_BUCKETS = (0, 6, 12, 16, 18)
+        self.CATALOGUE_INDEX_MAX_IDS = 1000
+        self.FACET_COUNTS_CACHE_SIZE = 256
+        self.CREATE_OPTIMISTIC = True
+        self.BULK_CREATE_MAX_ITEMS = 5000
 
     class FlaskAppConfig:
         SQLALCHEMY_ENGINE_OPTIONS = {
@@ -46,12 +76,29 @@ class ValidatorsData[DbObject: Base, DbUser: User]:
     validate_DataWithoutUser: Callable[[DbObject, dict[str, any] | None, Session], ValidationException | None] = \
         lambda *_: \
             None
+    validate_ManyWithUser: Callable[[DbUser, list[DbObject], Session], list[DbObject]] | None = \
+        lambda user, objects, session: objects
+    restrict_QueryWithUser: Callable[[DbUser, Query, dict[str, any] | None, Session], Query | ValidationException] \
+        | None = lambda user, query, new_data, session: query
 
     def set_DataWithUserValidator(
             self,
-            func: Callable[[DbUser, DbObject, dict[str, any] | None, Session], ValidationException | None]
+            func: Callable[[DbUser, DbObject, dict[str, any] | None, Session], ValidationException | None],
+            many_func: Callable[[DbUser, list[DbObject], Session], list[DbObject]] | None = None,
+            query_func: Callable[[DbUser, Query, dict[str, any] | None, Session], Query | ValidationException] \
+                    | None = None
     ):
+        """
+        ``many_func`` is the set-based form of ``func``: it returns the subset of objects ``func`` accepts.
+        Without it lists are validated object by object.
+
+        ``query_func`` is its predicate form: it narrows a query of the model to the rows ``func`` accepts,
+        or returns the exception refusing the request as a whole. Bulk changes add it to their WHERE clause,
+        without it they validate the matched objects one by one.
+        """
         self.validate_DataWithUser = func
+        self.validate_ManyWithUser = many_func
+        self.restrict_QueryWithUser = query_func
         return self
 
     def set_UserValidator(self, func: Callable[[DbUser, Session], ValidationException | None]):
@@ -72,11 +119,26 @@ class ValidatorsData[DbObject: Base, DbUser: User]:
     def extend_DataWithUserValidator(
             self,
             func: Callable[[DbUser, DbObject, dict[str, any] | None, Session], ValidationException | None],
-            inject_as_first: bool = False
+            inject_as_first: bool = False,
+            many_func: Callable[[DbUser, list[DbObject], Session], list[DbObject]] | None = None,
+            query_func: Callable[[DbUser, Query, dict[str, any] | None, Session], Query | ValidationException] \
+                    | None = None
     ):
         first, second = (self.validate_DataWithUser, func) if not inject_as_first else (
             func, self.validate_DataWithUser)
         self.validate_DataWithUser = merge_handlers(first, second)
+        if many_func is None or self.validate_ManyWithUser is None:
+            self.validate_ManyWithUser = None
+        else:
+            first, second = (self.validate_ManyWithUser, many_func) if not inject_as_first else (
+                many_func, self.validate_ManyWithUser)
+            self.validate_ManyWithUser = merge_filters(first, second)
+        if query_func is None or self.restrict_QueryWithUser is None:
+            self.restrict_QueryWithUser = None
+        else:
+            first, second = (self.restrict_QueryWithUser, query_func) if not inject_as_first else (
+                query_func, self.restrict_QueryWithUser)
+            self.restrict_QueryWithUser = merge_restrictions(first, second)
         return self
 
     def extend_UserValidator(
@@ -107,6 +169,15 @@ class ValidatorsData[DbObject: Base, DbUser: User]:
         self.validate_DataWithoutUser = merge_handlers(first, second)
         return self
 
+    def has_DataValidators(self) -> bool:
+        """
+        Whether any per-object validator differs from the no-op default.
+        Lists of objects without such validators can be paginated purely in SQL.
+        """
+        defaults = {f.name: f.default for f in fields(self)}
+        return (self.validate_DataWithUser is not defaults['validate_DataWithUser']
+                or self.validate_DataWithoutUser is not defaults['validate_DataWithoutUser'])
+
 
 class ExtraValidatorsStorageBase(ABC):
     @abstractmethod
@@ -210,6 +281,64 @@ class AlchemyExtras(metaclass=SingletonMeta):
         parent, children = self._PARENT_AND_CHILDREN_PER_COLUMN_[column]
         return parent, children
 
+    def is_column_indexed(self, column: Column) -> bool:
+        """
+        Whether ``column`` leads some index of its table, foreign keys included (InnoDB indexes them implicitly).
+        FULLTEXT indexes never serve ordering and are not counted.
+        """
+        if column.primary_key or column.index or column.unique or column.foreign_keys:
+            return True
+        table = column.table
+        leading = [list(index.columns)[0] for index in table.indexes
+                   if index.columns and not index.kwargs.get('mysql_prefix')]
+        leading += [list(constraint.columns)[0] for constraint in table.constraints
+                    if isinstance(constraint, (PrimaryKeyConstraint, UniqueConstraint)) and constraint.columns]
+        return any(column is lead for lead in leading)
+
+    _AFFECTED_IDS_OPTION = 'affected_ids'
+
+    @staticmethod
+    def get_updated_keys(orm_execute_state: ORMExecuteState) -> set[str]:
+        """
+        Column keys an ORM ``update()`` sets, by its values or by its executemany parameters.
+        """
+        statement = orm_execute_state.statement
+        keys = {getattr(key, 'key', key) for key in (statement._values or {})}
+        keys.update(getattr(key, 'key', key) for key, _ in (statement._ordered_values or ()))
+        parameters = orm_execute_state.parameters or []
+        for row in parameters if isinstance(parameters, list) else [parameters]:
+            keys.update(row)
+        return keys
+
+    @classmethod
+    def get_affected_ids(cls, orm_execute_state: ORMExecuteState, id_column: Column) -> list:
+        """
+        ``id_column`` values of the rows an ORM ``update()``/``delete()`` is about to change. They are selected
+        once per execution, every ``do_orm_execute`` listener asking again gets them from an execution option.
+        """
+        ident = f'{id_column.table.name}.{id_column.key}'
+        affected = orm_execute_state.local_execution_options.get(cls._AFFECTED_IDS_OPTION, {})
+        if ident in affected:
+            return list(affected[ident])
+        statement, parameters = orm_execute_state.statement, orm_execute_state.parameters
+        if statement.whereclause is None and isinstance(parameters, list) and parameters:
+            # bulk UPDATE by primary key, the rows are named by the parameters
+            ids = [row[id_column.key] for row in parameters]
+        else:
+            ids = select(id_column)
+            if statement.whereclause is not None:
+                ids = ids.where(statement.whereclause)
+            ids = [id for id, in orm_execute_state.session.connection().execute(ids)]
+        orm_execute_state.update_execution_options(**{cls._AFFECTED_IDS_OPTION: {**affected, ident: tuple(ids)}})
+        return ids
+
+    @staticmethod
+    def are_foreign_keys_enforced(bind) -> bool:
+        """
+        SQLite leaves foreign keys unchecked unless ``PRAGMA foreign_keys`` is set on every connection.
+        """
+        return bind.dialect.name != 'sqlite'
+
     def get_where_clause(self, obj: Base):
         primary_keys = self.get_pk_of(obj.__class__)
         return {column == getattr(obj, column.key) for column in primary_keys}
@@ -229,9 +358,9 @@ class CRUDResponse(enum.Enum):
     @dataclass
     class Data:
         success_message: str
-        pk_data: dict[str, any] | None
+        pk_data: dict[str, any] | list[dict[str, any]] | None
 
-        def with_pk_data(self, pk_data: dict[str, any]):
+        def with_pk_data(self, pk_data: dict[str, any] | list[dict[str, any]] | None):
             return self.__class__(self.success_message, pk_data)
 
         def with_message_context(self, message_context: str):
@@ -241,10 +370,21 @@ class CRUDResponse(enum.Enum):
     UPDATED = (Data('{} updated', None), HTTPStatus.OK)
     DELETED = (Data('{} deleted', None), HTTPStatus.OK)
 
-    def embed_pk_data(self, pk_data: dict[str, any], message_context: str):
+    def embed_pk_data(self, pk_data: dict[str, any] | list[dict[str, any]] | None, message_context: str):
         return asdict(self.value[0].with_pk_data(pk_data=pk_data).with_message_context(message_context)), self.value[1]
 
+    def embed_representation(self, representation: dict[str, any]):
+        return representation, self.value[1]
+
     def embed_pk_data_from_object(self, obj: Base, message_context: str):
+        """
+        Persistent objects are described by their identity key, so ones expired by a commit are not refreshed.
+        """
+        state = inspect(obj)
+        if state.identity is not None:
+            return self.embed_pk_data(
+                {col.key: value for col, value in zip(state.mapper.primary_key, state.identity)}, message_context
+            )
         pk_info = AlchemyExtras().get_pk_of(obj.__class__)
         return self.embed_pk_data({col.key: getattr(obj, col.key) for col in pk_info}, message_context)
 
@@ -267,6 +407,32 @@ def merge_handlers[T: (ValidationException, None), ** P](*handlers: Callable[P,
     return wrapper
 
 
+def merge_filters[T: any, ** P](
+        *filters: Callable[[any, list[T], P], list[T]]
+) -> Callable[[any, list[T], P], list[T]]:
+    def wrapper(subject: any, items: list[T], *args: P.args, **kwargs: P.kwargs):
+        for filter_ in filters:
+            if not items:
+                break
+            items = filter_(subject, items, *args, **kwargs)
+        return items
+
+    return wrapper
+
+
+def merge_restrictions[** P](
+        *restrictions: Callable[[any, Query, P], Query | ValidationException]
+) -> Callable[[any, Query, P], Query | ValidationException]:
+    def wrapper(subject: any, query: Query, *args: P.args, **kwargs: P.kwargs):
+        for restriction in restrictions:
+            query = restriction(subject, query, *args, **kwargs)
+            if isinstance(query, ValidationException):
+                break
+        return query
+
+    return wrapper
+
+
 def merge_chained[T: any, ** P](*chained_callables: Callable[[T, P], T] | Callable[[T], T]) \
         -> Callable[[T, P], T] | Callable[[T], T]:
     def wrapper(chained: T, *args: P.args, **kwargs: P.kwargs):